@@ -0,0 +1,138 @@
+import numpy as np
+
+# 시간 변환 상수 (모듈을 읽을 때 한 번만 계산)
+# 화성의 1 sol은 약 24시간 39분 35.244초로, 지구 일수로는 약 1.02749125일입니다.
+MARS_SOL_IN_EARTH_DAYS = 1.02749125
+SOL_SECONDS = MARS_SOL_IN_EARTH_DAYS * 86400
+SOL_MICROSECONDS = SOL_SECONDS * 1e6
+
+# sol 번호의 기준 (utils.sols_to_earth_date와 같은 착륙일 자정 기준)
+LANDING_DATE = np.datetime64('2018-11-26T00:00:00', 'us')
+
+# InSight LMST sol 0 자정의 UTC 시각.
+# PS 데이터의 LMST 00004M06:44:09.786 = UTC 2018-334T14:44:27.755 에서 역산한 값입니다.
+LMST_EPOCH = np.datetime64('2018-11-26T05:10:50.336071', 'us')
+
+
+def _to_datetime64(t):
+    return np.asarray(t, dtype='datetime64[us]')
+
+
+def sol_to_utc(sol):
+    """
+    sol 번호(실수 가능)를 UTC datetime64 배열로 변환.
+    """
+    offset = np.rint(np.asarray(sol, dtype=np.float64) * SOL_MICROSECONDS).astype(np.int64)
+    return LANDING_DATE + offset.astype('timedelta64[us]')
+
+
+def utc_to_sol(t):
+    """
+    UTC 시각을 실수 sol 번호로 변환 (sol_to_utc의 역함수).
+
+    정수 sol 번호가 필요하면 np.floor를 적용하세요.
+    """
+    elapsed = (_to_datetime64(t) - LANDING_DATE).astype(np.int64)
+    return elapsed / SOL_MICROSECONDS
+
+
+def utc_to_year_doy(t):
+    """
+    UTC 시각을 (연도, DOY) 정수 배열로 변환.
+    """
+    days = _to_datetime64(t).astype('datetime64[D]')
+    years = days.astype('datetime64[Y]')
+    doy = (days - years.astype('datetime64[D]')).astype(np.int64) + 1
+    return years.astype(np.int64) + 1970, doy
+
+
+def sol_to_year_doy(sol):
+    """
+    sol 번호를 그 sol이 시작하는 날짜의 (연도, DOY)로 변환.
+    """
+    return utc_to_year_doy(sol_to_utc(sol))
+
+
+def year_doy_to_utc(year, doy):
+    """
+    (연도, DOY)를 그날 자정의 UTC datetime64로 변환.
+    """
+    years = (np.asarray(year, dtype=np.int64) - 1970).astype('datetime64[Y]')
+    days = years.astype('datetime64[D]') + (np.asarray(doy, dtype=np.int64) - 1).astype('timedelta64[D]')
+    return days.astype('datetime64[us]')
+
+
+def year_doy_to_sol(year, doy):
+    """
+    (연도, DOY) 자정을 실수 sol 번호로 변환.
+    """
+    return utc_to_sol(year_doy_to_utc(year, doy))
+
+
+def utc_to_lmst(t):
+    """
+    UTC 시각을 InSight LMST (sol, LMST 시계 초)로 변환.
+
+    LMST 시계 초는 'HH:MM:SS'를 초로 환산한 값(0 이상 86400 미만)이며,
+    LMST 1초는 SOL_SECONDS / 86400 SI 초입니다.
+
+    Returns:
+    - tuple: (LMST sol 정수 배열, LMST 시계 초 배열)
+    """
+    elapsed_sols = (_to_datetime64(t) - LMST_EPOCH).astype(np.int64) / SOL_MICROSECONDS
+    sol = np.floor(elapsed_sols)
+    return sol.astype(np.int64), (elapsed_sols - sol) * 86400
+
+
+def lmst_to_utc(sol, seconds=0.0):
+    """
+    InSight LMST (sol, LMST 시계 초)를 UTC datetime64로 변환 (utc_to_lmst의 역함수).
+    """
+    elapsed_sols = np.asarray(sol, dtype=np.float64) + np.asarray(seconds, dtype=np.float64) / 86400
+    return LMST_EPOCH + np.rint(elapsed_sols * SOL_MICROSECONDS).astype(np.int64).astype('timedelta64[us]')
+
+
+def _digits(chars, start, stop):
+    """
+    고정 폭 바이트 행렬의 [start, stop) 열을 10진수 정수로 변환 (숫자가 아닌 문자는 0).
+    """
+    block = chars[:, start:stop].astype(np.int64) - ord('0')
+    block[(block < 0) | (block > 9)] = 0
+    weights = 10 ** np.arange(stop - start - 1, -1, -1, dtype=np.int64)
+    return block @ weights
+
+
+def _parse_local_time(values):
+    """
+    'SSSSSxHH:MM:SS[.fff]' 형식 문자열 배열을 (sol, 시계 초)로 변환.
+
+    행마다 파이썬 코드를 실행하지 않도록 문자열을 고정 폭 바이트 행렬로 바꾼 뒤
+    자리별 숫자를 한꺼번에 계산합니다.
+    """
+    raw = np.asarray(values).astype('S')
+    width = raw.dtype.itemsize
+    if width < 14:
+        raise ValueError(f"Unexpected local time format: {raw[:1]}")
+    chars = raw.view(np.uint8).reshape(len(raw), width)
+    sol = _digits(chars, 0, 5)
+    seconds = (_digits(chars, 6, 8) * 3600 + _digits(chars, 9, 11) * 60
+               + _digits(chars, 12, 14)).astype(np.float64)
+    if width > 15:
+        # 소수점 이하 자릿수가 행마다 달라도 되도록 뒤쪽 빈칸은 0으로 처리
+        n_fraction = width - 15
+        seconds += _digits(chars, 15, width) / 10.0 ** n_fraction
+    return sol, seconds
+
+
+def parse_lmst(values):
+    """
+    LMST 문자열 배열(예: '00004M06:44:09.786')을 (sol, LMST 시계 초) 배열로 변환.
+    """
+    return _parse_local_time(values)
+
+
+def parse_ltst(values):
+    """
+    LTST 문자열 배열(예: '00004 06:03:17')을 (sol, LTST 시계 초) 배열로 변환.
+    """
+    return _parse_local_time(values)
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import obspy
+from conversions import sol_to_utc
+
+# sol 경계에서 필터 과도 응답을 버리기 위해 앞쪽에 더 읽는 길이 (초)
+FILTER_PAD_SECONDS = 60
+
+
+def _to_us(t):
+    return np.asarray(t, dtype='datetime64[us]').astype(np.int64)
+
+
+def bin_mean(times_us, values, grid_start_us, step_us, n_bins):
+    """
+    시각(us)과 값을 격자 구간별 평균으로 모음 (빈 구간은 NaN).
+    """
+    index = (times_us - grid_start_us) // step_us
+    valid = (index >= 0) & (index < n_bins) & np.isfinite(values)
+    index = index[valid]
+    count = np.bincount(index, minlength=n_bins)
+    total = np.bincount(index, weights=values[valid], minlength=n_bins)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def asof(times_us, values, grid_us, tolerance_us):
+    """
+    각 격자 시각 이전(같은 시각 포함)의 가장 최근 값 (tolerance_us보다 오래되면 NaN).
+    """
+    position = np.searchsorted(times_us, grid_us, side='right') - 1
+    result = np.full(len(grid_us), np.nan)
+    found = position >= 0
+    position = position[found]
+    fresh = grid_us[found] - times_us[position] <= tolerance_us
+    target = np.flatnonzero(found)[fresh]
+    result[target] = np.asarray(values, dtype=np.float64)[position[fresh]]
+    return result
+
+
+class _FrameCursor:
+    """
+    sol 파일 단위 데이터프레임을 시간 순으로 이어 읽으며 [t0, t1) 구간만 꺼냄.
+
+    아직 쓰지 않은 행만 남겨 두므로 메모리에는 파일 한두 개 분량만 올라갑니다.
+    """
+
+    def __init__(self, frames, columns):
+        self.frames = iter(frames)
+        self.columns = list(columns)
+        self.times = np.empty(0, dtype=np.int64)
+        self.values = {c: np.empty(0) for c in self.columns}
+        self.exhausted = False
+
+    def _pull(self):
+        try:
+            df = next(self.frames)
+        except StopIteration:
+            self.exhausted = True
+            return
+        df = df.sort_values('UTC')
+        self.times = np.concatenate([self.times, _to_us(df['UTC'])])
+        for c in self.columns:
+            self.values[c] = np.concatenate([self.values[c], df[c].to_numpy(dtype=np.float64)])
+
+    def take(self, t0_us, t1_us):
+        while not self.exhausted and (len(self.times) == 0 or self.times[-1] < t1_us):
+            self._pull()
+        start = np.searchsorted(self.times, t0_us, side='left')
+        stop = np.searchsorted(self.times, t1_us, side='left')
+        times = self.times[start:stop]
+        values = {c: v[start:stop] for c, v in self.values.items()}
+        # 다음 구간에서 as-of 결합에 쓸 수 있도록 마지막 행 하나는 남겨 둠
+        keep = max(stop - 1, 0)
+        self.times = self.times[keep:]
+        self.values = {c: v[keep:] for c, v in self.values.items()}
+        return times, values
+
+
+def _seis_columns(seis, t0, t1, grid_start_us, step_us, n_bins, band):
+    """
+    [t0, t1) 구간 SEIS 파형을 채널별 격자 구간 RMS 진폭 열로 변환.
+
+    공백으로 나뉜 조각마다 제곱합과 샘플 수를 bincount로 누적한 뒤 나누므로,
+    구간이 두 조각에 걸쳐도 샘플 수 가중 RMS가 됩니다.
+    """
+    sums = {}
+    pad = FILTER_PAD_SECONDS if band is not None else 0
+    window = seis.window(obspy.UTCDateTime(str(t0)) - pad, obspy.UTCDateTime(str(t1)))
+    for tr in window:
+        if band is not None:
+            tr.filter('bandpass', freqmin=band[0], freqmax=band[1])
+        start_us = _to_us(np.datetime64(tr.stats.starttime.datetime, 'us'))
+        times_us = start_us + np.rint(np.arange(tr.stats.npts) * tr.stats.delta * 1e6).astype(np.int64)
+        index = (times_us - grid_start_us) // step_us
+        valid = (index >= 0) & (times_us < _to_us(t1))
+        energy = tr.data[valid].astype(np.float64) ** 2
+        count = np.bincount(index[valid], minlength=n_bins)
+        total = np.bincount(index[valid], weights=energy, minlength=n_bins)
+        name = f'SEIS_{tr.stats.channel}_RMS'
+        if name in sums:
+            sums[name] = (sums[name][0] + total, sums[name][1] + count)
+        else:
+            sums[name] = (total, count)
+
+    columns = {}
+    for name, (total, count) in sums.items():
+        with np.errstate(invalid='ignore', divide='ignore'):
+            columns[name] = np.sqrt(np.where(count > 0, total / count, np.nan))
+    return columns
+
+
+def iter_aligned(start_sol, sol_range, seis=None, twins=None, ps=None, step_seconds=1.0,
+                 band=None, twins_columns=('HORIZONTAL_WIND_SPEED',), ps_columns=('PRESSURE',),
+                 how='mean', tolerance_seconds=None):
+    """
+    SEIS/TWINS/PS를 sol 단위로 같은 시간 격자에 맞춘 데이터프레임을 차례로 반환.
+
+    - SEIS: 격자 구간별 RMS 진폭 (band가 주어지면 band-pass 후), 채널마다 한 열
+    - TWINS/PS: how='mean'이면 구간 평균, how='asof'이면 격자 시각 직전 값
+
+    모든 결합은 정렬된 배열에 대한 bincount/searchsorted로 처리하며, 한 번에
+    sol 하나 분량만 메모리에 올립니다.
+    """
+    step_us = int(round(step_seconds * 1e6))
+    tolerance_us = step_us if tolerance_seconds is None else int(round(tolerance_seconds * 1e6))
+    cursors = []
+    if twins is not None:
+        frames = [twins.data_frame] if twins.data_frame is not None else twins.iter_frames(list(twins_columns))
+        cursors.append(_FrameCursor(frames, twins_columns))
+    if ps is not None:
+        frames = [ps.data_frame] if ps.data_frame is not None else ps.iter_frames(list(ps_columns))
+        cursors.append(_FrameCursor(frames, ps_columns))
+
+    for sol in range(start_sol, start_sol + sol_range):
+        t0, t1 = sol_to_utc([sol, sol + 1])
+        grid_start_us = _to_us(t0)
+        # sol 길이가 step의 정수배가 아니므로 마지막 구간은 sol 끝에서 잘림
+        n_bins = int(-(-(_to_us(t1) - grid_start_us) // step_us))
+        grid_us = grid_start_us + np.arange(n_bins, dtype=np.int64) * step_us
+        columns = {'UTC': grid_us.astype('datetime64[us]'), 'SOL': np.full(n_bins, sol)}
+
+        if seis is not None:
+            columns.update(_seis_columns(seis, t0, t1, grid_start_us, step_us, n_bins, band))
+        for cursor in cursors:
+            times, values = cursor.take(grid_start_us - tolerance_us, _to_us(t1))
+            for name, v in values.items():
+                if how == 'asof':
+                    columns[name] = asof(times, v, grid_us, tolerance_us)
+                else:
+                    columns[name] = bin_mean(times, v, grid_start_us, step_us, n_bins)
+        yield pd.DataFrame(columns)
+
+
+def align_instruments(start_sol, sol_range, seis=None, twins=None, ps=None, **kwargs):
+    """
+    iter_aligned의 sol별 결과를 하나의 열 기반 데이터프레임으로 합침.
+    """
+    return pd.concat(list(iter_aligned(start_sol, sol_range, seis, twins, ps, **kwargs)),
+                     ignore_index=True)
@@ -0,0 +1,106 @@
+import os
+import time
+import logging
+import matplotlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core.data_model import SEISData, TWINSData, PSData
+
+
+def _init_worker():
+    # 작업자 프로세스는 화면 없이 PNG만 만들므로 Agg 백엔드 사용
+    matplotlib.use('Agg')
+
+
+def render_job(job):
+    """
+    그림 작업 하나를 실행하고 그림별 소요 시간을 반환.
+
+    job은 dict이며 kind에 따라 다음 그림을 만듭니다.
+    - 'seis': 파형과 스펙트로그램 (channel, minfreq, maxfreq 필요)
+    - 'twins': 풍속
+    - 'ps': 기압
+
+    Returns:
+    - tuple: (데이터 로드 소요 시간(초), [(출력 경로, 소요 시간(초)), ...])
+    """
+    kind = job['kind']
+    output_dir = job['output_dir']
+    timings = []
+
+    def timed(output_name, plot, *args):
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, output_name)
+        started = time.perf_counter()
+        plot(*args, output_path)
+        timings.append((output_path, time.perf_counter() - started))
+
+    started = time.perf_counter()
+    if kind == 'seis':
+        seis_data = SEISData(job['start_sol'], job['sol_range'], job['channel'], job['data_path'])
+        seis_data.filter_data(job['minfreq'], job['maxfreq'])
+        load_seconds = time.perf_counter() - started
+        timed('seis_waveform.png', seis_data.plot_waveform)
+        timed('seis_spectrogram.png', seis_data.plot_spectrogram, job['minfreq'], job['maxfreq'])
+    elif kind == 'twins':
+        twins_data = TWINSData(job['start_sol'], job['sol_range'], job['data_path'],
+                               columns=['HORIZONTAL_WIND_SPEED'], dtype='float32')
+        load_seconds = time.perf_counter() - started
+        timed('twins_wind_speed.png', twins_data.plot_wind_speed)
+    elif kind == 'ps':
+        ps_data = PSData(job['start_sol'], job['sol_range'], job['data_path'],
+                         columns=['PRESSURE'], dtype='float32')
+        load_seconds = time.perf_counter() - started
+        timed('ps_pressure.png', ps_data.plot_pressure)
+    else:
+        raise ValueError(f"Unknown render job kind: {kind}")
+    return load_seconds, timings
+
+
+def atlas_jobs(start_sol, end_sol, data_paths, channel='BHU', minfreq=0.1, maxfreq=10,
+               kinds=('seis', 'twins', 'ps')):
+    """
+    start_sol부터 end_sol까지 sol마다 한 폴더(results/sol_XXXX)에 그림을 만드는 작업 목록.
+    """
+    jobs = []
+    for sol in range(start_sol, end_sol + 1):
+        output_dir = os.path.join(data_paths['results'], f'sol_{sol:04d}')
+        for kind in kinds:
+            jobs.append({
+                'kind': kind,
+                'start_sol': sol,
+                'sol_range': 1,
+                'channel': channel,
+                'minfreq': minfreq,
+                'maxfreq': maxfreq,
+                'data_path': data_paths[kind],
+                'output_dir': output_dir,
+            })
+    return jobs
+
+
+def render_batch(jobs, max_workers=None):
+    """
+    그림 작업들을 프로세스 풀에서 병렬로 실행.
+
+    실패한 작업은 로그만 남기고 나머지 작업은 계속 진행합니다.
+
+    Returns:
+    - list: 성공한 모든 그림의 (출력 경로, 소요 시간(초)) 목록
+    """
+    started = time.perf_counter()
+    timings = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+        futures = {executor.submit(render_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                load_seconds, job_timings = future.result()
+            except Exception as e:
+                logging.error(f"[!] 그림 작업 실패: {job['kind']} sol {job['start_sol']}, 에러: {e}")
+                continue
+            logging.info(f"[*] {job['kind']} sol {job['start_sol']} 데이터 로드: {load_seconds:.2f}초")
+            for output_path, seconds in job_timings:
+                logging.info(f'[*] {output_path}: {seconds:.2f}초')
+            timings.extend(job_timings)
+    logging.info(f'[*] 그림 {len(timings)}개, 총 {time.perf_counter() - started:.1f}초')
+    return timings
@@ -0,0 +1,270 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+import obspy
+from concurrent.futures import ProcessPoolExecutor
+from conversions import sol_to_utc, sol_to_year_doy
+from manifest import Manifest
+from core.alignment import iter_aligned
+
+WIND_COLUMN = 'HORIZONTAL_WIND_SPEED'
+PRESSURE_COLUMN = 'PRESSURE'
+DEFAULT_BANDS = ((0.01, 0.1), (0.1, 1.0), (1.0, 5.0))
+
+
+def frame_windows(values, window_length):
+    """
+    1차원 배열을 겹치지 않는 (창 개수, window_length) 배열로 바꿈 (끝의 남는 샘플은 버림).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_windows = len(values) // window_length
+    return values[:n_windows * window_length].reshape(n_windows, window_length)
+
+
+def welch_spectra(x, y, fs, nperseg, noverlap=None):
+    """
+    마지막 축을 따라 Welch 방식으로 자기/교차 스펙트럼 밀도를 계산.
+
+    앞쪽 축은 창 단위 묶음으로 한 번의 rfft로 처리하며, 구간별 평균 제거와
+    Hann 창, density 스케일은 scipy.signal.csd의 기본값과 같습니다.
+
+    Returns:
+    - tuple: (주파수, Pxx, Pyy, Pxy)
+    """
+    if noverlap is None:
+        noverlap = nperseg // 2
+    step = nperseg - noverlap
+    window = np.hanning(nperseg + 1)[:-1]
+    scale = 1.0 / (fs * (window * window).sum())
+
+    def segments(a):
+        seg = np.lib.stride_tricks.sliding_window_view(a, nperseg, axis=-1)[..., ::step, :]
+        seg = seg - seg.mean(axis=-1, keepdims=True)
+        return np.fft.rfft(seg * window, axis=-1)
+
+    fx = segments(np.asarray(x, dtype=np.float64))
+    fy = segments(np.asarray(y, dtype=np.float64))
+    pxx = (fx.real ** 2 + fx.imag ** 2).mean(axis=-2) * scale
+    pyy = (fy.real ** 2 + fy.imag ** 2).mean(axis=-2) * scale
+    pxy = (np.conj(fx) * fy).mean(axis=-2) * scale
+
+    # 단측 스펙트럼: DC와 (짝수 길이의) 나이퀴스트 성분을 제외하고 2배
+    last = None if nperseg % 2 else -1
+    for p in (pxx, pyy, pxy):
+        p[..., 1:last] *= 2
+    return np.fft.rfftfreq(nperseg, 1 / fs), pxx, pyy, pxy
+
+
+def coherence(x, y, fs, nperseg, noverlap=None):
+    """
+    크기 제곱 코히어런스 |Pxy|^2 / (Pxx Pyy) (scipy.signal.coherence와 같은 정의).
+    """
+    f, pxx, pyy, pxy = welch_spectra(x, y, fs, nperseg, noverlap)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return f, (pxy.real ** 2 + pxy.imag ** 2) / (pxx * pyy)
+
+
+def windowed_correlation(x, y, max_lag):
+    """
+    창 단위로 묶인 두 신호의 Pearson 상관과 FFT 교차상관 최댓값/지연을 계산.
+
+    NaN 샘플은 창 평균으로 채우므로 상관에 기여하지 않습니다. 지연이 양수이면
+    y가 x보다 늦게 반응한다는 뜻입니다.
+
+    Parameters:
+    - x, y (numpy.ndarray): (창 개수, 창 길이) 배열
+    - max_lag (int): 탐색할 최대 지연 (샘플)
+
+    Returns:
+    - tuple: (유효 샘플 수, 0 지연 상관, 교차상관 최댓값, 그 지연(샘플))
+    """
+    valid = np.isfinite(x) & np.isfinite(y)
+    n_valid = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x = np.where(valid, x, 0.0)
+        y = np.where(valid, y, 0.0)
+        x = np.where(valid, x - x.sum(axis=1, keepdims=True) / n_valid[:, None], 0.0)
+        y = np.where(valid, y - y.sum(axis=1, keepdims=True) / n_valid[:, None], 0.0)
+        norm = np.sqrt((x * x).sum(axis=1) * (y * y).sum(axis=1))
+
+        n = x.shape[1]
+        n_fft = 1 << int(np.ceil(np.log2(2 * n - 1)))
+        xcorr = np.fft.irfft(np.conj(np.fft.rfft(x, n_fft, axis=1)) * np.fft.rfft(y, n_fft, axis=1),
+                             n_fft, axis=1)
+        # 지연 -max_lag..max_lag 순서로 재배열
+        lags = np.arange(-max_lag, max_lag + 1)
+        xcorr = xcorr[:, lags % n_fft] / norm[:, None]
+        corr = xcorr[:, max_lag]
+        best = np.argmax(np.abs(np.nan_to_num(xcorr)), axis=1)
+        peak = xcorr[np.arange(len(best)), best]
+    return n_valid, corr, peak, lags[best]
+
+
+def _split_channels(channel):
+    return [c.strip().upper() for c in channel.split(',') if c.strip()]
+
+
+def wind_seismic_correlation(aligned, channel, window_seconds=600, max_lag_seconds=60,
+                             step_seconds=1.0, min_valid=0.8):
+    """
+    정렬된 데이터프레임(core.alignment.iter_aligned 결과)에서 창 단위로
+    TWINS 풍속과 SEIS 대역 파워(RMS 제곱)의 상관을 채널별로 계산.
+
+    Parameters:
+    - channel (str): SEIS 채널 ('BHU,BHV,BHW'처럼 여러 채널 가능)
+
+    Returns:
+    - pandas.DataFrame: CHANNEL, 창 시작 UTC, 유효 샘플 수, CORR, XCORR_PEAK, XCORR_LAG(초)
+    """
+    columns = ['CHANNEL', 'UTC', 'N_VALID', 'CORR', 'XCORR_PEAK', 'XCORR_LAG']
+    length = int(round(window_seconds / step_seconds))
+    if WIND_COLUMN not in aligned or len(aligned) < length:
+        return pd.DataFrame(columns=columns)
+
+    wind = frame_windows(aligned[WIND_COLUMN], length)
+    max_lag = min(int(round(max_lag_seconds / step_seconds)), length - 1)
+    rows = []
+    for name in _split_channels(channel):
+        seis_column = f'SEIS_{name}_RMS'
+        if seis_column not in aligned:
+            continue
+        power = frame_windows(aligned[seis_column].to_numpy(dtype=np.float64) ** 2, length)
+        n_valid, corr, peak, lag = windowed_correlation(wind, power, max_lag)
+        enough = n_valid >= min_valid * length
+        rows.append(pd.DataFrame({
+            'CHANNEL': name,
+            'UTC': aligned['UTC'].to_numpy()[::length][:len(wind)],
+            'N_VALID': n_valid,
+            'CORR': np.where(enough, corr, np.nan),
+            'XCORR_PEAK': np.where(enough, peak, np.nan),
+            'XCORR_LAG': np.where(enough, lag * step_seconds, np.nan),
+        }))
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(rows, ignore_index=True)
+
+
+def pressure_seismic_coherence(seis, ps_frames, t0, t1, window_seconds=600, nperseg_seconds=100,
+                               bands=DEFAULT_BANDS, max_gap_seconds=1.0):
+    """
+    [t0, t1) 구간에서 PS 기압과 SEIS 채널별 파형의 창 단위 코히어런스를 계산.
+
+    기압은 SEIS 샘플 시각으로 선형 보간하며, 기압 샘플 간격이 max_gap_seconds를
+    넘는 곳이나 SEIS 공백이 포함된 창은 건너뜁니다. UVW→ZNE 회전은 하지 않으므로
+    연직 성분 대신 채널을 그대로 씁니다 (VBB의 U/V/W 축은 모두 수평면에서 약 30°
+    기울어져 있어 연직 운동의 절반가량을 담으며, 기본값 BHU는 연직 채널의 대용입니다).
+
+    Returns:
+    - pandas.DataFrame: CHANNEL, 창 시작 UTC, 대역별 평균 코히어런스(COH_lo_hi), PEAK_FREQ, PEAK_COH
+    """
+    columns = ['CHANNEL', 'UTC'] + [f'COH_{lo:g}_{hi:g}' for lo, hi in bands] + ['PEAK_FREQ', 'PEAK_COH']
+    frames = [df for df in ps_frames if len(df)]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    ps = pd.concat(frames, ignore_index=True).sort_values('UTC')
+    ps_times = ps['UTC'].to_numpy(dtype='datetime64[us]').astype(np.int64)
+    pressure = ps[PRESSURE_COLUMN].to_numpy(dtype=np.float64)
+    gap_after = np.diff(ps_times) > max_gap_seconds * 1e6
+
+    rows = []
+    window = seis.window(obspy.UTCDateTime(str(t0)), obspy.UTCDateTime(str(t1)))
+    for tr in window:
+        fs = tr.stats.sampling_rate
+        length = int(round(window_seconds * fs))
+        if tr.stats.npts < length:
+            continue
+        start_us = np.datetime64(tr.stats.starttime.datetime, 'us').astype(np.int64)
+        times = start_us + np.rint(np.arange(tr.stats.npts) / fs * 1e6).astype(np.int64)
+        # 보간 구간 양 끝의 기압 샘플 사이가 끊겨 있으면 NaN (첫/마지막 기압 샘플 시각 포함)
+        broken = (times < ps_times[0]) | (times > ps_times[-1])
+        if len(ps_times) > 1:
+            right = np.clip(np.searchsorted(ps_times, times, side='left'), 1, len(ps_times) - 1)
+            broken |= gap_after[right - 1]
+        else:
+            broken |= times != ps_times[0]
+        p = np.where(broken, np.nan, np.interp(times, ps_times, pressure))
+
+        x = frame_windows(p, length)
+        y = frame_windows(tr.data, length)
+        usable = np.isfinite(x).all(axis=1)
+        if not usable.any():
+            continue
+        f, coh = coherence(x[usable], y[usable], fs, int(round(nperseg_seconds * fs)))
+        result = {'CHANNEL': tr.stats.channel.upper(),
+                  'UTC': times[::length][:len(x)][usable].astype('datetime64[us]')}
+        for lo, hi in bands:
+            in_band = (f >= lo) & (f < hi)
+            result[f'COH_{lo:g}_{hi:g}'] = coh[:, in_band].mean(axis=1) if in_band.any() else np.nan
+        peak = np.argmax(np.nan_to_num(coh[:, 1:]), axis=1) + 1
+        result['PEAK_FREQ'] = f[peak]
+        result['PEAK_COH'] = coh[np.arange(len(peak)), peak]
+        rows.append(pd.DataFrame(result))
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(rows, ignore_index=True)[columns]
+
+
+def _analyze_sol(sol, data_paths, channel, band, window_seconds, max_lag_seconds,
+                 nperseg_seconds, bands):
+    """
+    프로세스 풀 작업자: sol 하나의 풍속-지진 상관과 기압-지진 코히어런스를 계산.
+
+    TWINS/PS 파일은 LMST sol 기준이므로 앞 sol 파일까지 함께 읽습니다. 해당 sol에
+    SEIS 파일이 하나도 없으면 (None, None)을 반환하고, 그 밖의 오류는 그대로 전달합니다.
+    """
+    from core.data_model import SEISData, TWINSData, PSData
+
+    years, doys = sol_to_year_doy([sol, sol + 1])
+    periods = [f"{year}.{doy:03d}" for year, doy in zip(years, doys)]
+    manifest = Manifest.for_directory(data_paths['seis'])
+    if all(path is None for name in _split_channels(channel)
+           for path in manifest.resolve('seis', periods, name)):
+        return None, None
+    seis = SEISData(sol, 2, channel, data_paths['seis'], lazy=True)
+    twins = TWINSData(sol - 1, 2, data_paths['twins'], columns=[WIND_COLUMN], lazy=True)
+    ps = PSData(sol - 1, 2, data_paths['ps'], columns=[PRESSURE_COLUMN], lazy=True)
+
+    aligned = next(iter_aligned(sol, 1, seis=seis, twins=twins, band=band, twins_columns=[WIND_COLUMN]))
+    correlation = wind_seismic_correlation(aligned, channel, window_seconds, max_lag_seconds)
+    t0, t1 = sol_to_utc([sol, sol + 1])
+    coh = pressure_seismic_coherence(seis, ps.iter_frames(), t0, t1, window_seconds,
+                                     nperseg_seconds, bands)
+    correlation.insert(0, 'SOL', sol)
+    coh.insert(0, 'SOL', sol)
+    return correlation, coh
+
+
+def analyze_sols(start_sol, sol_range, data_paths, channel='BHU', band=None, window_seconds=600,
+                 max_lag_seconds=60, nperseg_seconds=100, bands=DEFAULT_BANDS, max_workers=None,
+                 output_dir=None):
+    """
+    sol 범위의 풍속-지진 상관과 기압-지진 코히어런스를 sol 단위로 병렬 계산.
+
+    Parameters:
+    - data_paths (dict): 'seis', 'twins', 'ps' 데이터 디렉토리
+    - channel (str): SEIS 채널 ('BHU,BHV,BHW'처럼 여러 채널 가능, 결과의 CHANNEL 열로 구분).
+      코히어런스는 회전하지 않은 채널 그대로 계산합니다 (pressure_seismic_coherence 참고)
+    - band (tuple): SEIS 대역 파워를 계산할 (minfreq, maxfreq) (None이면 원 신호)
+    - output_dir (str): 주어지면 wind_seis_correlation.csv, pressure_seis_coherence.csv로 저장
+
+    Returns:
+    - tuple: (상관 데이터프레임, 코히어런스 데이터프레임)
+    """
+    sols = list(range(start_sol, start_sol + sol_range))
+    n = len(sols)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_analyze_sol, sols, [data_paths] * n, [channel] * n, [band] * n,
+                                    [window_seconds] * n, [max_lag_seconds] * n,
+                                    [nperseg_seconds] * n, [bands] * n))
+    correlation = [c for c, _ in results if c is not None and len(c)]
+    coh = [c for _, c in results if c is not None and len(c)]
+    correlation = pd.concat(correlation, ignore_index=True) if correlation else pd.DataFrame()
+    coh = pd.concat(coh, ignore_index=True) if coh else pd.DataFrame()
+
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        correlation.to_csv(os.path.join(output_dir, 'wind_seis_correlation.csv'), index=False)
+        coh.to_csv(os.path.join(output_dir, 'pressure_seis_coherence.csv'), index=False)
+        logging.info(f"[*] {len(correlation)}개 상관 창, {len(coh)}개 코히어런스 창 저장: {output_dir}")
+    return correlation, coh
@@ -0,0 +1,141 @@
+import os
+import glob
+import tempfile
+import pandas as pd
+from conversions import parse_lmst, parse_ltst
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow가 없으면 캐시 없이 CSV를 직접 읽음
+    feather = None
+
+CACHE_DIR_NAME = '.cache'
+UTC_FORMAT = '%Y-%jT%H:%M:%S.%fZ'
+
+
+# 우주선 시계 열은 float32로 줄이면 정밀도가 사라지므로 dtype 정책에서 제외
+CLOCK_COLUMNS = ('AOBT', 'SCLK')
+
+
+def _select_columns(columns):
+    """
+    요청한 열 목록에 UTC를 포함시켜 반환 (None이면 전체 열).
+    """
+    if columns is None:
+        return None
+    return ['UTC'] + [c for c in columns if c != 'UTC']
+
+
+def apply_dtype(df, dtype):
+    """
+    dtype 정책을 데이터프레임에 적용.
+
+    dtype이 문자열(예: 'float32')이면 AOBT/SCLK를 제외한 모든 실수 열에,
+    dict이면 열별로 지정한 자료형을 적용합니다.
+    """
+    if dtype is None:
+        return df
+    if isinstance(dtype, dict):
+        dtypes = {c: t for c, t in dtype.items() if c in df.columns}
+    else:
+        dtypes = {c: dtype for c in df.columns
+                  if c not in CLOCK_COLUMNS and pd.api.types.is_float_dtype(df[c])}
+    return df.astype(dtypes, copy=False) if dtypes else df
+
+
+LOCAL_TIME_COLUMNS = {'LMST': parse_lmst, 'LTST': parse_ltst}
+
+
+def decode_local_time(df, columns=None):
+    """
+    LMST/LTST 문자열 열을 숫자 열 (LMST_SOL, LMST_SECONDS, LTST_SOL, LTST_SECONDS)로 변환.
+
+    columns가 주어졌는데 원래 문자열 열이 그 안에 없으면 문자열 열은 버립니다.
+    """
+    for name, parse in LOCAL_TIME_COLUMNS.items():
+        if name not in df.columns:
+            continue
+        sol, seconds = parse(df[name].to_numpy())
+        df[f'{name}_SOL'] = sol
+        df[f'{name}_SECONDS'] = seconds
+        if columns is not None and name not in columns:
+            df = df.drop(columns=name)
+    return df
+
+
+def _with_local_time(columns):
+    if columns is None:
+        return None
+    return list(columns) + [c for c in LOCAL_TIME_COLUMNS if c not in columns]
+
+
+def parse_csv(file_name, columns=None, dtype=None):
+    """
+    TWINS/PS CSV 파일을 읽고 UTC 열을 datetime으로 변환.
+    """
+    df = pd.read_csv(file_name, usecols=_select_columns(columns),
+                     dtype=dtype if isinstance(dtype, dict) else None)
+    df['UTC'] = pd.to_datetime(df['UTC'], format=UTC_FORMAT)
+    return apply_dtype(df, dtype)
+
+
+def cache_path(file_name):
+    """
+    CSV 파일에 대응하는 Feather 캐시 경로.
+
+    원본의 크기와 mtime이 파일명에 들어가므로 원본이 바뀌면 자동으로 다른
+    캐시 파일을 가리킵니다.
+    """
+    stat = os.stat(file_name)
+    directory, base_name = os.path.split(file_name)
+    return os.path.join(directory, CACHE_DIR_NAME,
+                        f'{base_name}.{stat.st_size}.{stat.st_mtime_ns}.feather')
+
+
+def read_csv_cached(file_name, use_cache=True, columns=None, dtype=None, parse_local_time=False):
+    """
+    CSV를 Feather 캐시를 거쳐 읽음.
+
+    처음 읽을 때 UTC가 변환된 데이터프레임을 비압축 Feather로 저장하고,
+    이후에는 캐시를 memory-map으로 읽습니다. pyarrow가 없거나 use_cache가
+    False이면 CSV를 그대로 파싱합니다.
+
+    Parameters:
+    - columns (list): 읽을 열 목록 (UTC는 항상 포함, None이면 전체)
+    - dtype (str or dict): apply_dtype에 전달할 dtype 정책
+    - parse_local_time (bool): LMST/LTST를 숫자 열로 변환해 추가 (decode_local_time 참고)
+    """
+    if parse_local_time:
+        df = read_csv_cached(file_name, use_cache, _with_local_time(columns), dtype)
+        return decode_local_time(df, columns)
+
+    if feather is None or not use_cache:
+        return parse_csv(file_name, columns, dtype)
+
+    path = cache_path(file_name)
+    if os.path.exists(path):
+        table = feather.read_table(path, columns=_select_columns(columns), memory_map=True)
+        return apply_dtype(table.to_pandas(), dtype)
+
+    df = parse_csv(file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # 같은 원본의 오래된 캐시 삭제 (다른 프로세스가 먼저 지웠을 수 있음)
+    base_name = os.path.basename(file_name)
+    for stale_path in glob.glob(os.path.join(os.path.dirname(path), glob.escape(base_name) + '.*.feather')):
+        if stale_path != path:
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                pass
+    # 여러 프로세스가 같은 캐시를 동시에 만들 수 있으므로 임시 파일은 프로세스마다 따로 만듦
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=base_name + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    if columns is not None:
+        df = df[_select_columns(columns)]
+    return apply_dtype(df, dtype)
@@ -1,196 +1,1004 @@
 import sys
 import os
+import json
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
 # print(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
 
 from scipy import signal
 import numpy as np
 import obspy
-import matplotlib.pyplot as plt
+import matplotlib
+from matplotlib.figure import Figure
 import pandas as pd
-from utils import sols_to_earth_date
+from conversions import sol_to_year_doy
+from manifest import Manifest
+from core.csv_cache import read_csv_cached
+from core.streaming import StreamingBandpass, StreamingSpectrogram
+from core.result_cache import ResultCache, file_digest
+from core.decimation import minmax_decimate, minmax_indices, pixel_width
+from core.diurnal import DiurnalAggregator
+from core.vortex import detect_catalog, match_wind
+from core.trigger import StreamingStaLta, StreamingTrigger, build_catalog, file_spans, locate_file
+from core.sample_store import ensure_decoded, open_sample_file
+from core.parallel_load import ordered_map
+from core.merge import merge_layout, merge_streams, segment_views, slice_trace
 
 
 
+def _stream_to_arrays(stream):
+    """
+    Stream을 ResultCache에 저장할 수 있는 배열 dict로 변환.
+    """
+    headers = []
+    arrays = {}
+    for i, tr in enumerate(stream):
+        headers.append({
+            'network': tr.stats.network,
+            'station': tr.stats.station,
+            'location': tr.stats.location,
+            'channel': tr.stats.channel,
+            'starttime': str(tr.stats.starttime),
+            'sampling_rate': tr.stats.sampling_rate,
+        })
+        arrays[f'trace_{i}'] = tr.data
+    arrays['headers'] = np.array(json.dumps(headers))
+    return arrays
+
+
+def _arrays_to_stream(arrays):
+    headers = json.loads(str(arrays['headers']))
+    traces = []
+    for i, header in enumerate(headers):
+        header['starttime'] = obspy.UTCDateTime(header['starttime'])
+        traces.append(obspy.Trace(arrays[f'trace_{i}'], header=header))
+    return obspy.Stream(traces)
+
+
+def _process_trace(data, sampling_rate, minfreq, maxfreq, stft_kwargs):
+    """
+    프로세스 풀 작업자: 트레이스 하나를 band-pass 필터링하고 스펙트로그램을 계산.
+
+    필터 상태(zi)가 담긴 StreamingBandpass도 돌려주어 extend()에서 이어 필터링합니다.
+    """
+    bandpass = StreamingBandpass(minfreq, maxfreq, sampling_rate)
+    filtered = bandpass.process(data)
+    f, t, sxx = signal.spectrogram(filtered, sampling_rate, **stft_kwargs)
+    return filtered, f, t, sxx, bandpass
+
+
+def _trigger_channel(start_sol, sol_range, channel, data_path, minfreq, maxfreq,
+                     sta_seconds, lta_seconds, thr_on, thr_off, chunk_size, backend='obspy'):
+    """
+    프로세스 풀 작업자: 채널 하나를 청크 단위로 필터링하며 STA/LTA 트리거를 실행.
+
+    Returns:
+    - list: (트리거 시각, 파일 경로, 파일 시작 시각) 목록
+    """
+    seis = SEISData(start_sol, sol_range, channel, data_path, lazy=True, backend=backend)
+    spans = file_spans(seis.headers)
+    sta_lta = None
+    trigger = None
+    events = []
+    segment_start = None
+    offset = 0
+    for start, rate, chunk, new_segment, _ in seis.iter_filtered_chunks(minfreq, maxfreq, chunk_size):
+        if sta_lta is None or new_segment:
+            # 공백 이후에는 STA/LTA와 트리거 상태를 새로 시작
+            sta_lta = StreamingStaLta(int(sta_seconds * rate), int(lta_seconds * rate))
+            trigger = StreamingTrigger(thr_on, thr_off)
+            segment_start = start
+            offset = 0
+        for on, _ in trigger.process(sta_lta.process(chunk), offset):
+            on_time = segment_start + on / rate
+            events.append((on_time, *locate_file(on_time, spans)))
+        offset += len(chunk)
+    return events
+
+
 class SEISData:
-    def __init__(self, start_sol, sol_range, channel='BHU', data_path='downloads/seis'):
+    def __init__(self, start_sol, sol_range, channel='BHU', data_path='downloads/seis', lazy=False,
+                 cache=None, backend='obspy', max_workers=1):
+        """
+        Parameters:
+        - lazy (bool): True이면 생성 시 헤더만 읽고, 파형은 window()로 필요한 구간만 읽음
+        - cache (ResultCache): 필터링/스펙트로그램 결과를 저장할 캐시 (선택)
+        - backend (str): 'obspy'이면 매번 miniSEED를 디코딩하고, 'memmap'이면 처음 한 번
+          디코딩한 샘플 파일을 np.memmap으로 읽음 (core.sample_store 참고)
+        - max_workers (int): 파일 디코딩 프로세스 수 (1이면 순차, None이면 CPU 수)
+
+        channel에는 'BHU,BHV,BHW'처럼 쉼표로 구분하거나 리스트로 여러 채널을
+        지정할 수 있습니다.
+        """
         self.start_sol = start_sol
         self.sol_range = sol_range
         self.data_path = data_path
-        self.channel = channel.lower()
+        if isinstance(channel, str):
+            channel = channel.split(',')
+        self.channels = [c.strip().lower() for c in channel]
+        self.channel = ','.join(self.channels)
+        self.lazy = lazy
+        self.cache = cache
+        if backend not in ('obspy', 'memmap'):
+            raise ValueError("backend must be 'obspy' or 'memmap'")
+        self.backend = backend
+        self.max_workers = max_workers
+        self.filter_band = None
+        self.filtered_stream = None
+        # extend()/refresh()에서 이어 계산하기 위한 필터 상태와 트레이스 id별 스펙트로그램
+        self._filter_states = {}
+        self._spectrograms = {}
         self.file_names = self._get_file_names()
-        self.stream = self._load_data()
-        
+        self.gap_masks = {}
+        if lazy:
+            self.headers = self._read_headers()
+            self.stream = None
+        else:
+            self.stream = self._load_data()
+
     def _get_file_names(self):
+        sol_numbers = list(range(self.start_sol, self.start_sol + self.sol_range))
+        years, doys = sol_to_year_doy(sol_numbers)
+        periods = [f"{year}.{doy:03d}" for year, doy in zip(years, doys)]
+
+        manifest = Manifest.for_directory(self.data_path)
         file_names = []
-        for sol_number in range(self.start_sol, self.start_sol + self.sol_range):
-            date = sols_to_earth_date(sol_number)
-            year = date.year
-            doy = date.timetuple().tm_yday
-            found = False
-            for filename in sorted(os.listdir(self.data_path)):
-                if (".mseed" in filename and
-                    f"{doy}" in filename and
-                    f"{year}" in filename and
-                        self.channel in filename.lower()):
-                    file_names.append(os.path.join(self.data_path, filename))
-                    found = True
-                    break
-            if not found:
-                print(f"SEIS file for sol {sol_number} not found.")
+        for channel in self.channels:
+            for sol_number, path in zip(sol_numbers, manifest.resolve('seis', periods, channel)):
+                if path is None:
+                    print(f"SEIS {channel.upper()} file for sol {sol_number} not found.")
+                else:
+                    file_names.append(path)
         return file_names
 
-    def _load_data(self):
-        if not self.file_names:
+    def _load_data(self, file_names=None, base_stream=None):
+        """
+        파일들을 읽어 병합한 Stream을 반환.
+
+        base_stream이 주어지면 그 트레이스를 먼저 채운 뒤 file_names를 이어 채우므로
+        (extend/refresh), 이미 읽은 파일을 다시 디코딩하지 않습니다.
+        """
+        file_names = self.file_names if file_names is None else file_names
+        if not file_names:
             raise FileNotFoundError("No SEIS files found.")
-        combined_stream = obspy.read(self.file_names[0])
-        for file in self.file_names[1:]:
-            combined_stream += obspy.read(file)
-        combined_stream.merge(method=1)
-        return combined_stream
+        if self.backend == 'memmap':
+            # 디코딩은 프로세스 풀에서 미리 해 두고, 이후 읽기는 memmap 뷰
+            for _ in ordered_map(ensure_decoded, file_names, self.max_workers, 'process'):
+                pass
+            streams = (self._read_file(f) for f in file_names)
+        else:
+            # 작업자가 다음 파일을 디코딩하는 동안 앞선 파일을 병합 배열에 채움 (sol 순서 유지)
+            streams = ordered_map(obspy.read, file_names, self.max_workers, 'process')
+        # 헤더로 병합 결과 크기를 먼저 정해 한 번만 할당하고, 파일을 하나씩 읽어 채움
+        spans = [(trace_id, start, end, rate) for _, trace_id, start, end, rate in self._read_spans(file_names)]
+        if base_stream is not None:
+            spans += [(tr.id, tr.stats.starttime, tr.stats.endtime, tr.stats.sampling_rate)
+                      for tr in base_stream]
+            # 기존 트레이스는 공백 없는 구간 뷰로만 채워 공백 마스크를 그대로 이어받음
+            base_views = [view for tr in base_stream for view in segment_views(tr, self.gap_masks.get(tr.id))]
+            streams = itertools.chain([obspy.Stream(base_views)], streams)
+        stream, self.gap_masks = merge_streams(merge_layout(spans), streams)
+        return stream
+
+    def _read_spans(self, file_names=None):
+        """
+        각 파일의 (파일, 트레이스 id, 시작 시각, 종료 시각, 샘플링 레이트) 목록 (파형은 읽지 않음).
+        """
+        file_names = self.file_names if file_names is None else file_names
+        if not file_names:
+            raise FileNotFoundError("No SEIS files found.")
+        spans = []
+        for file in file_names:
+            if self.backend == 'memmap':
+                for segment in open_sample_file(file).segments:
+                    trace_id = '.'.join(segment[key] for key in ('network', 'station', 'location', 'channel'))
+                    rate = segment['sampling_rate']
+                    spans.append((file, trace_id, segment['starttime'],
+                                  segment['starttime'] + (segment['npts'] - 1) / rate, rate))
+                continue
+            for tr in obspy.read(file, headonly=True):
+                spans.append((file, tr.id, tr.stats.starttime, tr.stats.endtime, tr.stats.sampling_rate))
+        return spans
+
+    def _read_headers(self, file_names=None):
+        """
+        각 파일의 트레이스 헤더만 읽어 (파일, 시작 시각, 종료 시각) 목록을 만듦.
+        """
+        return [(file, start, end) for file, _, start, end, _ in self._read_spans(file_names)]
+
+    def extend(self, n_sols=1):
+        """
+        sol 범위를 n_sols만큼 늘리고 새로 필요한 파일만 읽음 (refresh 참고).
+        """
+        self.sol_range += n_sols
+        return self.refresh()
+
+    def refresh(self):
+        """
+        현재 sol 범위에서 아직 읽지 않은 파일(새로 다운로드된 파일 포함)만 읽어 덧붙임.
+
+        기존 파형은 다시 디코딩하지 않고 병합 배열로 옮기며, filter_data()로
+        만든 필터링 결과와 compute_spectrogram() 결과는 새 샘플만큼만 이어서
+        계산합니다 (새 데이터가 기존 끝보다 앞에 들어오면 필터링을 다시 함).
+
+        Returns:
+        - list: 새로 읽은 파일 목록
+        """
+        file_names = self._get_file_names()
+        new_files = [f for f in file_names if f not in self.file_names]
+        if not new_files:
+            return []
+        self.file_names = file_names
+        if self.lazy:
+            self.headers = self.headers + self._read_headers(new_files)
+            return new_files
+
+        old_end = {tr.id: tr.stats.endtime for tr in self.stream}
+        new_start = {}
+        for _, trace_id, start, _, _ in self._read_spans(new_files):
+            new_start[trace_id] = min(start, new_start.get(trace_id, start))
+        self.stream = self._load_data(new_files, self.stream)
+        if self.filter_band is None or self.filtered_stream is None:
+            return new_files
+        # 모든 채널의 새 데이터가 기존 끝 뒤에 붙고 필터 상태가 남아 있으면 이어서 계산
+        appended = all(trace_id in self._filter_states and start > old_end[trace_id]
+                       for trace_id, start in new_start.items() if trace_id in old_end)
+        if appended:
+            self._extend_filtered(old_end)
+        else:
+            self.filter_data(*self.filter_band)
+        return new_files
+
+    def _extend_filtered(self, old_end):
+        """
+        old_end 이후 새 샘플만 필터링해 filtered_stream과 스펙트로그램에 이어 붙임.
+        """
+        minfreq, maxfreq = self.filter_band
+        traces = list(self.filtered_stream)
+        for tr in self.stream:
+            tail, gap = tr, self.gap_masks.get(tr.id)
+            if tr.id in old_end:
+                tail, gap = slice_trace(tr, gap, old_end[tr.id] + tr.stats.delta)
+            bandpass, end = self._filter_states.get(tr.id, (None, None))
+            for view in segment_views(tail, gap):
+                contiguous = (bandpass is not None and
+                              abs(view.stats.starttime - (end + view.stats.delta)) < 0.5 * view.stats.delta)
+                if not contiguous:
+                    bandpass = StreamingBandpass(minfreq, maxfreq, view.stats.sampling_rate)
+                filtered = bandpass.process(view.data)
+                if contiguous:
+                    # 직전 구간에 이어지므로 마지막 필터링 트레이스에 덧붙임
+                    last = max((t for t in traces if t.id == tr.id), key=lambda t: t.stats.starttime)
+                    last.data = np.concatenate([last.data, filtered])
+                else:
+                    view.data = filtered
+                    traces.append(view)
+                end = view.stats.endtime
+            if bandpass is not None:
+                self._filter_states[tr.id] = (bandpass, end)
+        order = {tr.id: i for i, tr in enumerate(self.stream)}
+        traces.sort(key=lambda t: (order[t.id], t.stats.starttime))
+        self.filtered_stream = obspy.Stream(traces)
+
+        # 스펙트로그램 열도 길어진 마지막 구간과 새로 붙은 구간만큼만 계산
+        for trace_id, state in list(self._spectrograms.items()):
+            segments = [t for t in self.filtered_stream if t.id == trace_id]
+            last_start, last_npts = state['last']
+            index = next((i for i, t in enumerate(segments) if t.stats.starttime == last_start), None)
+            if state['stft'] is None or index is None:
+                del self._spectrograms[trace_id]
+                continue
+            if segments[index].stats.npts > last_npts:
+                self._append_columns(state, segments[index], last_npts)
+            for tr in segments[index + 1:]:
+                self._append_columns(state, tr)
+            if state['f'] is None:
+                # 아직 nperseg보다 짧으면 compute_spectrogram()에서 다시 계산
+                del self._spectrograms[trace_id]
+
+    def _read_file(self, file, t0=None, t1=None):
+        """
+        파일 하나의 [t0, t1] 구간을 Stream으로 읽음 (memmap 백엔드는 복사 없는 뷰).
+        """
+        if self.backend == 'memmap':
+            return obspy.Stream(open_sample_file(file).traces(t0, t1))
+        return obspy.read(file, starttime=t0, endtime=t1)
+
+    @property
+    def starttime(self):
+        if self.stream is not None:
+            return min(tr.stats.starttime for tr in self.stream)
+        return min(start for _, start, _ in self.headers)
+
+    @property
+    def endtime(self):
+        if self.stream is not None:
+            return max(tr.stats.endtime for tr in self.stream)
+        return max(end for _, _, end in self.headers)
+
+    def window(self, t0, t1):
+        """
+        [t0, t1] 구간의 파형만 읽어 공백 없는 구간별 Trace로 나눈 Stream을 반환.
+
+        t0, t1은 obspy.UTCDateTime으로 변환 가능한 값이며, 구간과 겹치는
+        파일만 starttime/endtime을 지정해 읽으므로 메모리 사용량은 전체 sol
+        범위가 아니라 구간 길이에 비례합니다. 각 Trace의 데이터는 병합 배열의 뷰입니다.
+        """
+        stream, gap_masks = self._merged_window(t0, t1)
+        return obspy.Stream([view for tr in stream for view in segment_views(tr, gap_masks.get(tr.id))])
+
+    def _merged_window(self, t0, t1):
+        """
+        [t0, t1] 구간을 채널별 트레이스 하나로 병합해 (Stream, 공백 마스크 dict)로 반환.
+        """
+        t0 = obspy.UTCDateTime(t0)
+        t1 = obspy.UTCDateTime(t1)
+        if self.stream is not None:
+            traces = []
+            gap_masks = {}
+            for tr in self.stream:
+                sliced, gap = slice_trace(tr, self.gap_masks.get(tr.id), t0, t1)
+                if sliced.stats.npts:
+                    traces.append(sliced)
+                    gap_masks[tr.id] = gap
+            return obspy.Stream(traces), gap_masks
+
+        files = []
+        for file, start, end in self.headers:
+            if start <= t1 and end >= t0 and file not in files:
+                files.append(file)
+        pieces = [self._read_file(file, t0, t1) for file in files]
+        spans = [(tr.id, tr.stats.starttime, tr.stats.endtime, tr.stats.sampling_rate)
+                 for piece in pieces for tr in piece]
+        if len({span[0] for span in spans}) == len(spans):
+            # 채널마다 조각이 하나뿐이면 병합하지 않음 (memmap 백엔드에서는 복사 없음)
+            return obspy.Stream([tr for piece in pieces for tr in piece]), {}
+        return merge_streams(merge_layout(spans), pieces)
+
+    def _cache_key(self, kind, **params):
+        return ResultCache.make_key(kind=kind, channel=self.channel,
+                                    files=[file_digest(f) for f in self.file_names], **params)
+
+    def filter_cache_key(self):
+        """
+        filter_data() 결과가 ResultCache에 저장되는 키 (현재 filter_band 기준).
+        """
+        return self._cache_key('filter', band=self.filter_band)
+
+    def spectrogram_cache_key(self, channel=None, **kwargs):
+        """
+        compute_spectrogram(channel, **kwargs) 결과가 ResultCache에 저장되는 키.
+        """
+        trace_id = self._trace_id(self.filtered_stream, channel)
+        return self._cache_key('spectrogram', band=self.filter_band, trace=trace_id, stft=kwargs)
 
     def filter_data(self, minfreq, maxfreq):
-        self.filtered_stream = self.stream.copy()
-        self.filtered_stream = self.filtered_stream.split()
-        self.filtered_stream.filter('bandpass', freqmin=minfreq, freqmax=maxfreq)
+        self.filter_band = (minfreq, maxfreq)
+        self._filter_states = {}
+        self._spectrograms = {}
+        if self.cache is not None:
+            key = self.filter_cache_key()
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.filtered_stream = _arrays_to_stream(cached)
+                return self.filtered_stream
+
+        stream, gap_masks = self._merged_window(self.starttime, self.endtime)
+        self.filtered_stream = self._filter_segments(stream, gap_masks, minfreq, maxfreq)
+        if self.cache is not None:
+            self.cache.put(key, _stream_to_arrays(self.filtered_stream))
         return self.filtered_stream
 
+    def _filter_segments(self, stream, gap_masks, minfreq, maxfreq, chunk_size=2 ** 20):
+        """
+        공백 없는 구간별로 band-pass 필터링 (stream.copy().split().filter('bandpass')와 같은 결과).
+
+        트레이스마다 결과 배열을 한 번 할당하고, 구간 뷰를 chunk_size 샘플씩
+        필터링해 제자리에 채우므로 원본 복사나 구간별 배열 할당이 없습니다.
+        """
+        traces = []
+        for tr in stream:
+            out = np.empty(tr.stats.npts)
+            bandpass = StreamingBandpass(minfreq, maxfreq, tr.stats.sampling_rate)
+            for view in segment_views(tr, gap_masks.get(tr.id)):
+                offset = int(round((view.stats.starttime - tr.stats.starttime) * tr.stats.sampling_rate))
+                bandpass.reset()
+                for i in range(0, view.stats.npts, chunk_size):
+                    filtered = bandpass.process(view.data[i:i + chunk_size])
+                    out[offset + i:offset + i + len(filtered)] = filtered
+                view.data = out[offset:offset + view.stats.npts]
+                traces.append(view)
+                # 마지막 구간의 필터 상태는 extend()에서 이어 씀
+                self._filter_states[tr.id] = (bandpass, view.stats.endtime)
+        return obspy.Stream(traces)
+
+    def process_traces(self, minfreq, maxfreq, max_workers=None, **stft_kwargs):
+        """
+        모든 채널과 공백으로 나뉜 모든 구간을 프로세스 풀에서 병렬로 처리.
+
+        각 트레이스를 filter_data()와 같은 band-pass로 필터링하고 스펙트로그램을
+        계산합니다. 필터링 결과는 filtered_stream에도 반영됩니다.
+
+        Returns:
+        - list: 트레이스별 dict (id, starttime, sampling_rate, filtered, f, t, sxx)
+        """
+        traces = list(self.window(self.starttime, self.endtime))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_process_trace, tr.data, tr.stats.sampling_rate,
+                                       minfreq, maxfreq, stft_kwargs) for tr in traces]
+            outputs = [future.result() for future in futures]
+
+        # 이전 대역의 필터 상태와 스펙트로그램은 더 이상 filtered_stream과 맞지 않음
+        self._filter_states = {}
+        self._spectrograms = {}
+        results = []
+        filtered_traces = []
+        for tr, (filtered, f, t, sxx, bandpass) in zip(traces, outputs):
+            results.append({
+                'id': tr.id,
+                'starttime': tr.stats.starttime,
+                'sampling_rate': tr.stats.sampling_rate,
+                'filtered': filtered,
+                'f': f,
+                't': t,
+                'sxx': sxx,
+            })
+            filtered_traces.append(obspy.Trace(filtered, header=tr.stats.copy()))
+            # 구간은 시간 순이므로 채널마다 마지막 구간의 상태가 남음
+            self._filter_states[tr.id] = (bandpass, tr.stats.endtime)
+        self.filter_band = (minfreq, maxfreq)
+        self.filtered_stream = obspy.Stream(filtered_traces)
+        return results
+
+    def detect_events(self, minfreq, maxfreq, sta_seconds=120, lta_seconds=600, thr_on=4, thr_off=1.5,
+                      chunk_size=2 ** 20, max_workers=None, output_path=None):
+        """
+        band-pass 필터링한 파형에 STA/LTA 트리거를 적용해 이벤트 카탈로그를 만듦.
+
+        채널마다 프로세스 하나가 sol 파일을 청크 단위로 읽어 처리하므로 메모리
+        사용량은 sol 범위와 무관합니다. 카탈로그는 demo_notebook.ipynb의
+        apollo12_catalog_GradeA_final.csv와 같은 열(filename, time_abs(...),
+        time_rel(sec), evid)을 가지며, time_rel은 해당 파일 시작 기준입니다.
+
+        Parameters:
+        - sta_seconds, lta_seconds (float): STA/LTA 창 길이 (초)
+        - thr_on, thr_off (float): 트리거 켜짐/꺼짐 임계값
+        - output_path (str): 주어지면 카탈로그를 CSV로 저장
+
+        Returns:
+        - pandas.DataFrame: 이벤트 카탈로그
+        """
+        n = len(self.channels)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                _trigger_channel, [self.start_sol] * n, [self.sol_range] * n, self.channels,
+                [self.data_path] * n, [minfreq] * n, [maxfreq] * n, [sta_seconds] * n,
+                [lta_seconds] * n, [thr_on] * n, [thr_off] * n, [chunk_size] * n, [self.backend] * n))
+
+        catalog = build_catalog([event for channel_events in results for event in channel_events])
+        if output_path is not None:
+            catalog.to_csv(output_path, index=False)
+        return catalog
+
+    @staticmethod
+    def _trace_id(stream, channel=None):
+        """
+        stream에서 트레이스 id 또는 채널 코드(예: 'BHV')에 해당하는 트레이스 id (None이면 첫 트레이스).
+        """
+        trace_ids = list(dict.fromkeys(tr.id for tr in stream))
+        if not trace_ids:
+            raise ValueError("No SEIS traces.")
+        if channel is None:
+            return trace_ids[0]
+        for trace_id in trace_ids:
+            if channel.upper() in (trace_id.upper(), trace_id.split('.')[-1].upper()):
+                return trace_id
+        raise ValueError(f"No SEIS trace for channel {channel} (traces: {', '.join(trace_ids)})")
+
+    def compute_spectrogram(self, channel=None, **kwargs):
+        """
+        filtered_stream 한 채널의 스펙트로그램 (kwargs는 scipy.signal.spectrogram 옵션).
+
+        공백으로 나뉜 구간마다 scipy.signal.spectrogram과 같은 열을 계산해 이어
+        붙이며, t는 채널 첫 샘플 기준 초입니다. nperseg보다 짧은 구간은 주파수 축이
+        달라지므로 건너뜁니다 (채널 전체가 짧으면 scipy처럼 nperseg를 줄여 한 열 계산).
+
+        Parameters:
+        - channel (str): 트레이스 id 또는 채널 코드 (예: 'BHV', 기본값은 첫 채널)
+
+        Returns:
+        - tuple: (f, t, sxx)
+        """
+        trace_id = self._trace_id(self.filtered_stream, channel)
+        if self.cache is not None:
+            key = self.spectrogram_cache_key(trace_id, **kwargs)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached['f'], cached['t'], cached['sxx']
+
+        state = self._spectrograms.get(trace_id)
+        if state is not None and state['kwargs'] == kwargs:
+            return state['f'], state['t'], state['sxx']
+
+        segments = [tr for tr in self.filtered_stream if tr.id == trace_id]
+        # extend() 때 새 열만 이어서 계산하도록 마지막 구간의 STFT 상태를 보관
+        state = {'kwargs': kwargs, 'start': segments[0].stats.starttime, 'stft': None,
+                 'f': None, 't': np.empty(0), 'sxx': None}
+        for tr in segments:
+            self._append_columns(state, tr)
+        if state['f'] is None:
+            # 모든 구간이 nperseg보다 짧음: scipy처럼 nperseg를 줄여 계산하며, 이 경우
+            # 분할이 달라지므로 extend()에서 이어 계산하지 않음
+            f, t, sxx = state['stft'].finish()
+            state.update(f=f, t=t + state['offset'], sxx=sxx, stft=None)
+        self._spectrograms[trace_id] = state
+        if self.cache is not None:
+            self.cache.put(key, {'f': state['f'], 't': state['t'], 'sxx': state['sxx']})
+        return state['f'], state['t'], state['sxx']
+
+    @staticmethod
+    def _append_columns(state, tr, start=0):
+        """
+        tr.data[start:]의 스펙트로그램 열을 state에 이어 붙임 (start가 0이면 새 구간).
+        """
+        if start == 0:
+            state['stft'] = StreamingSpectrogram(tr.stats.sampling_rate, **state['kwargs'])
+            state['offset'] = tr.stats.starttime - state['start']
+        f, t, sxx = state['stft'].process(tr.data[start:])
+        state['last'] = (tr.stats.starttime, tr.stats.npts)
+        if sxx.shape[1]:
+            state['f'] = f
+            state['t'] = np.concatenate([state['t'], t + state['offset']])
+            state['sxx'] = sxx if state['sxx'] is None else np.hstack([state['sxx'], sxx])
+
     def plot_waveform(self, output_path):
-        tr = self.stream[0]
-        tr_times = tr.times()
-        tr_data = tr.data
-
-        plt.figure(figsize=(10, 5))
-        plt.plot(tr_times, tr_data)
-        plt.xlabel('Time (s)', fontweight='bold')
-        plt.ylabel('Amplitude', fontweight='bold')
-        plt.title('SEIS Waveform')
-        plt.savefig(output_path)
-        plt.close()
+        """
+        채널마다 한 패널씩 전체 파형을 그림 (공백은 끊어 그림).
+
+        lazy 인스턴스는 전체 구간을 읽어 그립니다. 가로축은 첫 샘플 기준 초입니다.
+        """
+        stream, gap_masks = self._merged_window(self.starttime, self.endtime)
+        if len(stream) == 0:
+            raise ValueError("No SEIS samples to plot.")
+        t0 = min(tr.stats.starttime for tr in stream)
+        figsize = (10, 5) if len(stream) == 1 else (10, 2.5 * len(stream))
+        width = pixel_width(figsize, matplotlib.rcParams['figure.dpi'])
+
+        # pyplot 전역 상태 없이 Figure 객체로 그림 (프로세스 풀에서도 안전)
+        fig = Figure(figsize=figsize)
+        axes = fig.subplots(len(stream), 1, sharex=True, squeeze=False)[:, 0]
+        for ax, tr in zip(axes, stream):
+            data = tr.data
+            gap = gap_masks.get(tr.id)
+            if gap is not None and gap.any():
+                # 공백은 NaN으로 그려 선이 끊기도록 함
+                data = np.where(gap, np.nan, data)
+            # 그림 가로 픽셀 수만큼의 구간별 최솟값/최댓값만 그림
+            index = minmax_indices(data, width)
+            ax.plot(index * tr.stats.delta + (tr.stats.starttime - t0), data[index])
+            ax.set_ylabel(f'{tr.stats.channel}\nAmplitude', fontweight='bold')
+        axes[-1].set_xlabel('Time (s)', fontweight='bold')
+        axes[0].set_title('SEIS Waveform')
+        fig.savefig(output_path)
+
+    def _iter_traces(self):
+        """
+        연속 구간 트레이스를 시간 순으로 반환. lazy 모드에서는 파일을 하나씩 읽음.
+        """
+        if self.stream is not None:
+            for tr in self.stream:
+                for view in segment_views(tr, self.gap_masks.get(tr.id)):
+                    yield view
+            return
+        for file in self.file_names:
+            file_stream = self._read_file(file)
+            file_stream.sort(['starttime'])
+            for tr in file_stream:
+                yield tr
+
+    def iter_filtered_chunks(self, minfreq, maxfreq, chunk_size=2 ** 20):
+        """
+        전체 sol 범위를 chunk_size 샘플 단위로 band-pass 필터링하며 반환.
+
+        청크 경계에서는 필터 상태를 이어 가고 데이터 공백에서만 초기화하므로,
+        결과는 filter_data()의 구간별 필터링과 같습니다.
+
+        Yields:
+        - tuple: (청크 시작 시각, 샘플링 레이트, 필터링된 청크, 새 구간 시작 여부, 트레이스 id)
+        """
+        bandpass = None
+        prev_end = None
+        prev_id = None
+        for tr in self._iter_traces():
+            rate = tr.stats.sampling_rate
+            delta = tr.stats.delta
+            if bandpass is None or bandpass_rate != rate:
+                bandpass = StreamingBandpass(minfreq, maxfreq, rate)
+                bandpass_rate = rate
+                prev_end = None
+            contiguous = (prev_end is not None and tr.id == prev_id and
+                          abs(tr.stats.starttime - (prev_end + delta)) < 0.5 * delta)
+            if not contiguous:
+                bandpass.reset()
+            for i in range(0, tr.stats.npts, chunk_size):
+                yield (tr.stats.starttime + i * delta, rate,
+                       bandpass.process(tr.data[i:i + chunk_size]), i == 0 and not contiguous, tr.id)
+            prev_end = tr.stats.endtime
+            prev_id = tr.id
+
+    def streaming_spectrogram(self, minfreq, maxfreq, chunk_size=2 ** 20, **kwargs):
+        """
+        필터링된 청크로부터 스펙트로그램 열을 채널별로 점진적으로 계산.
+
+        kwargs는 scipy.signal.spectrogram 옵션(nperseg, noverlap 등)입니다.
+
+        Yields:
+        - tuple: (트레이스 id, 구간 시작 시각, f, t, sxx) t는 구간 시작 기준 초
+        """
+        stft = None
+        trace_id = None
+        segment_start = None
+        yielded = False
+        chunks = self.iter_filtered_chunks(minfreq, maxfreq, chunk_size)
+        for start, rate, chunk, new_segment, chunk_id in chunks:
+            if chunk_id != trace_id:
+                if stft is not None and not yielded:
+                    yield from self._finish_spectrogram(trace_id, segment_start, stft)
+                trace_id = chunk_id
+                yielded = False
+            if stft is None or new_segment:
+                stft = StreamingSpectrogram(rate, **kwargs)
+                segment_start = start
+            f, t, sxx = stft.process(chunk)
+            if sxx.shape[1]:
+                yielded = True
+                yield trace_id, segment_start, f, t, sxx
+        if stft is not None and not yielded:
+            yield from self._finish_spectrogram(trace_id, segment_start, stft)
+
+    @staticmethod
+    def _finish_spectrogram(trace_id, segment_start, stft):
+        # 채널 전체가 nperseg보다 짧으면 scipy처럼 nperseg를 줄여 한 열 계산
+        # (중간의 짧은 구간은 주파수 축이 달라지므로 건너뜀)
+        f, t, sxx = stft.finish()
+        if sxx.shape[1]:
+            yield trace_id, segment_start, f, t, sxx
+
+    def plot_spectrogram_streaming(self, minfreq, maxfreq, output_path, chunk_size=2 ** 20):
+        """
+        전체 sol 범위의 스펙트로그램을 청크 단위로 계산해 채널마다 한 패널씩 그림 (메모리 사용량 고정).
+        """
+        panels = {}
+        for trace_id, segment_start, f, t, sxx in self.streaming_spectrogram(minfreq, maxfreq, chunk_size):
+            panel = panels.setdefault(trace_id, {'f': f, 'starts': [], 'times': [], 'columns': []})
+            panel['starts'].append(segment_start)
+            panel['times'].append(t)
+            panel['columns'].append(sxx)
+        if not panels:
+            raise ValueError("Not enough SEIS samples for a spectrogram.")
+        # 가로축은 모든 채널 공통으로 가장 먼저 시작한 구간 기준 초
+        t0 = min(panel['starts'][0] for panel in panels.values())
+        self._render_spectrogram(
+            [(trace_id, panel['f'],
+              np.concatenate([t + (start - t0) for start, t in zip(panel['starts'], panel['times'])]),
+              np.hstack(panel['columns'])) for trace_id, panel in panels.items()],
+            minfreq, maxfreq, output_path)
 
     def plot_spectrogram(self, minfreq, maxfreq, output_path):
-        tr = self.filtered_stream[0]
-        f, t, sxx = signal.spectrogram(tr.data, tr.stats.sampling_rate)
-        sxx = np.sqrt(sxx + 1e-1000)
-        sxx = np.log10(sxx + 1e-1000)
-
-        plt.figure(figsize=(10, 5))
-        plt.pcolormesh(t, f, sxx, shading='gouraud', cmap='jet')
-        plt.ylim([minfreq, maxfreq])
-        plt.yscale('log')
-        plt.yticks([0.1, 1, 10])
-        plt.xlabel('Time (s)', fontweight='bold')
-        plt.ylabel('Frequency (Hz)', fontweight='bold')
-        plt.title('SEIS Spectrogram')
-        cbar = plt.colorbar(orientation='horizontal')
-        cbar.set_label('Power ((m/s)/sqrt(Hz))', fontweight='bold')
-        plt.savefig(output_path)
-        plt.close()
+        """
+        filtered_stream의 채널마다 한 패널씩 스펙트로그램을 그림 (compute_spectrogram 참고).
+        """
+        t0 = min(tr.stats.starttime for tr in self.filtered_stream)
+        panels = []
+        for trace_id in dict.fromkeys(tr.id for tr in self.filtered_stream):
+            f, t, sxx = self.compute_spectrogram(trace_id)
+            start = min(tr.stats.starttime for tr in self.filtered_stream if tr.id == trace_id)
+            panels.append((trace_id, f, t + (start - t0), sxx))
+        self._render_spectrogram(panels, minfreq, maxfreq, output_path)
+
+    def _render_spectrogram(self, panels, minfreq, maxfreq, output_path):
+        """
+        panels: (트레이스 id, f, t, sxx) 목록. t가 크게 건너뛰는 공백은 끊어 그림.
+        """
+        figsize = (10, 5) if len(panels) == 1 else (10, 3.5 * len(panels))
+        fig = Figure(figsize=figsize)
+        axes = fig.subplots(len(panels), 1, sharex=True, squeeze=False)[:, 0]
+        for ax, (trace_id, f, t, sxx) in zip(axes, panels):
+            sxx = np.sqrt(sxx + 1e-1000)
+            sxx = np.log10(sxx + 1e-1000)
+            # 열 간격보다 크게 벌어진 곳에서 나눠 공백을 가로질러 보간하지 않도록 함
+            steps = np.diff(t)
+            breaks = np.flatnonzero(steps > 1.5 * steps.min()) + 1 if len(steps) else []
+            for i0, i1 in zip(np.r_[0, breaks], np.r_[breaks, len(t)]):
+                mesh = ax.pcolormesh(t[i0:i1], f, sxx[:, i0:i1], vmin=sxx.min(), vmax=sxx.max(),
+                                     shading='gouraud' if i1 - i0 > 1 else 'nearest', cmap='jet')
+            ax.set_ylim([minfreq, maxfreq])
+            ax.set_yscale('log')
+            ax.set_yticks([0.1, 1, 10])
+            ax.set_ylabel(f"{trace_id.split('.')[-1]}\nFrequency (Hz)", fontweight='bold')
+            cbar = fig.colorbar(mesh, ax=ax, orientation='vertical' if len(panels) > 1 else 'horizontal')
+            cbar.set_label('Power ((m/s)/sqrt(Hz))', fontweight='bold')
+        axes[-1].set_xlabel('Time (s)', fontweight='bold')
+        axes[0].set_title('SEIS Spectrogram')
+        fig.savefig(output_path)
 
 
 class TWINSData:
-    def __init__(self, start_sol, sol_range, data_path):
+    def __init__(self, start_sol, sol_range, data_path, use_cache=True, columns=None, dtype=None,
+                 parse_local_time=False, lazy=False, max_workers=1):
+        """
+        Parameters:
+        - columns (list): 읽어 둘 측정 열 목록 (UTC는 항상 포함, None이면 전체 열)
+        - dtype (str or dict): 측정 열의 자료형 정책 (예: 'float32')
+        - parse_local_time (bool): LMST/LTST를 (sol, 시계 초) 숫자 열로 변환해 추가
+        - lazy (bool): True이면 data_frame을 만들지 않고 iter_frames()로 파일별로 읽음
+        - max_workers (int): CSV 파싱 스레드 수 (1이면 순차, None이면 CPU 수)
+        """
         self.start_sol = start_sol
         self.sol_range = sol_range
         self.data_path = data_path
+        self.use_cache = use_cache
+        self.columns = columns
+        self.dtype = dtype
+        self.parse_local_time = parse_local_time
+        self.max_workers = max_workers
+        self._aggregates = {}
         self.file_names = self._get_file_names()
-        self.data_frame = self._load_data()
+        self.data_frame = None if lazy else self._load_data()
 
     def _get_file_names(self):
+        sol_numbers = list(range(self.start_sol, self.start_sol + self.sol_range))
+        manifest = Manifest.for_directory(self.data_path)
         file_names = []
-        for sol_number in range(self.start_sol, self.start_sol + self.sol_range):
-            found = False
-            for filename in sorted(os.listdir(self.data_path)):
-                if ".csv" in filename and f"{sol_number}" in filename:
-                    file_names.append(os.path.join(
-                        self.data_path, filename))
-                    found = True
-                    break
-            if not found:
+        for sol_number, path in zip(sol_numbers, manifest.resolve('twins', sol_numbers)):
+            if path is None:
                 print(f"TWINS file for sol {sol_number} not found.")
+            else:
+                file_names.append(path)
         return file_names
 
+    def _load_file(self, file_name, columns=None, parse_local_time=None):
+        # UTC 변환까지 끝난 Feather 캐시가 있으면 그것을 사용
+        return read_csv_cached(file_name, self.use_cache,
+                               self.columns if columns is None else columns, self.dtype,
+                               self.parse_local_time if parse_local_time is None else parse_local_time)
+
     def _load_data(self):
         if not self.file_names:
             raise FileNotFoundError("No TWINS files found.")
-        data_frames = []
-        for file_name in self.file_names:
-            df = pd.read_csv(file_name)
-            df['UTC'] = pd.to_datetime(df['UTC'], format='%Y-%jT%H:%M:%S.%fZ')
-            data_frames.append(df)
+        data_frames = list(ordered_map(self._load_file, self.file_names, self.max_workers))
         combined_df = pd.concat(data_frames, ignore_index=True)
         return combined_df
 
+    def iter_frames(self, columns=None, parse_local_time=None):
+        """
+        sol 파일 하나씩 데이터프레임을 반환 (전체 범위를 한꺼번에 올리지 않음).
+        """
+        # 호출 측이 앞 파일을 처리하는 동안 다음 파일을 미리 읽음
+        yield from ordered_map(lambda file_name: self._load_file(file_name, columns, parse_local_time),
+                               self.file_names, self.max_workers)
+
+    def diurnal_aggregate(self, column, bin_minutes=60, quantiles=(0.25, 0.5, 0.75), value_range=None):
+        """
+        column을 LMST 시각 구간별로 집계 (sol 파일 단위로 누적, DiurnalAggregator 참고).
+
+        Returns:
+        - pandas.DataFrame: 구간별 count, mean, std, min, max, 분위수
+        """
+        key = (column, bin_minutes, tuple(quantiles), value_range)
+        if key not in self._aggregates:
+            aggregator = DiurnalAggregator(bin_minutes, quantiles, value_range)
+            for df in self.iter_frames(columns=[column], parse_local_time=True):
+                aggregator.update(df['LMST_SECONDS'], df[column])
+            # refresh()에서 새 파일만 더해 갱신
+            self._aggregates[key] = aggregator
+        return self._aggregates[key].result()
+
+    def extend(self, n_sols=1):
+        """
+        sol 범위를 n_sols만큼 늘리고 새로 필요한 파일만 읽음 (refresh 참고).
+        """
+        self.sol_range += n_sols
+        return self.refresh()
+
+    def refresh(self):
+        """
+        현재 sol 범위에서 아직 읽지 않은 파일만 읽어 data_frame에 덧붙이고,
+        diurnal_aggregate()로 만든 집계에도 새 파일만 더함.
+
+        Returns:
+        - list: 새로 읽은 파일 목록
+        """
+        file_names = self._get_file_names()
+        new_files = [f for f in file_names if f not in self.file_names]
+        if not new_files:
+            return []
+        self.file_names = file_names
+        if self.data_frame is not None:
+            frames = [self.data_frame] + list(ordered_map(self._load_file, new_files, self.max_workers))
+            combined_df = pd.concat(frames, ignore_index=True)
+            if not combined_df['UTC'].is_monotonic_increasing:
+                # 앞쪽 sol 파일이 뒤늦게 받아진 경우
+                combined_df = combined_df.sort_values('UTC', kind='stable', ignore_index=True)
+            self.data_frame = combined_df
+        for (column, _, _, _), aggregator in self._aggregates.items():
+            for file_name in new_files:
+                df = self._load_file(file_name, [column], parse_local_time=True)
+                aggregator.update(df['LMST_SECONDS'], df[column])
+        return new_files
+
     def plot_wind_speed(self,  output_path, plot_type='line'):
-        plt.figure(figsize=(15, 8))
+        figsize = (15, 8)
+        utc, values = self.data_frame['UTC'], self.data_frame['HORIZONTAL_WIND_SPEED']
+        fig = Figure(figsize=figsize)
+        ax = fig.subplots()
         if plot_type == 'line':
-            plt.plot(
-                self.data_frame['UTC'], self.data_frame['HORIZONTAL_WIND_SPEED'], label='Wind Speed')
+            # 선 그래프는 가로 픽셀마다 최솟값/최댓값만 그려도 같은 모양
+            utc, values = minmax_decimate(utc, values, pixel_width(figsize, matplotlib.rcParams['figure.dpi']))
+            ax.plot(utc, values, label='Wind Speed')
         elif plot_type == 'scatter':
-            plt.scatter(
-                self.data_frame['UTC'], self.data_frame['HORIZONTAL_WIND_SPEED'], s=10, label='Wind Speed')
+            # 산점도는 점의 분포 자체를 보여야 하므로 줄이지 않음
+            ax.scatter(utc, values, s=10, label='Wind Speed')
         else:
             raise ValueError("plot_type must be 'line' or 'scatter'")
-        plt.title(
+        ax.set_title(
             f'InSight APSS TWINS - Wind Speed ({plot_type.capitalize()} Plot)')
-        plt.xlabel('UTC Time')
-        plt.ylabel('Wind Speed (m/s)')
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(output_path)
-        plt.close()
+        ax.set_xlabel('UTC Time')
+        ax.set_ylabel('Wind Speed (m/s)')
+        ax.legend()
+        ax.grid(True)
+        fig.tight_layout()
+        fig.savefig(output_path)
 
 
 class PSData:
-    def __init__(self, start_sol, sol_range, data_path):
+    def __init__(self, start_sol, sol_range, data_path, use_cache=True, columns=None, dtype=None,
+                 parse_local_time=False, lazy=False, max_workers=1):
+        """
+        Parameters:
+        - columns (list): 읽어 둘 측정 열 목록 (UTC는 항상 포함, None이면 전체 열)
+        - dtype (str or dict): 측정 열의 자료형 정책 (예: 'float32')
+        - parse_local_time (bool): LMST/LTST를 (sol, 시계 초) 숫자 열로 변환해 추가
+        - lazy (bool): True이면 data_frame을 만들지 않고 iter_frames()로 파일별로 읽음
+        - max_workers (int): CSV 파싱 스레드 수 (1이면 순차, None이면 CPU 수)
+        """
         self.start_sol = start_sol
         self.sol_range = sol_range
         self.data_path = data_path
+        self.use_cache = use_cache
+        self.columns = columns
+        self.dtype = dtype
+        self.parse_local_time = parse_local_time
+        self.max_workers = max_workers
+        self._aggregates = {}
         self.file_names = self._get_file_names()
-        self.data_frame = self._load_data()
+        self.data_frame = None if lazy else self._load_data()
 
     def _get_file_names(self):
+        sol_numbers = list(range(self.start_sol, self.start_sol + self.sol_range))
+        manifest = Manifest.for_directory(self.data_path)
         file_names = []
-        for sol_number in range(self.start_sol, self.start_sol + self.sol_range):
-            found = False
-            for filename in sorted(os.listdir(self.data_path)):
-                if ".csv" in filename and f"{sol_number}" in filename:
-                    file_names.append(os.path.join(self.data_path, filename))
-                    found = True
-                    break
-            if not found:
+        for sol_number, path in zip(sol_numbers, manifest.resolve('ps', sol_numbers)):
+            if path is None:
                 print(f"PS file for sol {sol_number} not found.")
+            else:
+                file_names.append(path)
         return file_names
 
+    def _load_file(self, file_name, columns=None, parse_local_time=None):
+        # UTC 변환까지 끝난 Feather 캐시가 있으면 그것을 사용
+        return read_csv_cached(file_name, self.use_cache,
+                               self.columns if columns is None else columns, self.dtype,
+                               self.parse_local_time if parse_local_time is None else parse_local_time)
+
     def _load_data(self):
         if not self.file_names:
             raise FileNotFoundError("No PS files found.")
-        data_frames = []
-        for file_name in self.file_names:
-            df = pd.read_csv(file_name)
-            # UTC 열을 datetime 형식으로 변환
-            df['UTC'] = pd.to_datetime(df['UTC'], format='%Y-%jT%H:%M:%S.%fZ')
-            data_frames.append(df)
+        data_frames = list(ordered_map(self._load_file, self.file_names, self.max_workers))
         combined_df = pd.concat(data_frames, ignore_index=True)
         return combined_df
 
+    def iter_frames(self, columns=None, parse_local_time=None):
+        """
+        sol 파일 하나씩 데이터프레임을 반환 (전체 범위를 한꺼번에 올리지 않음).
+        """
+        # 호출 측이 앞 파일을 처리하는 동안 다음 파일을 미리 읽음
+        yield from ordered_map(lambda file_name: self._load_file(file_name, columns, parse_local_time),
+                               self.file_names, self.max_workers)
+
+    def diurnal_aggregate(self, column, bin_minutes=60, quantiles=(0.25, 0.5, 0.75), value_range=None):
+        """
+        column을 LMST 시각 구간별로 집계 (sol 파일 단위로 누적, DiurnalAggregator 참고).
+
+        Returns:
+        - pandas.DataFrame: 구간별 count, mean, std, min, max, 분위수
+        """
+        key = (column, bin_minutes, tuple(quantiles), value_range)
+        if key not in self._aggregates:
+            aggregator = DiurnalAggregator(bin_minutes, quantiles, value_range)
+            for df in self.iter_frames(columns=[column], parse_local_time=True):
+                aggregator.update(df['LMST_SECONDS'], df[column])
+            # refresh()에서 새 파일만 더해 갱신
+            self._aggregates[key] = aggregator
+        return self._aggregates[key].result()
+
+    def extend(self, n_sols=1):
+        """
+        sol 범위를 n_sols만큼 늘리고 새로 필요한 파일만 읽음 (refresh 참고).
+        """
+        self.sol_range += n_sols
+        return self.refresh()
+
+    def refresh(self):
+        """
+        현재 sol 범위에서 아직 읽지 않은 파일만 읽어 data_frame에 덧붙이고,
+        diurnal_aggregate()로 만든 집계에도 새 파일만 더함.
+
+        Returns:
+        - list: 새로 읽은 파일 목록
+        """
+        file_names = self._get_file_names()
+        new_files = [f for f in file_names if f not in self.file_names]
+        if not new_files:
+            return []
+        self.file_names = file_names
+        if self.data_frame is not None:
+            frames = [self.data_frame] + list(ordered_map(self._load_file, new_files, self.max_workers))
+            combined_df = pd.concat(frames, ignore_index=True)
+            if not combined_df['UTC'].is_monotonic_increasing:
+                # 앞쪽 sol 파일이 뒤늦게 받아진 경우
+                combined_df = combined_df.sort_values('UTC', kind='stable', ignore_index=True)
+            self.data_frame = combined_df
+        for (column, _, _, _), aggregator in self._aggregates.items():
+            for file_name in new_files:
+                df = self._load_file(file_name, [column], parse_local_time=True)
+                aggregator.update(df['LMST_SECONDS'], df[column])
+        return new_files
+
+    def detect_vortices(self, threshold=0.3, baseline_seconds=1000, min_duration=1.0,
+                        max_workers=None, twins=None):
+        """
+        sol 파일별로 병렬 처리해 기압 강하(dust devil 후보) 카탈로그를 만듦.
+
+        Parameters:
+        - threshold (float): 배경 대비 최소 강하 깊이 (Pa)
+        - baseline_seconds (float): 배경 기압 이동 중앙값 창 길이 (초)
+        - min_duration (float): 최소 반치폭 (초)
+        - twins (TWINSData): 주어지면 이벤트마다 가장 가까운 HORIZONTAL_WIND_SPEED를 추가
+
+        Returns:
+        - pandas.DataFrame: time, drop, duration, file (, HORIZONTAL_WIND_SPEED)
+        """
+        catalog = detect_catalog(self.file_names, threshold, baseline_seconds, min_duration,
+                                 self.use_cache, max_workers)
+        if twins is not None:
+            if twins.data_frame is not None:
+                frames = [twins.data_frame]
+            else:
+                frames = twins.iter_frames(columns=['HORIZONTAL_WIND_SPEED'])
+            catalog = match_wind(catalog, frames)
+        return catalog
+
     def plot_pressure(self, output_path, plot_type='line'):
-        plt.figure(figsize=(15, 8))
+        figsize = (15, 8)
+        utc, values = self.data_frame['UTC'], self.data_frame['PRESSURE']
+        fig = Figure(figsize=figsize)
+        ax = fig.subplots()
         if plot_type == 'line':
-            plt.plot(
-                self.data_frame['UTC'], self.data_frame['PRESSURE'], label='Pressure')
+            # 선 그래프는 가로 픽셀마다 최솟값/최댓값만 그려도 같은 모양
+            utc, values = minmax_decimate(utc, values, pixel_width(figsize, matplotlib.rcParams['figure.dpi']))
+            ax.plot(utc, values, label='Pressure')
         elif plot_type == 'scatter':
-            plt.scatter(
-                self.data_frame['UTC'], self.data_frame['PRESSURE'], s=10, label='Pressure')
+            # 산점도는 점의 분포 자체를 보여야 하므로 줄이지 않음
+            ax.scatter(utc, values, s=10, label='Pressure')
         else:
             raise ValueError("plot_type must be 'line' or 'scatter'")
-        plt.title(
+        ax.set_title(
             f'InSight APSS PS - Pressure ({plot_type.capitalize()} Plot)')
-        plt.xlabel('UTC Time')
-        plt.ylabel('Pressure (Pa)')
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(output_path)
-        plt.close()
+        ax.set_xlabel('UTC Time')
+        ax.set_ylabel('Pressure (Pa)')
+        ax.legend()
+        ax.grid(True)
+        fig.tight_layout()
+        fig.savefig(output_path)
@@ -0,0 +1,97 @@
+import numpy as np
+
+
+def pixel_width(figsize, dpi):
+    """
+    그림의 가로 픽셀 수.
+    """
+    return int(round(figsize[0] * dpi))
+
+
+def _as_float_array(y):
+    if np.ma.isMaskedArray(y):
+        return np.ma.filled(y.astype(np.float64), np.nan)
+    return np.asarray(y)
+
+
+def _bucket_starts(n, n_buckets, x=None):
+    """
+    구간별 첫 인덱스. x가 없으면 같은 샘플 수로, 있으면 x 범위를 같은 폭으로 나눔
+    (표본이 없는 구간은 빠짐).
+    """
+    if x is None:
+        return np.arange(0, n, -(-n // n_buckets))
+    x = np.asarray(x)
+    if x.dtype.kind in 'mM':
+        x = x.astype(np.int64)
+    edges = np.linspace(x[0], x[-1], n_buckets + 1)
+    return np.unique(np.searchsorted(x, edges[:-1], side='left'))
+
+
+def _first_in_bucket(mask, starts):
+    """
+    구간마다 mask가 참인 첫 인덱스 (참이 없는 구간은 -1).
+    """
+    hits = np.flatnonzero(mask)
+    if len(hits) == 0:
+        return np.full(len(starts), -1)
+    pos = np.minimum(np.searchsorted(hits, starts), len(hits) - 1)
+    first = hits[pos]
+    ends = np.r_[starts[1:], len(mask)]
+    return np.where((first >= starts) & (first < ends), first, -1)
+
+
+def minmax_indices(y, n_buckets, x=None):
+    """
+    y를 n_buckets개의 구간으로 나눴을 때 구간별 최솟값/최댓값 위치.
+
+    x(정렬된 숫자 또는 datetime64 배열)가 주어지면 x 범위를 같은 폭의 구간으로 나누므로,
+    공백이나 샘플링 간격 변화가 있어도 구간이 화면의 같은 가로 폭에 대응합니다.
+    NaN이 하나라도 있는 구간은 최솟값/최댓값 위치에 첫 NaN 위치를 더해 시간 순서로
+    남깁니다 (구간당 최대 3개, 전부 NaN이거나 표본이 하나면 1개).
+
+    Returns:
+    - ndarray: 시간 순서로 정렬된 인덱스 (y가 충분히 작으면 전체 인덱스)
+    """
+    y = _as_float_array(y)
+    n = len(y)
+    if n_buckets <= 0 or n <= 2 * n_buckets:
+        return np.arange(n)
+
+    starts = _bucket_starts(n, n_buckets, x)
+    counts = np.diff(np.r_[starts, n])
+    nan = np.isnan(y) if np.issubdtype(y.dtype, np.floating) else None
+    lo_key = y if nan is None else np.where(nan, np.inf, y)
+    hi_key = y if nan is None else np.where(nan, -np.inf, y)
+    # 구간 최솟값/최댓값과 같은 첫 위치 (동점이면 먼저 나온 쪽)
+    lo = _first_in_bucket(lo_key == np.repeat(np.minimum.reduceat(lo_key, starts), counts), starts)
+    hi = _first_in_bucket(hi_key == np.repeat(np.maximum.reduceat(hi_key, starts), counts), starts)
+    columns = [lo, hi]
+    if nan is not None and nan.any():
+        # NaN이 섞인 구간은 첫 NaN 위치도 남겨 선이 공백을 가로지르지 않도록 함
+        columns.append(_first_in_bucket(nan, starts))
+    # 구간 안에서 먼저 나온 쪽이 앞에 오도록 정렬해 선의 순서를 유지
+    rows = np.sort(np.column_stack(columns), axis=1)
+    keep = rows >= 0
+    # 같은 위치는 한 번만 (전부 NaN이거나 표본이 하나인 구간은 한 점)
+    keep[:, 1:] &= rows[:, 1:] != rows[:, :-1]
+    return rows[keep]
+
+
+def minmax_decimate(x, y, n_buckets):
+    """
+    화면 픽셀 수에 맞춰 (x, y)를 구간별 최솟값/최댓값으로 줄임.
+
+    x 범위를 n_buckets개의 같은 폭 구간으로 나눠 각 구간의 최솟값과 최댓값 위치만
+    남기므로 선 그래프의 외곽선(envelope)은 원본과 같고, 점 수는 최대 2 * n_buckets로
+    표본 수와 무관합니다 (NaN이 섞인 구간은 3개). 마스크된 값과 NaN이 하나라도
+    있는 구간에는 NaN 점이 남아 그래프의 공백으로 그려집니다. 점 하나하나가 보이는
+    산점도에는 쓰지 않습니다.
+
+    Returns:
+    - tuple: (x, y) 줄인 배열
+    """
+    y = _as_float_array(y)
+    x = np.asarray(x)
+    index = minmax_indices(y, n_buckets, x)
+    return x[index], y[index]
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+
+class DiurnalAggregator:
+    """
+    LMST 시각 구간별 통계를 sol 파일 단위로 누적 계산.
+
+    update()에 파일 하나 분량의 (LMST 시계 초, 값)을 넣을 때마다 구간별 개수,
+    합, 제곱합, 최솟값/최댓값과 값 히스토그램만 갱신하므로, 전체 sol 범위의
+    데이터를 메모리에 동시에 올리지 않습니다. 분위수는 값 히스토그램
+    (n_value_bins 구간)에서 선형 보간한 근사값입니다.
+
+    value_range를 주지 않으면 첫 update의 최솟값~최댓값을 양쪽으로 범위 폭의
+    절반씩 넓혀 사용합니다. 이후 범위를 벗어난 값이 들어오면 (계절 변화 등) 범위
+    폭을 두 배로 늘리고 인접한 두 구간을 합쳐 히스토그램을 다시 만들므로, 값을
+    양 끝 구간으로 잘라 넣지 않습니다. 구간 경계가 그대로 유지되므로 재구성은
+    정확하며 해상도만 절반이 됩니다.
+    """
+
+    def __init__(self, bin_minutes=60, quantiles=(0.25, 0.5, 0.75), value_range=None,
+                 n_value_bins=2000):
+        self.bin_minutes = bin_minutes
+        self.quantiles = tuple(quantiles)
+        self.value_range = None if value_range is None else tuple(float(v) for v in value_range)
+        # 범위를 늘릴 때 두 구간씩 합치므로 짝수로 맞춤
+        self.n_value_bins = n_value_bins + n_value_bins % 2
+        self.n_bins = int(np.ceil(24 * 60 / bin_minutes))
+        self.count = np.zeros(self.n_bins, dtype=np.int64)
+        self.total = np.zeros(self.n_bins)
+        self.total_sq = np.zeros(self.n_bins)
+        self.minimum = np.full(self.n_bins, np.inf)
+        self.maximum = np.full(self.n_bins, -np.inf)
+        self.histogram = np.zeros((self.n_bins, self.n_value_bins), dtype=np.int64)
+
+    def update(self, lmst_seconds, values):
+        lmst_seconds = np.asarray(lmst_seconds, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        valid = np.isfinite(values) & np.isfinite(lmst_seconds)
+        lmst_seconds = lmst_seconds[valid]
+        values = values[valid]
+        if len(values) == 0:
+            return
+
+        if self.value_range is None:
+            low, high = values.min(), values.max()
+            pad = max((high - low) / 2, 1e-6)
+            self.value_range = (low - pad, high + pad)
+        self._grow(values.min(), values.max())
+
+        bins = np.clip((lmst_seconds // (self.bin_minutes * 60)).astype(np.int64), 0, self.n_bins - 1)
+        self.count += np.bincount(bins, minlength=self.n_bins)
+        self.total += np.bincount(bins, weights=values, minlength=self.n_bins)
+        self.total_sq += np.bincount(bins, weights=values * values, minlength=self.n_bins)
+        np.minimum.at(self.minimum, bins, values)
+        np.maximum.at(self.maximum, bins, values)
+
+        low, high = self.value_range
+        value_bins = ((values - low) / (high - low) * self.n_value_bins).astype(np.int64)
+        # _grow 이후 모든 값이 [low, high) 안이므로 반올림 오차만 보정
+        value_bins = np.clip(value_bins, 0, self.n_value_bins - 1)
+        flat = np.bincount(bins * self.n_value_bins + value_bins,
+                           minlength=self.n_bins * self.n_value_bins)
+        self.histogram += flat.reshape(self.n_bins, self.n_value_bins)
+
+    def _grow(self, low, high):
+        """
+        값 범위가 [low, high]를 포함할 때까지 범위 폭을 두 배씩 늘림.
+
+        기존 범위가 새 범위의 아래쪽 (또는 위쪽) 절반이 되도록 늘리므로, 기존
+        구간 두 개가 새 구간 하나에 정확히 대응합니다.
+        """
+        range_low, range_high = self.value_range
+        half = self.n_value_bins // 2
+        while low < range_low or high >= range_high:
+            width = range_high - range_low
+            merged = self.histogram.reshape(self.n_bins, half, 2).sum(axis=2)
+            self.histogram = np.zeros_like(self.histogram)
+            if high >= range_high:
+                self.histogram[:, :half] = merged
+                range_high += width
+            else:
+                self.histogram[:, half:] = merged
+                range_low -= width
+        self.value_range = (range_low, range_high)
+
+    def _quantile(self, q):
+        low, high = self.value_range if self.value_range is not None else (0.0, 1.0)
+        edges = np.linspace(low, high, self.n_value_bins + 1)
+        cumulative = np.cumsum(self.histogram, axis=1)
+        target = q * self.count
+        result = np.full(self.n_bins, np.nan)
+        for i in np.flatnonzero(self.count):
+            k = np.searchsorted(cumulative[i], target[i])
+            k = min(k, self.n_value_bins - 1)
+            before = cumulative[i, k - 1] if k > 0 else 0
+            inside = self.histogram[i, k]
+            fraction = (target[i] - before) / inside if inside else 0.0
+            result[i] = edges[k] + fraction * (edges[k + 1] - edges[k])
+        return result
+
+    def result(self):
+        """
+        Returns:
+        - pandas.DataFrame: LMST 구간 시작 시각(시간 단위)을 인덱스로 하는 구간별 통계
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.total / self.count
+            std = np.sqrt(np.maximum(self.total_sq / self.count - mean * mean, 0))
+        empty = self.count == 0
+        frame = pd.DataFrame({
+            'count': self.count,
+            'mean': mean,
+            'std': std,
+            'min': np.where(empty, np.nan, self.minimum),
+            'max': np.where(empty, np.nan, self.maximum),
+        }, index=pd.Index(np.arange(self.n_bins) * self.bin_minutes / 60, name='LMST_HOUR'))
+        for q in self.quantiles:
+            frame[f'q{q * 100:g}'] = self._quantile(q)
+        return frame
@@ -0,0 +1,110 @@
+import numpy as np
+import obspy
+
+
+def merge_layout(spans):
+    """
+    트레이스 id별 병합 결과의 (시작 시각, 샘플링 레이트, 샘플 수)를 헤더 정보만으로 계산.
+
+    Parameters:
+    - spans (iterable): (트레이스 id, 시작 시각, 종료 시각, 샘플링 레이트)
+    """
+    bounds = {}
+    for trace_id, start, end, rate in spans:
+        if trace_id in bounds:
+            first, last, known_rate = bounds[trace_id]
+            if known_rate != rate:
+                raise ValueError(f"Can't merge traces with different sampling rates: {trace_id}")
+            bounds[trace_id] = (min(first, start), max(last, end), rate)
+        else:
+            bounds[trace_id] = (start, end, rate)
+    return {trace_id: (start, rate, int(round((end - start) * rate)) + 1)
+            for trace_id, (start, end, rate) in bounds.items()}
+
+
+def merge_streams(layout, streams):
+    """
+    파일별 Stream을 미리 할당한 배열에 제자리로 채워 병합.
+
+    obspy의 Stream.merge(method=1)처럼 겹치는 구간은 나중 트레이스 값을 쓰지만,
+    트레이스 목록을 다시 만들거나 병합 배열을 따로 할당하지 않으므로 최대
+    메모리는 결과 배열 + 파일 하나 분량입니다. obspy와 달리 masked array를 만들지
+    않고, 공백 샘플은 0으로 둔 채 공백 위치를 별도의 마스크로 반환합니다.
+
+    Parameters:
+    - layout (dict): merge_layout의 결과
+    - streams (iterable): 시간 순으로 읽은 Stream (파일 하나씩 읽는 generator 가능)
+
+    Returns:
+    - tuple: (obspy.Stream, 트레이스 id별 공백 마스크 dict (True가 공백))
+    """
+    buffers = {}
+    headers = {}
+    for stream in streams:
+        for tr in stream:
+            start, rate, npts = layout[tr.id]
+            if tr.id not in buffers:
+                buffers[tr.id] = (np.zeros(npts, dtype=tr.data.dtype), np.ones(npts, dtype=bool))
+                headers[tr.id] = tr.stats.copy()
+            data, gap = buffers[tr.id]
+            offset = int(round((tr.stats.starttime - start) * rate))
+            i0 = max(offset, 0)
+            i1 = min(offset + tr.stats.npts, npts)
+            if i1 <= i0:
+                continue
+            data[i0:i1] = tr.data[i0 - offset:i1 - offset]
+            gap[i0:i1] = False
+
+    traces = []
+    gap_masks = {}
+    for trace_id, (data, gap) in buffers.items():
+        header = headers[trace_id]
+        header.starttime, header.sampling_rate = layout[trace_id][:2]
+        header.npts = len(data)
+        # 공백 샘플은 0으로 남고, 공백 위치는 gap_masks로만 표시 (masked array 없음)
+        traces.append(obspy.Trace(data, header=header))
+        gap_masks[trace_id] = gap
+    return obspy.Stream(traces), gap_masks
+
+
+def slice_trace(tr, gap, t0=None, t1=None):
+    """
+    Trace.slice()처럼 [t0, t1] 구간을 자르고 공백 마스크도 같은 구간의 뷰로 자름.
+
+    Returns:
+    - tuple: (obspy.Trace, 공백 마스크 또는 None)
+    """
+    sliced = tr.slice(t0, t1)
+    if gap is None:
+        return sliced, None
+    offset = int(round((sliced.stats.starttime - tr.stats.starttime) * tr.stats.sampling_rate))
+    return sliced, gap[offset:offset + sliced.stats.npts]
+
+
+def gap_segments(gap):
+    """
+    공백 마스크에서 연속 구간의 [시작, 끝) 샘플 번호 배열 (구간 수, 2)을 구함.
+    """
+    valid = np.zeros(len(gap) + 2, dtype=np.int8)
+    valid[1:-1] = ~np.asarray(gap, dtype=bool)
+    return np.flatnonzero(np.diff(valid)).reshape(-1, 2)
+
+
+def segment_views(tr, gap=None):
+    """
+    트레이스를 공백 없는 구간별 Trace로 나눔 (Stream.split()과 달리 데이터는 뷰).
+
+    Parameters:
+    - tr (obspy.Trace): 나눌 트레이스
+    - gap (ndarray): merge_streams가 만든 공백 마스크 (None이면 공백 없음)
+    """
+    if gap is None or not gap.any():
+        header = tr.stats.copy()
+        return [obspy.Trace(tr.data, header=header)] if len(tr.data) else []
+    views = []
+    for i0, i1 in gap_segments(gap):
+        header = tr.stats.copy()
+        header.starttime = tr.stats.starttime + i0 * tr.stats.delta
+        header.npts = i1 - i0
+        views.append(obspy.Trace(tr.data[i0:i1], header=header))
+    return views
@@ -0,0 +1,47 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor,
+}
+
+
+def ordered_map(func, items, max_workers=1, kind='thread', prefetch=None):
+    """
+    items의 각 항목에 func를 병렬로 적용하고 결과를 입력 순서대로 반환하는 generator.
+
+    최대 prefetch개(기본값: 작업자 수의 2배) 작업만 미리 제출하므로, 호출 측이
+    앞선 결과를 처리하는 동안 다음 파일을 읽고 파싱하되 결과가 한꺼번에
+    메모리에 쌓이지 않습니다. max_workers가 1이면 풀 없이 현재 스레드에서
+    차례로 실행합니다.
+
+    Parameters:
+    - kind (str): 'thread' (GIL을 놓는 CSV/pyarrow 파싱) 또는 'process' (obspy 디코딩)
+    """
+    items = list(items)
+    if max_workers == 1 or len(items) <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    max_workers = max_workers or os.cpu_count() or 1
+    executor = EXECUTORS[kind](max_workers=max_workers)
+    prefetch = prefetch or 2 * max_workers
+    pending = deque()
+    try:
+        remaining = iter(items)
+        for item in remaining:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= prefetch:
+                break
+        while pending:
+            result = pending.popleft().result()
+            for item in remaining:
+                pending.append(executor.submit(func, item))
+                break
+            yield result
+    finally:
+        # 호출 측이 중간에 멈추면 아직 시작하지 않은 작업은 취소
+        executor.shutdown(wait=True, cancel_futures=True)
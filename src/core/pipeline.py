@@ -0,0 +1,447 @@
+import os
+import json
+import time
+import logging
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import yaml
+from conversions import sol_to_year_doy
+from manifest import Manifest
+from downloader import SEISDownloader, TWINSDownloader, PSDownloader
+from listing_cache import ListingCache
+from core.batch_render import _init_worker
+from core.data_model import SEISData, TWINSData, PSData
+from core.coherence import analyze_sols
+from core.csv_cache import cache_path, read_csv_cached
+from core.sample_store import sample_paths, ensure_decoded
+from core.result_cache import ResultCache
+from core.parallel_load import ordered_map
+
+STAMP_DIR_NAME = '.pipeline'
+WIND_COLUMN = 'HORIZONTAL_WIND_SPEED'
+PRESSURE_COLUMN = 'PRESSURE'
+
+# 설정 파일 위치 기준 상대 경로
+DEFAULT_DATA_PATHS = {
+    'seis': 'data/downloads/seis',
+    'twins': 'data/downloads/twins',
+    'ps': 'data/downloads/ps',
+    'results': 'data/results',
+    'cache': 'data/cache/results',
+    'listings': 'data/cache/listings',
+}
+DEFAULT_JOB = {
+    'sol_range': 1,
+    'channel': 'BHU',
+    'minfreq': 0.1,
+    'maxfreq': 10,
+    'backend': 'obspy',
+    'download': True,
+    'instruments': ['seis', 'twins', 'ps'],
+    'analyses': ['events', 'diurnal', 'coherence'],
+    'chunk_sols': None,
+}
+
+
+def _job_name(job):
+    channel = job['channel'].replace(',', '_').lower()
+    end_sol = job['start_sol'] + job['sol_range'] - 1
+    return f"sol_{job['start_sol']:04d}_{end_sol:04d}_{channel}_{job['minfreq']:g}-{job['maxfreq']:g}hz"
+
+
+def load_config(path):
+    """
+    YAML 작업 명세를 읽어 작업(dict) 목록을 만듦.
+
+    최상위 키는 모든 작업의 기본값이고, jobs 목록의 각 항목이 이를 덮어씁니다
+    (jobs가 없으면 최상위 설정 자체가 작업 하나). 작업 키:
+    - start_sol, sol_range, channel ('BHU,BHV'처럼 여러 채널 가능)
+    - minfreq, maxfreq 또는 band: [minfreq, maxfreq]
+    - name: 결과 폴더 이름 (results/<name>, 기본값은 sol 범위·채널·대역에서 만듦)
+    - chunk_sols: 주어지면 sol 범위를 이 크기의 작업들로 나눠 병렬 처리
+    - download, backend, instruments, analyses, data_paths
+
+    data_paths의 상대 경로는 설정 파일이 있는 디렉토리 기준입니다.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    base_dir = os.path.dirname(os.path.abspath(path))
+    specs = config.pop('jobs', None) or [{}]
+    defaults = {**DEFAULT_JOB, **config}
+
+    jobs = []
+    for spec in specs:
+        job = {**defaults, **spec}
+        data_paths = {**DEFAULT_DATA_PATHS, **(defaults.get('data_paths') or {}),
+                      **(spec.get('data_paths') or {})}
+        job['data_paths'] = {key: os.path.normpath(os.path.join(base_dir, value))
+                             for key, value in data_paths.items()}
+        if 'band' in job:
+            job['minfreq'], job['maxfreq'] = job.pop('band')
+        if job.get('start_sol') is None:
+            raise ValueError(f"Job has no start_sol: {spec}")
+
+        chunk_sols = job.pop('chunk_sols')
+        if chunk_sols:
+            name = spec.get('name')
+            end_sol = job['start_sol'] + job['sol_range']
+            for start_sol in range(job['start_sol'], end_sol, chunk_sols):
+                chunk = {**job, 'start_sol': start_sol,
+                         'sol_range': min(chunk_sols, end_sol - start_sol)}
+                chunk['name'] = f"{name}_sol_{start_sol:04d}" if name else _job_name(chunk)
+                jobs.append(chunk)
+        else:
+            job.setdefault('name', _job_name(job))
+            jobs.append(job)
+
+    names = [job['name'] for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate job names: {', '.join(duplicates)}")
+    for job in jobs:
+        job['output_dir'] = os.path.join(job['data_paths']['results'], job['name'])
+    return jobs
+
+
+def _periods(job, instrument):
+    sols = list(range(job['start_sol'], job['start_sol'] + job['sol_range']))
+    if instrument == 'seis':
+        years, doys = sol_to_year_doy(sols)
+        return [f"{year}.{doy:03d}" for year, doy in zip(years, doys)]
+    return sols
+
+
+def resolve_inputs(job):
+    """
+    작업의 입력 파일을 manifest에서 찾음.
+
+    Returns:
+    - dict: 장비별 [(period, 채널, 경로 또는 None), ...]
+    """
+    inputs = {}
+    for instrument in job['instruments']:
+        directory = job['data_paths'][instrument]
+        channels = job['channel'].split(',') if instrument == 'seis' else [None]
+        periods = _periods(job, instrument)
+        inputs[instrument] = []
+        for channel in channels:
+            if os.path.isdir(directory):
+                paths = Manifest.for_directory(directory).resolve(instrument, periods, channel)
+            else:
+                paths = [None] * len(periods)
+            inputs[instrument] += [(period, channel, path) for period, path in zip(periods, paths)]
+    return inputs
+
+
+def _input_files(inputs):
+    return [path for entries in inputs.values() for _, _, path in entries if path is not None]
+
+
+def _file_stats(paths):
+    stats = []
+    for path in paths:
+        stat = os.stat(path)
+        stats.append([os.path.basename(path), stat.st_size, stat.st_mtime_ns])
+    return stats
+
+
+def _stamp_path(job, stage):
+    return os.path.join(job['output_dir'], STAMP_DIR_NAME, f'{stage}.json')
+
+
+def is_up_to_date(job, stage, fingerprint):
+    """
+    단계의 기록(stamp)이 같은 fingerprint로 끝났고 출력 파일이 모두 남아 있는지 확인.
+    """
+    try:
+        with open(_stamp_path(job, stage), 'r', encoding='utf-8') as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return stamp.get('fingerprint') == fingerprint and all(os.path.exists(p) for p in stamp['outputs'])
+
+
+def write_stamp(job, stage, fingerprint, outputs, seconds):
+    path = _stamp_path(job, stage)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'fingerprint': fingerprint, 'outputs': outputs, 'seconds': round(seconds, 3),
+                   'finished': datetime.now().isoformat(timespec='seconds')}, f, indent=1)
+    os.replace(path + '.tmp', path)
+
+
+def _runs(values):
+    """
+    정렬된 정수 목록을 연속 구간 [(시작, 끝), ...]으로 묶음.
+    """
+    runs = []
+    for value in sorted(set(values)):
+        if runs and value == runs[-1][1] + 1:
+            runs[-1][1] = value
+        else:
+            runs.append([value, value])
+    return [tuple(run) for run in runs]
+
+
+def download_missing(jobs, max_workers=1, max_per_host=4):
+    """
+    download 단계: 모든 작업에서 빠진 파일을 모아 장비·디렉토리별로 한 번씩만 내려받음.
+
+    네트워크 작업이므로 메인 프로세스에서 실행하며, SEIS는 다운로더의 스레드 풀로
+    동시에 받습니다. 이미 manifest에 있는 파일은 요청하지 않습니다.
+    """
+    missing = {}
+    for job in jobs:
+        for instrument, entries in resolve_inputs(job).items():
+            periods = {period for period, _, path in entries if path is None}
+            if not periods:
+                continue
+            if not job['download']:
+                logging.warning(f"[!] {job['name']}: {instrument} 파일 {len(periods)}개 없음 (download 꺼짐)")
+                continue
+            key = (instrument, job['data_paths'][instrument], job['data_paths']['listings'])
+            missing.setdefault(key, set()).update(periods)
+
+    if not missing:
+        logging.info('[*] download: 모든 입력 파일이 있어 건너뜀')
+        return
+
+    listing_caches = {}
+    for (instrument, directory, listings), periods in sorted(missing.items()):
+        os.makedirs(directory, exist_ok=True)
+        if listings not in listing_caches:
+            listing_caches[listings] = ListingCache(listings)
+        listing_cache = listing_caches[listings]
+        if instrument == 'seis':
+            downloader = SEISDownloader(max_workers=max_workers, max_per_host=max_per_host,
+                                        listing_cache=listing_cache)
+            ordinals = [datetime.strptime(period, '%Y.%j').toordinal() for period in periods]
+            for first, last in _runs(ordinals):
+                logging.info(f'[*] download: SEIS {datetime.fromordinal(first).date()}'
+                             f' ~ {datetime.fromordinal(last).date()}')
+                downloader.crawl_and_download(datetime.fromordinal(first), datetime.fromordinal(last),
+                                              directory)
+        else:
+            downloader_class = TWINSDownloader if instrument == 'twins' else PSDownloader
+            downloader = downloader_class(listing_cache=listing_cache)
+            for first, last in _runs(periods):
+                logging.info(f'[*] download: {instrument.upper()} sol {first} ~ {last}')
+                downloader.download_range(first, last, directory)
+
+
+def _load_outputs(job, inputs):
+    """
+    load 단계의 출력: SEIS memmap 샘플 파일과 TWINS/PS Feather 캐시 경로.
+    """
+    outputs = []
+    for instrument, entries in inputs.items():
+        for _, _, path in entries:
+            if path is None:
+                continue
+            if instrument != 'seis':
+                outputs.append(cache_path(path))
+            elif job['backend'] == 'memmap':
+                outputs.extend(sample_paths(path))
+    return outputs
+
+
+def _warm(file_name):
+    # 프로세스 풀 작업자: 디코딩/파싱 결과를 디스크 캐시에 만들어 둠
+    if file_name.endswith('.mseed'):
+        ensure_decoded(file_name)
+    else:
+        read_csv_cached(file_name, columns=['UTC'])
+    return file_name
+
+
+class _JobData:
+    """
+    한 작업의 데이터 객체를 필요할 때 한 번만 만들어 단계들이 공유.
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.cache = ResultCache(job['data_paths']['cache'])
+        self._seis = None
+        self._twins = None
+        self._ps = None
+
+    @property
+    def seis(self):
+        if self._seis is None:
+            job = self.job
+            self._seis = SEISData(job['start_sol'], job['sol_range'], job['channel'],
+                                  job['data_paths']['seis'], cache=self.cache, backend=job['backend'])
+            self._seis.filter_data(job['minfreq'], job['maxfreq'])
+        return self._seis
+
+    @property
+    def twins(self):
+        if self._twins is None:
+            job = self.job
+            self._twins = TWINSData(job['start_sol'], job['sol_range'], job['data_paths']['twins'],
+                                    columns=[WIND_COLUMN], dtype='float32')
+        return self._twins
+
+    @property
+    def ps(self):
+        if self._ps is None:
+            job = self.job
+            self._ps = PSData(job['start_sol'], job['sol_range'], job['data_paths']['ps'],
+                              columns=[PRESSURE_COLUMN], dtype='float32')
+        return self._ps
+
+
+def _run_filter(job, data):
+    outputs = []
+    if 'seis' in job['instruments']:
+        seis = data.seis
+        outputs = [data.cache.entry_path(seis.filter_cache_key())]
+        for trace_id in dict.fromkeys(tr.id for tr in seis.filtered_stream):
+            seis.compute_spectrogram(trace_id)
+            outputs.append(data.cache.entry_path(seis.spectrogram_cache_key(trace_id)))
+    return outputs
+
+
+def _run_analyse(job, data):
+    output_dir = job['output_dir']
+    instruments = job['instruments']
+    outputs = []
+    if 'events' in job['analyses'] and 'seis' in instruments:
+        path = os.path.join(output_dir, 'seis_events.csv')
+        data.seis.detect_events(job['minfreq'], job['maxfreq'], max_workers=1, output_path=path)
+        outputs.append(path)
+    if 'diurnal' in job['analyses']:
+        if 'twins' in instruments:
+            path = os.path.join(output_dir, 'twins_diurnal_wind_speed.csv')
+            data.twins.diurnal_aggregate(WIND_COLUMN).to_csv(path)
+            outputs.append(path)
+        if 'ps' in instruments:
+            path = os.path.join(output_dir, 'ps_diurnal_pressure.csv')
+            data.ps.diurnal_aggregate(PRESSURE_COLUMN).to_csv(path)
+            outputs.append(path)
+    if 'coherence' in job['analyses'] and {'seis', 'twins', 'ps'} <= set(instruments):
+        # 채널별 결과는 CSV의 CHANNEL 열로 구분
+        analyze_sols(job['start_sol'], job['sol_range'], job['data_paths'], job['channel'],
+                     band=(job['minfreq'], job['maxfreq']), max_workers=1, output_dir=output_dir)
+        outputs += [os.path.join(output_dir, 'wind_seis_correlation.csv'),
+                    os.path.join(output_dir, 'pressure_seis_coherence.csv')]
+    return outputs
+
+
+def _run_render(job, data):
+    output_dir = job['output_dir']
+    outputs = []
+    if 'seis' in job['instruments']:
+        outputs.append(os.path.join(output_dir, 'seis_waveform.png'))
+        data.seis.plot_waveform(outputs[-1])
+        outputs.append(os.path.join(output_dir, 'seis_spectrogram.png'))
+        data.seis.plot_spectrogram(job['minfreq'], job['maxfreq'], outputs[-1])
+    if 'twins' in job['instruments']:
+        outputs.append(os.path.join(output_dir, 'twins_wind_speed.png'))
+        data.twins.plot_wind_speed(outputs[-1])
+    if 'ps' in job['instruments']:
+        outputs.append(os.path.join(output_dir, 'ps_pressure.png'))
+        data.ps.plot_pressure(outputs[-1])
+    return outputs
+
+
+# 작업자 프로세스에서 실행하는 단계와 fingerprint에 넣을 작업 설정
+JOB_STAGES = (
+    ('filter', _run_filter, ('channel', 'minfreq', 'maxfreq')),
+    ('analyse', _run_analyse, ('analyses',)),
+    ('render', _run_render, ('instruments',)),
+)
+
+
+def run_job(job, upstream, force=False):
+    """
+    프로세스 풀 작업자: 작업 하나의 filter → analyse → render 단계를 차례로 실행.
+
+    각 단계의 fingerprint는 앞 단계 fingerprint와 단계 설정의 해시이므로, 입력
+    파일이나 설정이 바뀌면 그 단계부터 끝까지 다시 실행되고 나머지는 건너뜁니다.
+
+    Parameters:
+    - upstream (str): load 단계의 fingerprint
+
+    Returns:
+    - list: 단계별 (단계 이름, 'done' 또는 'skipped', 소요 시간(초))
+    """
+    os.makedirs(job['output_dir'], exist_ok=True)
+    data = _JobData(job)
+    results = []
+    for stage, run, keys in JOB_STAGES:
+        fingerprint = ResultCache.make_key(stage=stage, upstream=upstream,
+                                           **{key: job[key] for key in keys})
+        upstream = fingerprint
+        if not force and is_up_to_date(job, stage, fingerprint):
+            results.append((stage, 'skipped', 0.0))
+            continue
+        started = time.perf_counter()
+        outputs = run(job, data)
+        seconds = time.perf_counter() - started
+        write_stamp(job, stage, fingerprint, outputs, seconds)
+        results.append((stage, 'done', seconds))
+    return results
+
+
+def run_pipeline(jobs, max_workers=None, force=False, download_workers=1):
+    """
+    작업 목록 전체를 download → load → filter → analyse → render 순서로 처리.
+
+    download와 load는 여러 작업이 같은 파일을 공유하므로 메인 프로세스에서 파일
+    단위로 중복 없이 한 번만 실행하고(load의 디코딩은 프로세스 풀), 이후 단계는
+    서로 독립인 작업들을 프로세스 풀에서 병렬로 실행합니다. 실패한 작업은
+    로그만 남기고 나머지 작업은 계속 진행합니다.
+
+    Parameters:
+    - force (bool): 기록을 무시하고 모든 단계를 다시 실행
+
+    Returns:
+    - dict: 작업 이름별 단계 결과 목록 (실패한 작업은 None)
+    """
+    started = time.perf_counter()
+    download_missing(jobs, download_workers)
+
+    # load: 입력 파일 목록과 캐시 상태로 fingerprint를 만들고, 오래된 작업의 파일만 캐시
+    fingerprints = {}
+    stale_jobs = []
+    to_warm = []
+    for job in jobs:
+        inputs = resolve_inputs(job)
+        files = _input_files(inputs)
+        fingerprints[job['name']] = ResultCache.make_key(
+            stage='load', inputs=_file_stats(files), instruments=job['instruments'],
+            backend=job['backend'], sols=[job['start_sol'], job['sol_range']])
+        if force or not is_up_to_date(job, 'load', fingerprints[job['name']]):
+            stale_jobs.append((job, inputs))
+            to_warm += [f for f in files if job['backend'] == 'memmap' or not f.endswith('.mseed')]
+    if stale_jobs:
+        load_started = time.perf_counter()
+        to_warm = list(dict.fromkeys(to_warm))
+        for _ in ordered_map(_warm, to_warm, max_workers, 'process'):
+            pass
+        seconds = time.perf_counter() - load_started
+        for job, inputs in stale_jobs:
+            write_stamp(job, 'load', fingerprints[job['name']], _load_outputs(job, inputs), seconds)
+        logging.info(f'[*] load: 작업 {len(stale_jobs)}개, 파일 {len(to_warm)}개 캐시 ({seconds:.1f}초)')
+    else:
+        logging.info('[*] load: 모든 작업이 최신이라 건너뜀')
+
+    summary = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+        futures = {executor.submit(run_job, job, fingerprints[job['name']], force): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                summary[job['name']] = future.result()
+            except Exception as e:
+                logging.error(f"[!] 작업 실패: {job['name']}, 에러: {e}")
+                summary[job['name']] = None
+                continue
+            stages = ', '.join(f'{stage} {status}' + (f' {seconds:.1f}초' if status == 'done' else '')
+                               for stage, status, seconds in summary[job['name']])
+            logging.info(f"[*] {job['name']}: {stages}")
+    n_failed = sum(result is None for result in summary.values())
+    logging.info(f'[*] 작업 {len(jobs)}개 (실패 {n_failed}개), 총 {time.perf_counter() - started:.1f}초')
+    return summary
@@ -0,0 +1,264 @@
+import os
+import json
+import logging
+import tempfile
+import warnings
+import numpy as np
+import obspy
+from scipy import signal
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.colors import Normalize
+from conversions import LANDING_DATE
+from manifest import Manifest
+from core.decimation import pixel_width
+
+HOUR_MICROSECONDS = 3600 * 10**6
+
+
+def hour_index(t):
+    """
+    UTC 시각을 LANDING_DATE 기준 시간(hour) 번호로 변환.
+    """
+    elapsed = (np.asarray(t, dtype='datetime64[us]') - LANDING_DATE).astype(np.int64)
+    return elapsed // HOUR_MICROSECONDS
+
+
+def hour_start(index):
+    """
+    시간 번호의 시작 UTC (hour_index의 역함수).
+    """
+    return LANDING_DATE + (np.asarray(index, dtype=np.int64) * HOUR_MICROSECONDS).astype('timedelta64[us]')
+
+
+class PSDStore:
+    """
+    채널 × 시간(hour) × 주파수 Welch PSD를 .npy memmap으로 저장하는 저장소.
+
+    store_dir 구성:
+    - index.json: 계산 조건(sampling_rate, nperseg, 주파수 구간)과 채널별 처리 완료 파일
+      (이름, 크기, 수정 시각)
+    - psd_<channel>.npy: (시간 수, 주파수 구간 수) float32 dB, 계산되지 않은 시간은 NaN
+    - count_<channel>.npy: 시간별 PSD 계산에 쓰인 샘플 수
+
+    PSD는 로그 간격 주파수 구간으로 평균해 저장하므로 시간당 n_bins개 값만
+    차지합니다. update()는 manifest에서 처리하지 않은 파일만 골라 읽습니다.
+
+    계산 조건은 저장소를 처음 만들 때 정해지며, None으로 둔 조건은 저장된 값
+    (새 저장소이면 DEFAULTS)을 사용합니다. 저장된 값과 다른 조건을 지정하거나
+    샘플링 레이트가 다른 트레이스를 넣으면 ValueError를 냅니다.
+    """
+    INDEX_NAME = 'index.json'
+    DEFAULTS = {'sampling_rate': 20.0, 'nperseg': 4096, 'n_bins': 200}
+
+    def __init__(self, store_dir='../data/cache/psd', sampling_rate=None, nperseg=None, n_bins=None):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self.index_path = os.path.join(store_dir, self.INDEX_NAME)
+        requested = {'sampling_rate': sampling_rate, 'nperseg': nperseg, 'n_bins': n_bins}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+            for key, value in requested.items():
+                if value is not None and value != self.index[key]:
+                    raise ValueError(f"PSD store {store_dir} was built with {key}={self.index[key]}, "
+                                     f"not {value}.")
+        else:
+            self.index = {key: self.DEFAULTS[key] if value is None else value
+                          for key, value in requested.items()}
+            self.index['channels'] = {}
+            self._save_index()
+        self.sampling_rate = self.index['sampling_rate']
+        self.nperseg = self.index['nperseg']
+        self.n_bins = self.index['n_bins']
+
+        f = np.fft.rfftfreq(self.nperseg, 1 / self.sampling_rate)[1:]
+        edges = np.geomspace(f[0], f[-1], self.n_bins + 1)
+        # Welch 주파수 간격보다 좁아 비는 저주파 구간은 위쪽 구간에 합침
+        occupied = np.unique(np.clip(np.searchsorted(edges, f, side='right') - 1, 0, self.n_bins - 1))
+        self.edges = np.append(edges[occupied], edges[-1])
+        self.frequencies = np.sqrt(self.edges[:-1] * self.edges[1:])
+        bins = np.clip(np.searchsorted(self.edges, f, side='right') - 1, 0, len(self.frequencies) - 1)
+        # Welch 주파수(DC 제외) → 로그 구간 평균 행렬
+        weights = np.zeros((len(f) + 1, len(self.frequencies)))
+        weights[np.arange(1, len(f) + 1), bins] = 1
+        self._binning = weights / weights.sum(axis=0)
+
+    def _save_index(self):
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, prefix=self.INDEX_NAME + '.', suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    def _path(self, kind, channel):
+        return os.path.join(self.store_dir, f'{kind}_{channel.lower()}.npy')
+
+    def _open(self, channel, n_hours=0):
+        """
+        채널의 PSD/샘플 수 배열을 열고, n_hours보다 작으면 늘려서 다시 만듦.
+        """
+        psd_path = self._path('psd', channel)
+        count_path = self._path('count', channel)
+        if os.path.exists(psd_path):
+            psd = np.load(psd_path, mmap_mode='r+')
+            count = np.load(count_path)
+            if len(psd) >= n_hours:
+                return psd, count
+            # 이후 추가될 sol을 위해 여유 있게 두 배로 늘림
+            capacity = max(n_hours, 2 * len(psd))
+            fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, prefix=os.path.basename(psd_path) + '.',
+                                            suffix='.tmp')
+            os.close(fd)
+            grown = np.lib.format.open_memmap(tmp_path, 'w+', np.float32,
+                                              (capacity, len(self.frequencies)))
+            grown[:] = np.nan
+            grown[:len(psd)] = psd
+            grown.flush()
+            del grown, psd
+            os.replace(tmp_path, psd_path)
+            count = np.concatenate([count, np.zeros(capacity - len(count), dtype=np.int64)])
+            np.save(count_path, count)
+            return np.load(psd_path, mmap_mode='r+'), count
+        capacity = max(n_hours, 1)
+        psd = np.lib.format.open_memmap(psd_path, 'w+', np.float32, (capacity, len(self.frequencies)))
+        psd[:] = np.nan
+        count = np.zeros(capacity, dtype=np.int64)
+        np.save(count_path, count)
+        return psd, count
+
+    def _bin_psd(self, pxx):
+        """
+        Welch PSD (..., 주파수)를 로그 주파수 구간 평균 dB로 변환.
+        """
+        with np.errstate(divide='ignore'):
+            return (10 * np.log10(np.atleast_2d(pxx) @ self._binning)).astype(np.float32)
+
+    def _hour_psds(self, tr):
+        """
+        트레이스 하나를 시간 경계로 나눠 시간별 (시간 번호, 샘플 수, dB PSD)를 계산.
+
+        한 시간을 모두 채운 구간은 묶어서 한 번의 welch 호출로 처리합니다.
+        """
+        fs = tr.stats.sampling_rate
+        data = np.asarray(tr.data, dtype=np.float64)
+        start = np.datetime64(tr.stats.starttime.datetime, 'us')
+        first = int(hour_index(start))
+        offset = (start - hour_start(first)).astype(np.int64)
+        # 각 샘플이 속한 시간 번호 (트레이스 시작 기준 상대값)
+        hours = (offset + np.rint(np.arange(len(data)) / fs * 1e6).astype(np.int64)) // HOUR_MICROSECONDS
+        bounds = np.flatnonzero(np.diff(hours)) + 1
+        pieces = np.split(np.arange(len(data)), bounds)
+
+        full = int(round(3600 * fs))
+        results = []
+        batch_hours, batch = [], []
+        for piece in pieces:
+            hour = first + int(hours[piece[0]])
+            if len(piece) < self.nperseg or hour < 0:
+                continue
+            if len(piece) == full:
+                batch_hours.append(hour)
+                batch.append(data[piece])
+            else:
+                _, pxx = signal.welch(data[piece], fs, nperseg=self.nperseg)
+                results.append((hour, len(piece), self._bin_psd(pxx)[0]))
+        if batch:
+            _, pxx = signal.welch(np.stack(batch), fs, nperseg=self.nperseg, axis=-1)
+            for hour, row in zip(batch_hours, self._bin_psd(pxx)):
+                results.append((hour, full, row))
+        return results
+
+    def update(self, data_path, channels=('BHU',)):
+        """
+        data_path의 miniSEED 중 아직 처리하지 않은 파일만 PSD를 계산해 저장소에 추가.
+
+        Returns:
+        - int: 새로 처리한 파일 수
+        """
+        manifest = Manifest.for_directory(data_path)
+        # 디렉토리가 바뀐 경우에만 다시 훑음 (manifest를 매번 다시 쓰지 않음)
+        manifest.refresh()
+        n_processed = 0
+        for channel in channels:
+            channel = channel.lower()
+            state = self.index['channels'].setdefault(channel, {'files': {}})
+            for file in manifest.files('seis', channel):
+                name = os.path.basename(file)
+                stat = os.stat(file)
+                if state['files'].get(name) == [stat.st_size, stat.st_mtime]:
+                    continue
+                stream = obspy.read(file)
+                stream.merge(method=1)
+                rates = {tr.stats.sampling_rate for tr in stream}
+                if rates != {self.sampling_rate}:
+                    # 주파수 구간 행렬이 sampling_rate 기준이므로 다른 레이트는 섞을 수 없음
+                    raise ValueError(f"{name}: sampling rate {sorted(rates)} Hz does not match the "
+                                     f"PSD store ({self.sampling_rate} Hz).")
+                results = []
+                for tr in stream.split():
+                    results.extend(self._hour_psds(tr))
+                if results:
+                    psd, count = self._open(channel, max(hour for hour, _, _ in results) + 1)
+                    for hour, n_samples, row in results:
+                        # 공백 등으로 한 시간이 여러 조각이면 가장 긴 조각을 사용
+                        if n_samples >= count[hour]:
+                            psd[hour] = row
+                            count[hour] = n_samples
+                    psd.flush()
+                    np.save(self._path('count', channel), count)
+                    del psd
+                state['files'][name] = [stat.st_size, stat.st_mtime]
+                self._save_index()
+                n_processed += 1
+        logging.info(f"[*] PSD 저장소 갱신: {n_processed}개 파일 처리")
+        return n_processed
+
+    def read(self, channel, t0=None, t1=None):
+        """
+        [t0, t1) 구간의 시간별 PSD를 memmap 뷰로 반환.
+
+        Returns:
+        - tuple: (시간 시작 UTC 배열, 주파수 배열, (시간, 주파수) dB 배열)
+        """
+        psd_path = self._path('psd', channel)
+        if not os.path.exists(psd_path):
+            stored = ', '.join(sorted(self.index['channels'])) or 'none'
+            raise ValueError(f"No PSD stored for channel {channel} (stored channels: {stored}).")
+        psd = np.load(psd_path, mmap_mode='r')
+        first = 0 if t0 is None else max(int(hour_index(t0)), 0)
+        last = len(psd) if t1 is None else min(int(hour_index(t1)), len(psd))
+        return hour_start(np.arange(first, last)), self.frequencies, psd[first:last]
+
+    def plot_spectrogram(self, channel, output_path, t0=None, t1=None, figsize=(15, 8)):
+        """
+        저장된 시간별 PSD로 전체 기간 스펙트로그램을 그림.
+
+        시간 수가 그림 폭(픽셀)보다 많으면 여러 시간을 한 열로 평균해 그립니다.
+        """
+        times, frequencies, psd = self.read(channel, t0, t1)
+        if len(times) == 0:
+            raise ValueError("No PSD stored for the requested range.")
+        n_columns = min(len(times), pixel_width(figsize, matplotlib.rcParams['figure.dpi']))
+        step = int(np.ceil(len(times) / n_columns))
+        n_columns = int(np.ceil(len(times) / step))
+        padded = np.full((n_columns * step, len(frequencies)), np.nan, dtype=np.float32)
+        padded[:len(times)] = psd
+        with warnings.catch_warnings():
+            # 전부 NaN인 열(데이터 없음)은 NaN으로 남김
+            warnings.simplefilter('ignore', RuntimeWarning)
+            image = np.nanmean(padded.reshape(n_columns, step, -1), axis=1)
+        edges = hour_start(np.append(np.arange(n_columns) * step, len(times)) + int(hour_index(times[0])))
+
+        fig = Figure(figsize=figsize)
+        ax = fig.subplots()
+        finite = image[np.isfinite(image)]
+        norm = Normalize(*np.percentile(finite, [1, 99])) if len(finite) else None
+        mesh = ax.pcolormesh(edges.astype('datetime64[ms]').astype(object), self.edges, image.T,
+                             shading='flat', norm=norm)
+        ax.set_yscale('log')
+        ax.set_title(f'SEIS {channel.upper()} hourly PSD')
+        ax.set_xlabel('UTC Time')
+        ax.set_ylabel('Frequency (Hz)')
+        fig.colorbar(mesh, ax=ax, label='PSD (dB)')
+        fig.tight_layout()
+        fig.savefig(output_path)
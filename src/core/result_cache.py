@@ -0,0 +1,102 @@
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+
+_file_digests = {}
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    파일 내용의 sha256. 같은 실행 안에서는 (경로, 크기, mtime)이 같으면 재사용.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _file_digests:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                sha.update(chunk)
+        _file_digests[memo_key] = sha.hexdigest()
+    return _file_digests[memo_key]
+
+
+class ResultCache:
+    """
+    필터링 결과와 스펙트로그램 배열을 내용 주소(content-addressed)로 저장하는 디스크 캐시.
+
+    키는 make_key()에 넘긴 값(원본 파일 해시, 채널, 주파수 대역, STFT 옵션 등)의
+    해시이며, 항목은 .npz 파일로 저장됩니다. 전체 크기가 max_bytes를 넘으면
+    가장 오래 사용하지 않은 항목부터 삭제합니다 (LRU, 파일 mtime 기준).
+    """
+
+    def __init__(self, cache_dir='../data/cache/results', max_bytes=2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(**parts):
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.npz')
+
+    def get(self, key):
+        """
+        저장된 배열 dict를 반환 (없으면 None).
+        """
+        path = self.entry_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                arrays = {name: npz[name] for name in npz.files}
+        except (OSError, ValueError):
+            return None
+        # LRU 순서를 위해 사용 시각 갱신 (그 사이 다른 프로세스가 지웠을 수 있음)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return arrays
+
+    def put(self, key, arrays):
+        path = self.entry_path(key)
+        # 여러 프로세스가 같은 항목을 동시에 저장할 수 있으므로 임시 파일은 따로 만듦
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f'{key}.', suffix='.tmp.npz')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        전체 크기가 max_bytes 이하가 될 때까지 오래된 항목부터 삭제.
+
+        다른 프로세스가 같은 캐시를 동시에 정리할 수 있으므로 이미 사라진 항목은 건너뜁니다.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npz') and not name.endswith('.tmp.npz'):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,153 @@
+import os
+import glob
+import json
+import tempfile
+import numpy as np
+import obspy
+from core.csv_cache import CACHE_DIR_NAME
+
+# 디코딩한 파일을 프로세스 안에서 다시 열지 않도록 보관
+_open_files = {}
+
+
+def sample_paths(file_name):
+    """
+    miniSEED 파일에 대응하는 (샘플 파일, 헤더 파일) 경로.
+
+    원본의 크기와 mtime이 파일명에 들어가므로 원본이 바뀌면 자동으로 다른
+    파일을 가리킵니다 (csv_cache.cache_path와 같은 규칙).
+    """
+    stat = os.stat(file_name)
+    directory, base_name = os.path.split(file_name)
+    prefix = os.path.join(directory, CACHE_DIR_NAME, f'{base_name}.{stat.st_size}.{stat.st_mtime_ns}')
+    return prefix + '.samples', prefix + '.json'
+
+
+def decode_file(file_name):
+    """
+    miniSEED를 한 번 디코딩해 연속 구간 샘플을 이어 붙인 평면 파일과 헤더(JSON)로 저장.
+
+    헤더의 segments가 공백 표이며, 각 구간은 트레이스 정보, 시작 시각,
+    샘플링 레이트, 샘플 파일 안의 위치(offset)와 샘플 수(npts)를 가집니다.
+    """
+    samples_path, header_path = sample_paths(file_name)
+    directory = os.path.dirname(samples_path)
+    os.makedirs(directory, exist_ok=True)
+    base_name = os.path.basename(file_name)
+    for stale_path in glob.glob(os.path.join(directory, glob.escape(base_name) + '.*.samples')) + \
+            glob.glob(os.path.join(directory, glob.escape(base_name) + '.*.json')):
+        if stale_path in (samples_path, header_path):
+            continue
+        try:
+            os.remove(stale_path)
+        except FileNotFoundError:
+            # 다른 프로세스가 먼저 지운 경우
+            pass
+
+    stream = obspy.read(file_name)
+    stream.merge(method=1)
+    stream = stream.split()
+    stream.sort(['network', 'station', 'location', 'channel', 'starttime'])
+    dtype = np.result_type(*[tr.data.dtype for tr in stream]) if len(stream) else np.dtype(np.int32)
+    dtype = dtype.newbyteorder('<')
+
+    segments = []
+    offset = 0
+    # 여러 프로세스가 같은 파일을 동시에 디코딩할 수 있으므로 임시 파일은 따로 만듦
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=base_name + '.', suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        for tr in stream:
+            f.write(np.ascontiguousarray(tr.data, dtype=dtype).tobytes())
+            segments.append({
+                'network': tr.stats.network,
+                'station': tr.stats.station,
+                'location': tr.stats.location,
+                'channel': tr.stats.channel,
+                'starttime': str(tr.stats.starttime),
+                'sampling_rate': tr.stats.sampling_rate,
+                'offset': offset,
+                'npts': tr.stats.npts,
+            })
+            offset += tr.stats.npts
+    os.replace(tmp_path, samples_path)
+    # 헤더를 마지막에 두므로 헤더가 있으면 샘플 파일도 완성된 상태
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=base_name + '.', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'dtype': dtype.str, 'segments': segments}, f)
+    os.replace(tmp_path, header_path)
+
+
+class SampleFile:
+    """
+    decode_file로 만든 샘플 파일을 np.memmap으로 연 것.
+
+    traces()는 memmap의 뷰를 데이터로 갖는 Trace를 돌려주므로 구간을 잘라도
+    복사가 일어나지 않고, 같은 파일을 연 여러 프로세스가 페이지 캐시를
+    공유합니다. memmap은 읽기 전용이므로 제자리 연산이 필요하면 복사하세요.
+    """
+
+    def __init__(self, samples_path, header_path):
+        with open(header_path, 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        self.segments = header['segments']
+        for segment in self.segments:
+            segment['starttime'] = obspy.UTCDateTime(segment['starttime'])
+        n_samples = sum(segment['npts'] for segment in self.segments)
+        dtype = np.dtype(header['dtype'])
+        if n_samples:
+            self.data = np.memmap(samples_path, dtype=dtype, mode='r', shape=(n_samples,))
+        else:
+            self.data = np.empty(0, dtype=dtype)
+
+    def spans(self):
+        """
+        Returns:
+        - list: 구간별 (시작 시각, 종료 시각)
+        """
+        return [(s['starttime'], s['starttime'] + (s['npts'] - 1) / s['sampling_rate'])
+                for s in self.segments]
+
+    def traces(self, t0=None, t1=None):
+        """
+        [t0, t1] 구간과 겹치는 연속 구간을 memmap 뷰 Trace 목록으로 반환.
+        """
+        traces = []
+        for segment in self.segments:
+            start = segment['starttime']
+            rate = segment['sampling_rate']
+            npts = segment['npts']
+            # obspy의 slice/trim(nearest_sample=True)과 같이 가장 가까운 샘플 기준
+            i0 = 0 if t0 is None else max(int(round((t0 - start) * rate)), 0)
+            i1 = npts if t1 is None else min(int(round((t1 - start) * rate)) + 1, npts)
+            if i1 <= i0:
+                continue
+            header = {key: segment[key] for key in ('network', 'station', 'location', 'channel')}
+            header['sampling_rate'] = rate
+            header['starttime'] = start + i0 / rate
+            view = self.data[segment['offset'] + i0:segment['offset'] + i1]
+            traces.append(obspy.Trace(view, header=header))
+        return traces
+
+
+def ensure_decoded(file_name):
+    """
+    샘플 파일이 없으면 디코딩 (프로세스 풀 작업자에서 미리 디코딩할 때 사용).
+    """
+    samples_path, header_path = sample_paths(file_name)
+    if not (os.path.exists(samples_path) and os.path.exists(header_path)):
+        decode_file(file_name)
+    return file_name
+
+
+def open_sample_file(file_name):
+    """
+    miniSEED 파일의 SampleFile을 반환 (처음 한 번만 디코딩).
+    """
+    samples_path, header_path = sample_paths(file_name)
+    sample_file = _open_files.get(samples_path)
+    if sample_file is not None:
+        return sample_file
+    ensure_decoded(file_name)
+    sample_file = SampleFile(samples_path, header_path)
+    _open_files[samples_path] = sample_file
+    return sample_file
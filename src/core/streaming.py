@@ -0,0 +1,113 @@
+import warnings
+import numpy as np
+from scipy import signal
+
+
+def bandpass_sos(minfreq, maxfreq, sampling_rate, corners=4):
+    """
+    obspy의 'bandpass' 필터와 같은 방식으로 Butterworth SOS 계수를 설계.
+
+    maxfreq가 Nyquist 이상이면 obspy와 마찬가지로 high-pass로 대체합니다.
+    """
+    fe = 0.5 * sampling_rate
+    low = minfreq / fe
+    high = maxfreq / fe
+    if high - 1.0 > -1e-6:
+        warnings.warn(f"Selected high corner frequency ({maxfreq}) of bandpass is at or "
+                      f"above Nyquist ({fe}). Applying a high-pass instead.")
+        if low > 1:
+            raise ValueError("Selected corner frequency is above Nyquist.")
+        return signal.iirfilter(corners, low, btype='highpass', ftype='butter', output='sos')
+    if low > 1:
+        raise ValueError("Selected low corner frequency is above Nyquist.")
+    return signal.iirfilter(corners, [low, high], btype='band', ftype='butter', output='sos')
+
+
+class StreamingBandpass:
+    """
+    청크 경계에서 필터 상태(zi)를 이어 주는 SOS band-pass 필터.
+
+    연속된 구간을 여러 청크로 나눠 process()에 차례로 넣으면 전체를 한 번에
+    sosfilt 한 결과와 같은 값이 나옵니다. 데이터 공백이 있으면 reset()으로
+    상태를 초기화합니다 (obspy에서 split() 후 구간별로 필터링하는 것과 동일).
+    """
+
+    def __init__(self, minfreq, maxfreq, sampling_rate, corners=4):
+        self.sos = bandpass_sos(minfreq, maxfreq, sampling_rate, corners)
+        self.reset()
+
+    def reset(self):
+        self.zi = np.zeros((self.sos.shape[0], 2))
+
+    def process(self, chunk):
+        filtered, self.zi = signal.sosfilt(self.sos, np.asarray(chunk, dtype=np.float64), zi=self.zi)
+        return filtered
+
+
+class StreamingSpectrogram:
+    """
+    입력 청크를 받아 완성된 스펙트로그램 열만 내보내는 STFT.
+
+    scipy.signal.spectrogram과 같은 분할(nperseg, noverlap)과 옵션을 사용하며,
+    다음 세그먼트에 필요한 꼬리 샘플만 버퍼에 남겨 둡니다. 각 열의 시간 t는
+    reset() 이후 첫 샘플 기준 초 단위입니다. 입력이 끝나면 finish()를 호출해야
+    전체 입력이 nperseg보다 짧은 경우에도 scipy와 같은 결과를 얻습니다.
+    """
+
+    def __init__(self, sampling_rate, nperseg=256, noverlap=None, **kwargs):
+        self.sampling_rate = sampling_rate
+        self.nperseg = nperseg
+        # finish()에서 scipy에 그대로 넘기기 위해 원래 인수를 보관
+        self._noverlap_arg = noverlap
+        self.noverlap = nperseg // 8 if noverlap is None else noverlap
+        self.step = self.nperseg - self.noverlap
+        self.kwargs = kwargs
+        self.reset()
+
+    def reset(self):
+        self.buffer = np.empty(0)
+        self.offset = 0  # 버퍼 첫 샘플의 구간 내 위치
+
+    def process(self, chunk):
+        """
+        Returns:
+        - tuple: (f, t, sxx) 이번 청크로 완성된 열 (없으면 sxx의 열 수가 0)
+        """
+        self.buffer = np.concatenate([self.buffer, np.asarray(chunk, dtype=np.float64)])
+        n_segments = 0
+        if len(self.buffer) >= self.nperseg:
+            n_segments = (len(self.buffer) - self.nperseg) // self.step + 1
+        if n_segments == 0:
+            f = np.fft.rfftfreq(self.nperseg, 1 / self.sampling_rate)
+            return f, np.empty(0), np.empty((len(f), 0))
+
+        used = (n_segments - 1) * self.step + self.nperseg
+        f, _, sxx = signal.spectrogram(self.buffer[:used], self.sampling_rate,
+                                       nperseg=self.nperseg, noverlap=self.noverlap, **self.kwargs)
+        # scipy와 같은 식으로 시간을 계산해야 값이 정확히 일치함
+        t = (self.offset + self.nperseg / 2 + self.step * np.arange(n_segments)) / float(self.sampling_rate)
+        consumed = n_segments * self.step
+        self.buffer = self.buffer[consumed:]
+        self.offset += consumed
+        return f, t, sxx
+
+    def finish(self):
+        """
+        입력이 끝났을 때 호출.
+
+        reset() 이후 한 열도 만들지 못했으면 (전체 입력이 nperseg보다 짧음)
+        scipy.signal.spectrogram과 같이 nperseg를 입력 길이로 줄여 경고와 함께
+        한 열을 계산합니다. 그 밖에는 남은 꼬리 샘플로 열이 완성되지 않으므로
+        빈 결과를 반환합니다.
+
+        Returns:
+        - tuple: (f, t, sxx)
+        """
+        if self.offset == 0 and len(self.buffer):
+            f, t, sxx = signal.spectrogram(self.buffer, self.sampling_rate, nperseg=self.nperseg,
+                                           noverlap=self._noverlap_arg, **self.kwargs)
+            self.offset = len(self.buffer)
+            self.buffer = np.empty(0)
+            return f, t, sxx
+        f = np.fft.rfftfreq(self.nperseg, 1 / self.sampling_rate)
+        return f, np.empty(0), np.empty((len(f), 0))
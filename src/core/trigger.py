@@ -0,0 +1,137 @@
+import os
+import numpy as np
+import pandas as pd
+
+# demo_notebook.ipynb의 apollo12_catalog_GradeA_final.csv와 같은 열 이름
+TIME_ABS_COLUMN = 'time_abs(%Y-%m-%dT%H:%M:%S.%f)'
+TIME_ABS_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+CATALOG_COLUMNS = ['filename', TIME_ABS_COLUMN, 'time_rel(sec)', 'evid']
+
+
+class StreamingStaLta:
+    """
+    누적합으로 계산하는 classic STA/LTA를 청크 단위로 이어서 계산.
+
+    obspy.signal.trigger.classic_sta_lta와 같은 정의(제곱 진폭의 이동 평균 비,
+    처음 nlta - 1개 샘플은 0)이며, 다음 청크에 필요한 마지막 nlta개 샘플만
+    보관합니다. 데이터 공백에서는 reset()으로 초기화합니다.
+    """
+
+    def __init__(self, nsta, nlta):
+        self.nsta = nsta
+        self.nlta = nlta
+        self.reset()
+
+    def reset(self):
+        self.tail = np.empty(0)
+        self.n_seen = 0
+
+    def process(self, chunk):
+        energy = np.asarray(chunk, dtype=np.float64) ** 2
+        extended = np.concatenate([self.tail, energy])
+        cumulative = np.concatenate([[0.0], np.cumsum(extended)])
+        end = np.arange(len(self.tail) + 1, len(extended) + 1)
+
+        sta = (cumulative[end] - cumulative[np.maximum(end - self.nsta, 0)]) / self.nsta
+        lta = (cumulative[end] - cumulative[np.maximum(end - self.nlta, 0)]) / self.nlta
+        lta = np.maximum(lta, np.finfo(0.0).tiny)
+        cft = sta / lta
+
+        # 구간 시작 후 nlta - 1개 샘플은 LTA 창이 다 차지 않았으므로 0
+        warmup = self.nlta - 1 - self.n_seen
+        if warmup > 0:
+            cft[:warmup] = 0
+        self.n_seen += len(energy)
+        self.tail = extended[-self.nlta:]
+        return cft
+
+
+class StreamingTrigger:
+    """
+    특성 함수(cft)가 thr_on을 넘으면 켜지고 thr_off 아래로 내려가면 꺼지는 트리거.
+
+    이벤트가 청크 경계에 걸쳐도 켜진 상태를 이어 갑니다.
+    """
+
+    def __init__(self, thr_on, thr_off):
+        self.thr_on = thr_on
+        self.thr_off = thr_off
+        self.reset()
+
+    def reset(self):
+        self.on = None
+
+    def process(self, cft, offset=0):
+        """
+        Returns:
+        - list: 이번 청크에서 끝난 (켜진 샘플 위치, 꺼진 샘플 위치) 목록 (청크 앞 샘플 수 offset 포함)
+        """
+        events = []
+        pos = 0
+        while pos < len(cft):
+            if self.on is None:
+                above = np.flatnonzero(cft[pos:] > self.thr_on)
+                if len(above) == 0:
+                    break
+                pos += above[0]
+                self.on = offset + pos
+            below = np.flatnonzero(cft[pos:] < self.thr_off)
+            if len(below) == 0:
+                break
+            pos += below[0]
+            # obspy trigger_onset과 같이 꺼짐 위치는 임계값 아래로 내려가기 직전 샘플
+            events.append((self.on, offset + pos - 1))
+            self.on = None
+        return events
+
+
+def file_spans(headers):
+    """
+    트레이스별 헤더 (파일 경로, 시작 시각, 종료 시각) 목록을 파일별 범위로 합침.
+
+    파일 안에 공백이 있으면 트레이스가 여러 개이므로, 파일의 시작은 첫 트레이스의
+    시작, 끝은 마지막 트레이스의 끝으로 잡습니다 (time_rel은 파일 시작 기준).
+    """
+    spans = {}
+    for file, start, end in headers:
+        if file in spans:
+            first, last = spans[file]
+            spans[file] = (min(first, start), max(last, end))
+        else:
+            spans[file] = (start, end)
+    return [(file, start, end) for file, (start, end) in spans.items()]
+
+
+def locate_file(time, file_spans):
+    """
+    time을 포함하는 파일과 그 파일의 시작 시각을 찾음 (없으면 ('', time)).
+
+    Parameters:
+    - file_spans (list): file_spans()로 만든 파일별 (파일 경로, 시작 시각, 종료 시각) 목록
+    """
+    for file, start, end in file_spans:
+        if start <= time <= end:
+            return file, start
+    return '', time
+
+
+def build_catalog(events):
+    """
+    트리거 결과를 demo_notebook 카탈로그 형식의 데이터프레임으로 변환.
+
+    Parameters:
+    - events (list): (트리거 시각 UTCDateTime, 파일 경로, 파일 시작 시각) 목록
+
+    Returns:
+    - pandas.DataFrame: filename, time_abs(...), time_rel(sec), evid
+    """
+    rows = []
+    for on_time, file, file_start in sorted(events, key=lambda event: event[0]):
+        rows.append({
+            'filename': os.path.splitext(os.path.basename(file))[0],
+            TIME_ABS_COLUMN: on_time.datetime.strftime(TIME_ABS_FORMAT),
+            'time_rel(sec)': on_time - file_start,
+        })
+    catalog = pd.DataFrame(rows, columns=CATALOG_COLUMNS[:3])
+    catalog['evid'] = [f'evid{i:05d}' for i in range(1, len(catalog) + 1)]
+    return catalog
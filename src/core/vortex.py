@@ -0,0 +1,111 @@
+import os
+import numpy as np
+import pandas as pd
+from scipy import signal
+from concurrent.futures import ProcessPoolExecutor
+from core.csv_cache import read_csv_cached
+
+CATALOG_COLUMNS = ['time', 'drop', 'duration', 'file']
+
+
+def detect_pressure_drops(utc, pressure, threshold=0.3, baseline_seconds=1000, min_duration=1.0):
+    """
+    기압 시계열에서 짧은 기압 강하(대류성 소용돌이, dust devil 후보)를 찾음.
+
+    baseline_seconds 길이(시간 기준)의 이동 중앙값으로 배경 기압을 제거한 뒤, 강하
+    깊이가 threshold(Pa) 이상이고 반치폭이 min_duration(초) 이상인 음의 피크를
+    찾습니다. 데이터 공백 양쪽은 따로 처리합니다.
+
+    Returns:
+    - pandas.DataFrame: time(UTC), drop(Pa), duration(반치폭, 초)
+    """
+    utc = np.asarray(utc)
+    pressure = np.asarray(pressure, dtype=np.float64)
+    if len(pressure) < 3:
+        return pd.DataFrame(columns=CATALOG_COLUMNS[:3])
+
+    seconds = (utc - utc[0]).astype('timedelta64[us]').astype(np.int64) / 1e6
+    steps = np.diff(seconds)
+    # 앞뒤 간격보다 1.5배 넘게 긴 간격에서 나눠, 배경 기압과 반치폭이 공백을 건너 계산되지
+    # 않도록 함 (샘플링 간격이 바뀌는 곳은 공백으로 보지 않음)
+    neighbours = np.maximum(np.r_[0, steps[:-1]], np.r_[steps[1:], 0])
+    breaks = np.flatnonzero(steps > 1.5 * neighbours) + 1
+    frames = []
+    for segment in np.split(np.arange(len(pressure)), breaks):
+        if len(segment) < 3:
+            continue
+        # 샘플 수가 아닌 시간 길이의 창이므로 샘플링 간격과 무관하게 같은 구간에서 배경을 추정
+        baseline = pd.Series(pressure[segment], index=pd.DatetimeIndex(utc[segment])) \
+            .rolling(pd.Timedelta(seconds=baseline_seconds), center=True, min_periods=1).median().to_numpy()
+        detrended = pressure[segment] - baseline
+
+        peaks, properties = signal.find_peaks(-detrended, height=threshold)
+        _, _, left, right = signal.peak_widths(-detrended, peaks, rel_height=0.5)
+        # 반치폭의 양 끝(소수 샘플 위치)을 시각으로 바꿔 초 단위 지속 시간 계산
+        positions = np.arange(len(segment))
+        duration = np.interp(right, positions, seconds[segment]) - np.interp(left, positions, seconds[segment])
+        keep = duration >= min_duration
+        frames.append(pd.DataFrame({
+            'time': utc[segment][peaks[keep]],
+            'drop': properties['peak_heights'][keep],
+            'duration': duration[keep],
+        }))
+    if not frames:
+        return pd.DataFrame(columns=CATALOG_COLUMNS[:3])
+    return pd.concat(frames, ignore_index=True)
+
+
+def detect_file(file_name, threshold=0.3, baseline_seconds=1000, min_duration=1.0, use_cache=True):
+    """
+    PS sol 파일 하나에서 기압 강하 이벤트를 찾음 (프로세스 풀 작업자).
+    """
+    df = read_csv_cached(file_name, use_cache, columns=['PRESSURE'])
+    events = detect_pressure_drops(df['UTC'].to_numpy(), df['PRESSURE'].to_numpy(),
+                                   threshold, baseline_seconds, min_duration)
+    events['file'] = os.path.basename(file_name)
+    return events
+
+
+def detect_catalog(file_names, threshold=0.3, baseline_seconds=1000, min_duration=1.0,
+                   use_cache=True, max_workers=None):
+    """
+    여러 PS 파일을 병렬로 처리해 시간 순 이벤트 카탈로그를 만듦.
+    """
+    n = len(file_names)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(detect_file, file_names, [threshold] * n,
+                                   [baseline_seconds] * n, [min_duration] * n, [use_cache] * n))
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame(columns=CATALOG_COLUMNS)
+    return pd.concat(frames, ignore_index=True).sort_values('time', ignore_index=True)
+
+
+def match_wind(catalog, twins_frames, tolerance='30s'):
+    """
+    카탈로그의 각 이벤트 시각에 가장 가까운 TWINS HORIZONTAL_WIND_SPEED를 붙임.
+
+    twins_frames는 TWINSData.iter_frames()처럼 sol 파일 단위 데이터프레임을
+    돌려주는 iterable이며, 파일마다 그 시간 범위에 속한 이벤트만 as-of 결합합니다.
+    """
+    catalog = catalog.sort_values('time', ignore_index=True)
+    wind = np.full(len(catalog), np.nan)
+    times = catalog['time']
+    for df in twins_frames:
+        if df.empty:
+            continue
+        in_range = ((times >= df['UTC'].iloc[0] - pd.Timedelta(tolerance)) &
+                    (times <= df['UTC'].iloc[-1] + pd.Timedelta(tolerance))).to_numpy()
+        if not in_range.any():
+            continue
+        matched = pd.merge_asof(catalog.loc[in_range, ['time']],
+                                df[['UTC', 'HORIZONTAL_WIND_SPEED']].sort_values('UTC'),
+                                left_on='time', right_on='UTC', direction='nearest',
+                                tolerance=pd.Timedelta(tolerance))
+        values = matched['HORIZONTAL_WIND_SPEED'].to_numpy(dtype=np.float64)
+        # 앞선 파일에서 이미 찾은 값은 유지
+        target = np.flatnonzero(in_range)
+        keep = np.isnan(wind[target])
+        wind[target[keep]] = values[keep]
+    catalog['HORIZONTAL_WIND_SPEED'] = wind
+    return catalog
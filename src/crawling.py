@@ -5,7 +5,8 @@ import argparse
 import logging
 from datetime import datetime, timedelta
 from downloader import SEISDownloader, TWINSDownloader, PSDownloader
-from utils import sols_to_earth_date
+from listing_cache import ListingCache
+from utils import sols_to_earth_date, earth_date_to_sol
 
 
 def main():
@@ -28,6 +29,10 @@ def main():
                         help='데이터를 다운로드할 일수 또는 sol 수')
     parser.add_argument('--output_dir', type=str,
                         default='../data/downloads', help='다운로드할 디렉토리')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='SEIS 동시 다운로드 작업자 수 (기본값: 1, 순차 다운로드)')
+    parser.add_argument('--per_host', type=int, default=4,
+                        help='호스트당 최대 동시 요청 수 (기본값: 4)')
 
     args = parser.parse_args()
 
@@ -38,14 +43,12 @@ def main():
     os.makedirs(twins_dir, exist_ok=True)
 
     # 날짜 범위 계산
-    landing_date = datetime(2018, 11, 26)  # InSight 착륙일
-
     if args.start_sol is not None:
         start_sol = args.start_sol
         start_date = sols_to_earth_date(start_sol)
     elif args.start_date is not None:
         start_date = datetime.strptime(args.start_date, '%Y-%m-%d')
-        start_sol = (start_date - landing_date).days
+        start_sol = earth_date_to_sol(start_date)
     elif args.start_doy is not None:
         # 연도를 지정하지 않으면 현재 연도로 가정
         if args.year is not None:
@@ -57,7 +60,7 @@ def main():
         except ValueError:
             logging.error('DOY의 범위는 1에서 366 사이여야 합니다.')
             return
-        start_sol = (start_date - landing_date).days
+        start_sol = earth_date_to_sol(start_date)
     else:
         logging.error('시작 sol 번호, 시작 날짜 또는 시작 DOY를 입력해야 합니다.')
         return
@@ -70,9 +73,12 @@ def main():
     logging.info(f'TWINS 데이터 다운로드: sol {start_sol}부터 sol {end_sol}까지')
 
     # 다운로드 객체 생성
-    seis_downloader = SEISDownloader()
-    twins_downloader = TWINSDownloader()
-    ps_downloader = PSDownloader()
+    # 세 다운로더가 디렉토리 목록 캐시를 공유
+    listing_cache = ListingCache(os.path.join(args.output_dir, '.listing_cache'))
+    seis_downloader = SEISDownloader(max_workers=args.workers, max_per_host=args.per_host,
+                                     listing_cache=listing_cache)
+    twins_downloader = TWINSDownloader(listing_cache=listing_cache)
+    ps_downloader = PSDownloader(listing_cache=listing_cache)
 
     # SEIS 데이터 다운로드
     # seis_downloader.crawl_and_download(
@@ -102,3 +108,4 @@ if __name__ == '__main__':
     # python crawling.py --start_sol 237 --range 3 --output_dir ../data/downloads
     # python crawling.py --start_date 2020-01-31 --range 3 --output_dir ../data/downloads
     # python crawling.py --start_doy 31 --year 2020 --range 3 --output_dir ../data/downloads
+    # python crawling.py --start_sol 237 --range 30 --workers 8 --per_host 4 --output_dir ../data/downloads
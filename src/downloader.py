@@ -1,10 +1,16 @@
 import os
+import time
+import hashlib
+import threading
 import requests
-import requests
-from bs4 import BeautifulSoup
+import requests.adapters
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
 from utils import sols_to_earth_date
+from listing_cache import ListingCache
+from manifest import Manifest
 
 sol_ranges = [
             (0, 122),
@@ -24,46 +30,283 @@ sol_ranges = [
             (1277, 1366)
         ]
 
+def _file_md5(file_path, chunk_size=1 << 20):
+    md5 = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def _unsatisfied_range_size(content_range):
+    """
+    416 응답의 Content-Range (bytes */N)에서 전체 크기 N을 구함 (알 수 없으면 None).
+    """
+    if not content_range:
+        return None
+    unit, _, value = content_range.partition(' ')
+    _, _, total = value.partition('/')
+    if unit != 'bytes' or not total.isdigit():
+        return None
+    return int(total)
+
+
+def _read_validator(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_validator(path, headers):
+    """
+    응답의 ETag(없으면 Last-Modified)를 기록 (If-Range에 사용, 둘 다 없으면 파일을 지움).
+    """
+    validator = headers.get('ETag') or headers.get('Last-Modified')
+    if validator is None:
+        _remove(path)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(validator)
+
+
+def _remove(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def stream_download(session, url, file_path, checksum=None, chunk_size=1 << 20):
+    """
+    url의 파일을 file_path로 스트리밍 다운로드.
+
+    데이터는 file_path + '.part' 임시 파일에 청크 단위로 기록된 뒤 완료되면
+    원자적으로 이름이 바뀌므로, 중단된 실행이 잘린 파일을 최종 경로에 남기지
+    않습니다. '.part' 파일이 남아 있으면 HTTP Range 요청으로 이어받습니다.
+    처음 받을 때의 ETag(없으면 Last-Modified)를 '.part.validator'에 기록해 두고
+    If-Range로 보내므로, 그 사이 원격 파일이 바뀌었으면 서버가 200으로 전체를
+    보내 처음부터 다시 받습니다 (validator가 없는 '.part'는 버림). 서버가 416을
+    돌려주면 '.part' 크기가 원격 파일 크기와 같을 때만 완료로 보고 그렇지 않으면
+    처음부터 다시 받습니다. Range 오프셋이 파일 바이트와 같도록 압축 전송
+    (Content-Encoding)은 요청하지 않습니다.
+    최종 파일이 이미 있고 원격 크기(또는 주어진 md5 checksum)와 일치하면
+    다운로드를 건너뜁니다.
+
+    Parameters:
+    - session (requests.Session): 요청에 사용할 세션
+    - url (str): 다운로드할 URL
+    - file_path (str): 저장할 최종 경로
+    - checksum (str): 기대하는 md5 hex digest (선택)
+    - chunk_size (int): 스트리밍 청크 크기 (바이트)
+
+    Returns:
+    - int: 이번 호출에서 받은 바이트 수 (416으로 완료된 경우 '.part' 크기, 건너뛴 경우 0)
+    """
+    if os.path.exists(file_path):
+        if checksum is not None:
+            if _file_md5(file_path) == checksum.lower():
+                return 0
+        else:
+            try:
+                head = session.head(url, allow_redirects=True)
+                head.raise_for_status()
+            except requests.RequestException as e:
+                # 크기를 확인할 수 없으면 실패로 보지 않고 GET으로 다시 받음
+                logging.warning(f'HEAD 요청 실패, 다시 다운로드: {url}, 에러: {e}')
+            else:
+                remote_size = head.headers.get('Content-Length')
+                if remote_size is not None and int(remote_size) == os.path.getsize(file_path):
+                    return 0
+
+    part_path = file_path + '.part'
+    validator_path = part_path + '.validator'
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    validator = _read_validator(validator_path) if offset else None
+    headers = {'Accept-Encoding': 'identity'}
+    if offset and validator is None:
+        # 어느 버전의 파일인지 알 수 없는 .part는 이어 붙이지 않음
+        logging.warning(f'.part의 원격 파일 정보가 없어 처음부터 받음: {url}')
+        offset = 0
+    if offset:
+        headers.update({'Range': f'bytes={offset}-', 'If-Range': validator})
+
+    received = 0
+    with session.get(url, headers=headers, stream=True) as response:
+        if response.status_code == 416:
+            # .part가 원격 파일 크기(Content-Range: bytes */N)와 같을 때만 완료된 것으로 봄
+            remote_size = _unsatisfied_range_size(response.headers.get('Content-Range'))
+            response.close()
+            if remote_size != offset:
+                # 원격 파일이 바뀌어 .part가 더 큰 경우 등: 버리고 처음부터 다시 받음
+                logging.warning(f'.part 크기({offset})가 원격 크기({remote_size})와 달라 다시 받음: {url}')
+                _remove(part_path, validator_path)
+                return stream_download(session, url, file_path, checksum, chunk_size)
+            received = offset
+        else:
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # 서버가 Range를 무시했거나 If-Range가 맞지 않음 (원격 파일이 바뀜): 처음부터 다시 받음
+                offset = 0
+            if not offset:
+                _write_validator(validator_path, response.headers)
+            expected = response.headers.get('Content-Length')
+            # 서버가 그래도 압축해 보내면 Content-Length는 압축된 크기이므로 비교하지 않음
+            encoded = response.headers.get('Content-Encoding', 'identity') != 'identity'
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    received += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            if expected is not None and not encoded and received != int(expected):
+                raise requests.HTTPError(
+                    f'불완전한 응답: {received}/{expected} 바이트', response=response)
+
+    if checksum is not None and _file_md5(part_path) != checksum.lower():
+        _remove(part_path, validator_path)
+        raise requests.HTTPError(f'checksum 불일치: {url}')
+    os.replace(part_path, file_path)
+    _remove(validator_path)
+    return received
+
+
+def _save_manifest(directory):
+    """
+    일괄 다운로드가 끝난 뒤 manifest를 한 번만 저장 (디렉토리가 없으면 건너뜀).
+    """
+    if os.path.isdir(directory):
+        Manifest.for_directory(directory).save()
+
+
 class SEISDownloader:
-    def __init__(self, base_url='https://pds-geosciences.wustl.edu'):
+    stations = ['elyh0', 'elyhk', 'elys0', 'elyse']
+
+    def __init__(self, base_url='https://pds-geosciences.wustl.edu', max_workers=1, max_per_host=4,
+                 listing_cache=None):
         self.base_url = base_url
+        self.listing_cache = listing_cache or ListingCache()
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
         self.session = requests.Session()
-
-    def download_file(self, url, directory):
+        # 동시 다운로드 시 연결 풀이 작업자 수보다 작으면 연결이 버려지므로 크기를 맞춤
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_per_host,
+                                                pool_maxsize=max(max_workers, max_per_host))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._host_limits = {}
+        self._host_limits_lock = threading.Lock()
+
+    def _host_semaphore(self, url):
+        host = urlparse(url).netloc
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def download_file(self, url, directory, checksum=None, save_manifest=True):
+        """
+        파일 하나를 다운로드하고 받은 바이트 수를 반환 (건너뛰면 0, 실패 시 None).
+
+        save_manifest가 False이면 manifest에 항목만 추가하고 저장은 호출 측이
+        한 번에 합니다 (crawl_and_download 참고).
+        """
         file_name = url.split('/')[-1]
         file_path = os.path.join(directory, file_name)
 
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-            logging.info(f'{file_name} 다운로드 완료')
-        except requests.HTTPError as e:
+            size = stream_download(self.session, url, file_path, checksum)
+            Manifest.for_directory(directory).add(file_path, save=save_manifest)
+            if size:
+                logging.info(f'{file_name} 다운로드 완료')
+            else:
+                logging.info(f'{file_name} 이미 존재하여 건너뜀')
+            return size
+        except requests.RequestException as e:
             logging.error(f'파일 다운로드 실패: {url}, 에러: {e}')
+            return None
 
-    def crawl_and_download(self, start_date, end_date, directory):
+    def _iter_day_urls(self, start_date, end_date):
         date = start_date
         while date <= end_date:
             year = date.year
             doy = date.timetuple().tm_yday
+            for station in self.stations:
+                yield f'{self.base_url}/insight/urn-nasa-pds-insight_seis/data/xb/continuous_waveform/{station}/{year}/{doy:03d}/'
+            date += timedelta(days=1)
 
-            for station in ['elyh0', 'elyhk', 'elys0', 'elyse']:
-                url = f'{self.base_url}/insight/urn-nasa-pds-insight_seis/data/xb/continuous_waveform/{station}/{year}/{doy:03d}/'
-                logging.info(f"[*] Crawling URL: {url}")
-                try:
-                    response = self.session.get(url)
-                    response.raise_for_status()
-                    soup = BeautifulSoup(response.text, 'html.parser')
-
-                    for link in soup.find_all('a'):
-                        href = link.get('href')
-                        if href.endswith('.mseed'):
-                            file_url = self.base_url + href
-                            self.download_file(file_url, directory)
-                except requests.HTTPError as e:
-                    logging.error(f'페이지 크롤링 실패: {url}, 에러: {e}')
-                date += timedelta(days=1)
+    def _list_mseed_urls(self, url):
+        logging.info(f"[*] Crawling URL: {url}")
+        try:
+            with self._host_semaphore(url):
+                links = self.listing_cache.get_links(self.session, url)
+        except requests.HTTPError as e:
+            logging.error(f'페이지 크롤링 실패: {url}, 에러: {e}')
+            return []
+
+        file_urls = []
+        for href in links:
+            if href.endswith('.mseed'):
+                file_urls.append(self.base_url + href)
+        return file_urls
+
+    def _timed_download(self, url, directory):
+        with self._host_semaphore(url):
+            started = time.perf_counter()
+            size = self.download_file(url, directory, save_manifest=False)
+            return url, size, time.perf_counter() - started
+
+    def crawl_and_download(self, start_date, end_date, directory, max_workers=None):
+        """
+        start_date부터 end_date까지 모든 관측소의 .mseed 파일을 다운로드.
+
+        max_workers가 1보다 크면 다운로드를 스레드 풀에서 동시에 수행합니다.
+        디렉토리 목록 조회는 현재 스레드에서 계속 진행되므로 다음 날짜의 목록을
+        가져오는 동안 이전 날짜의 파일이 내려받아집니다. 호스트별 동시 요청 수는
+        max_per_host로 제한됩니다. manifest는 파일마다 저장하지 않고 끝에 한 번만
+        저장합니다 (중간에 실패해도 그때까지 받은 파일은 기록).
+
+        Returns:
+        - list: (url, 바이트 수, 소요 시간(초)) 튜플 목록
+        """
+        max_workers = max_workers or self.max_workers
+        started = time.perf_counter()
+        results = []
+
+        try:
+            if max_workers <= 1:
+                for url in self._iter_day_urls(start_date, end_date):
+                    for file_url in self._list_mseed_urls(url):
+                        results.append(self._timed_download(file_url, directory))
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = []
+                    for url in self._iter_day_urls(start_date, end_date):
+                        for file_url in self._list_mseed_urls(url):
+                            futures.append(executor.submit(self._timed_download, file_url, directory))
+                    for future in futures:
+                        results.append(future.result())
+        finally:
+            _save_manifest(directory)
+
+        self._log_throughput(results, time.perf_counter() - started)
+        return results
+
+    def _log_throughput(self, results, elapsed):
+        total_bytes = 0
+        for url, size, seconds in results:
+            if size:
+                total_bytes += size
+                logging.info(f'[*] {url.split("/")[-1]}: {size / 1e6:.2f} MB, '
+                             f'{size / 1e6 / max(seconds, 1e-9):.2f} MB/s')
+        n_ok = sum(1 for _, size, _ in results if size)
+        n_skipped = sum(1 for _, size, _ in results if size == 0)
+        n_failed = sum(1 for _, size, _ in results if size is None)
+        logging.info(f'[*] 총 {len(results)}개 파일 중 {n_ok}개 다운로드, {n_skipped}개 건너뜀, {n_failed}개 실패')
+        logging.info(f'[*] {total_bytes / 1e6:.2f} MB, '
+                     f'{elapsed:.1f}초, 평균 {total_bytes / 1e6 / max(elapsed, 1e-9):.2f} MB/s')
 
 # twins_downloader.py
 
@@ -74,8 +317,9 @@ class SEISDownloader:
 
 
 class TWINSDownloader:
-    def __init__(self, base_url='https://atmos.nmsu.edu/PDS/data/PDS4/InSight/twins_bundle/data_derived/'):
+    def __init__(self, base_url='https://atmos.nmsu.edu/PDS/data/PDS4/InSight/twins_bundle/data_derived/', listing_cache=None):
         self.base_url = base_url
+        self.listing_cache = listing_cache or ListingCache()
         self.session = requests.Session()
 
     def get_directory_for_sol(self, sol):
@@ -84,65 +328,67 @@ class TWINSDownloader:
                 return f'sol_{start:04d}_{end:04d}/'
         return None
 
-    def download_file(self, url, directory):
+    def download_file(self, url, directory, checksum=None, save_manifest=True):
         file_name = url.split('/')[-1]
         file_path = os.path.join(directory, file_name)
 
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-            logging.info(f'{file_name} 다운로드 완료')
-        except requests.HTTPError as e:
+            size = stream_download(self.session, url, file_path, checksum)
+            Manifest.for_directory(directory).add(file_path, save=save_manifest)
+            if size:
+                logging.info(f'{file_name} 다운로드 완료')
+            else:
+                logging.info(f'{file_name} 이미 존재하여 건너뜀')
+        except requests.RequestException as e:
             logging.error(f'파일 다운로드 실패: {url}, 에러: {e}')
 
     def download_range(self, start_sol, end_sol, directory):
-        for sol in range(start_sol, end_sol + 1):
-            sol_str = f"{sol:04d}"
-
-            dir_name = self.get_directory_for_sol(sol)
-            if dir_name is None:
-                logging.error(f'sol 번호 {sol}에 해당하는 디렉토리를 찾을 수 없습니다.')
-                continue
+        try:
+            for sol in range(start_sol, end_sol + 1):
+                sol_str = f"{sol:04d}"
 
-            # 디렉토리의 파일 목록 가져오기
-            dir_url = f"{self.base_url}{dir_name}"
-            try:
-                response = self.session.get(dir_url)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                # 해당 sol 번호의 파일들 중 버전 번호를 추출하여 최신 버전 찾기
-                version_numbers = []
-                file_urls = {}
-                for link in soup.find_all('a'):
-                    href = link.get('href')
-                    if href.endswith('.csv') and f'twins_model_{sol_str}_' in href:
-                        version_str = href.split(
-                            '_')[-1].split('.')[0]  # 예: '02'
-                        if version_str.isdigit():
-                            version = int(version_str)
-                            version_numbers.append(version)
-                            file_urls[version] = dir_url + href
-
-                if not version_numbers:
-                    logging.error(f'sol 번호 {sol}에 대한 파일을 찾을 수 없습니다.')
+                dir_name = self.get_directory_for_sol(sol)
+                if dir_name is None:
+                    logging.error(f'sol 번호 {sol}에 해당하는 디렉토리를 찾을 수 없습니다.')
                     continue
 
-                latest_version = max(version_numbers)
-                latest_file_url = file_urls[latest_version]
-
-                # 파일 다운로드
-                self.download_file(latest_file_url, directory)
+                # 디렉토리의 파일 목록 가져오기
+                dir_url = f"{self.base_url}{dir_name}"
+                try:
+                    links = self.listing_cache.get_links(self.session, dir_url)
+
+                    # 해당 sol 번호의 파일들 중 버전 번호를 추출하여 최신 버전 찾기
+                    version_numbers = []
+                    file_urls = {}
+                    for href in links:
+                        if href.endswith('.csv') and f'twins_model_{sol_str}_' in href:
+                            version_str = href.split(
+                                '_')[-1].split('.')[0]  # 예: '02'
+                            if version_str.isdigit():
+                                version = int(version_str)
+                                version_numbers.append(version)
+                                file_urls[version] = dir_url + href
+
+                    if not version_numbers:
+                        logging.error(f'sol 번호 {sol}에 대한 파일을 찾을 수 없습니다.')
+                        continue
+
+                    latest_version = max(version_numbers)
+                    latest_file_url = file_urls[latest_version]
+
+                    # 파일 다운로드 (manifest는 download_range 끝에 한 번만 저장)
+                    self.download_file(latest_file_url, directory, save_manifest=False)
 
-            except requests.HTTPError as e:
-                logging.error(f'디렉토리 접근 실패: {dir_url}, 에러: {e}')
+                except requests.HTTPError as e:
+                    logging.error(f'디렉토리 접근 실패: {dir_url}, 에러: {e}')
+        finally:
+            _save_manifest(directory)
 
 
 class PSDownloader:
-    def __init__(self, base_url='https://atmos.nmsu.edu/PDS/data/PDS4/InSight/ps_bundle/data_calibrated/'):
+    def __init__(self, base_url='https://atmos.nmsu.edu/PDS/data/PDS4/InSight/ps_bundle/data_calibrated/', listing_cache=None):
         self.base_url = base_url
+        self.listing_cache = listing_cache or ListingCache()
         self.session = requests.Session()
         
     def get_directory_for_sol(self, sol):
@@ -151,57 +397,58 @@ class PSDownloader:
                 return f'sol_{start:04d}_{end:04d}/'
         return None
             
-    def download_file(self, url, directory):
+    def download_file(self, url, directory, checksum=None, save_manifest=True):
         file_name = url.split('/')[-1]
         file_path = os.path.join(directory, file_name)
 
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-            logging.info(f'{file_name} 다운로드 완료')
-        except requests.HTTPError as e:
+            size = stream_download(self.session, url, file_path, checksum)
+            Manifest.for_directory(directory).add(file_path, save=save_manifest)
+            if size:
+                logging.info(f'{file_name} 다운로드 완료')
+            else:
+                logging.info(f'{file_name} 이미 존재하여 건너뜀')
+        except requests.RequestException as e:
             logging.error(f'[!] 파일 다운로드 실패: {url}, 에러: {e}')
             
     def download_range(self, start_sol, end_sol, directory):
-        for sol in range(start_sol, end_sol + 1):
-            sol_str = f"{sol:04d}"
-
-            dir_name = self.get_directory_for_sol(sol)
-            if dir_name is None:
-                logging.error(f'[!] sol 번호 {sol}에 해당하는 디렉토리를 찾을 수 없습니다.')
-                continue
+        try:
+            for sol in range(start_sol, end_sol + 1):
+                sol_str = f"{sol:04d}"
 
-            # 디렉토리의 파일 목록 가져오기
-            dir_url = f"{self.base_url}{dir_name}"
-            try:
-                response = self.session.get(dir_url)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                # 해당 sol 번호의 파일들 중 버전 번호를 추출하여 최신 버전 찾기
-                version_numbers = []
-                file_urls = {}
-                for link in soup.find_all('a'):
-                    href = link.get('href')
-                    if href.endswith('.csv') and f'ps_calib_{sol_str}_' in href:
-                        version_str = href.split(
-                            '_')[-1].split('.')[0]  # 예: '02'
-                        if version_str.isdigit():
-                            version = int(version_str)
-                            version_numbers.append(version)
-                            file_urls[version] = dir_url + href
-
-                if not version_numbers:
-                    logging.error(f'sol 번호 {sol}에 대한 파일을 찾을 수 없습니다.')
+                dir_name = self.get_directory_for_sol(sol)
+                if dir_name is None:
+                    logging.error(f'[!] sol 번호 {sol}에 해당하는 디렉토리를 찾을 수 없습니다.')
                     continue
 
-                latest_version = max(version_numbers)
-                latest_file_url = file_urls[latest_version]
-
-                # 파일 다운로드
-                self.download_file(latest_file_url, directory)
+                # 디렉토리의 파일 목록 가져오기
+                dir_url = f"{self.base_url}{dir_name}"
+                try:
+                    links = self.listing_cache.get_links(self.session, dir_url)
+
+                    # 해당 sol 번호의 파일들 중 버전 번호를 추출하여 최신 버전 찾기
+                    version_numbers = []
+                    file_urls = {}
+                    for href in links:
+                        if href.endswith('.csv') and f'ps_calib_{sol_str}_' in href:
+                            version_str = href.split(
+                                '_')[-1].split('.')[0]  # 예: '02'
+                            if version_str.isdigit():
+                                version = int(version_str)
+                                version_numbers.append(version)
+                                file_urls[version] = dir_url + href
+
+                    if not version_numbers:
+                        logging.error(f'sol 번호 {sol}에 대한 파일을 찾을 수 없습니다.')
+                        continue
+
+                    latest_version = max(version_numbers)
+                    latest_file_url = file_urls[latest_version]
+
+                    # 파일 다운로드 (manifest는 download_range 끝에 한 번만 저장)
+                    self.download_file(latest_file_url, directory, save_manifest=False)
 
-            except requests.HTTPError as e:
-                logging.error(f'디렉토리 접근 실패: {dir_url}, 에러: {e}')
\ No newline at end of file
+                except requests.HTTPError as e:
+                    logging.error(f'디렉토리 접근 실패: {dir_url}, 에러: {e}')
+        finally:
+            _save_manifest(directory)
\ No newline at end of file
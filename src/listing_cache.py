@@ -0,0 +1,117 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import logging
+
+# 디렉토리 목록 페이지에서 href 값만 뽑아내는 정규식 (BeautifulSoup 전체 파싱 대체)
+HREF_PATTERN = re.compile(r'<a\s[^>]*?href\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def extract_links(html):
+    """
+    HTML 디렉토리 목록에서 링크(href) 목록을 추출.
+    """
+    return HREF_PATTERN.findall(html)
+
+
+class ListingCache:
+    """
+    PDS 디렉토리 목록을 URL 단위로 디스크에 캐시.
+
+    한 번의 실행 안에서는 같은 URL을 한 번만 가져오고, 실행 간에는 ttl(초)
+    동안 디스크 캐시를 그대로 사용합니다. ttl이 지나면 ETag/Last-Modified로
+    조건부 요청을 보내 304 응답이면 캐시된 목록을 재사용합니다. cache_dir가
+    None이면 디스크에 쓰지 않고 실행 안에서만 재사용합니다.
+    """
+
+    def __init__(self, cache_dir=None, ttl=24 * 3600):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._memory = {}
+        # 전역 잠금은 메모리 항목과 URL별 잠금 조회에만 쓰고, 네트워크 요청은 URL별
+        # 잠금 안에서 하므로 서로 다른 디렉토리 목록은 동시에 가져옴
+        self._lock = threading.Lock()
+        self._url_locks = {}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def _read_entry(self, url):
+        if self.cache_dir is None:
+            return None
+        path = self._entry_path(url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def _write_entry(self, entry):
+        if self.cache_dir is None:
+            return
+        path = self._entry_path(entry['url'])
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def _cached(self, url):
+        with self._lock:
+            return self._memory.get(url)
+
+    def get_links(self, session, url):
+        """
+        url 디렉토리 목록의 링크 목록을 반환 (필요할 때만 네트워크 요청).
+
+        Raises:
+        - requests.HTTPError: 목록 요청이 실패한 경우
+        """
+        links = self._cached(url)
+        if links is not None:
+            return links
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        # 같은 URL을 동시에 요청한 스레드는 먼저 가져온 결과를 기다려 재사용
+        with url_lock:
+            links = self._cached(url)
+            if links is not None:
+                return links
+
+            entry = self._read_entry(url)
+            if entry is None or time.time() - entry['fetched_at'] >= self.ttl:
+                entry = self._fetch(session, url, entry)
+                self._write_entry(entry)
+            with self._lock:
+                self._memory[url] = entry['links']
+            return entry['links']
+
+    @staticmethod
+    def _fetch(session, url, entry):
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = session.get(url, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            logging.info(f'[*] 목록 캐시 재검증 완료: {url}')
+            return {**entry, 'fetched_at': time.time()}
+        response.raise_for_status()
+        return {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'links': extract_links(response.text),
+        }
@@ -0,0 +1,233 @@
+import os
+import re
+import json
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from utils import sols_to_earth_date
+
+# 파일명 규칙
+# SEIS : xb.elyse.02.bhu.2019.238.2.mseed (network.station.location.channel.year.doy.version)
+# TWINS: twins_model_0237_02.csv (sol, version)
+# PS   : ps_calib_0004_01.csv (sol, version)
+SEIS_PATTERN = re.compile(
+    r'^(?P<network>\w+)\.(?P<station>\w+)\.(?P<location>\w*)\.(?P<channel>\w+)\.'
+    r'(?P<year>\d{4})\.(?P<doy>\d{3})\.(?P<version>\d+)\.mseed$', re.IGNORECASE)
+SOL_PATTERNS = {
+    'twins': re.compile(r'^twins_model_(?P<sol>\d{4})_(?P<version>\d+)\.csv$', re.IGNORECASE),
+    'ps': re.compile(r'^ps_calib_(?P<sol>\d{4})_(?P<version>\d+)\.csv$', re.IGNORECASE),
+}
+
+
+def parse_file_name(file_name):
+    """
+    다운로드된 파일명을 manifest 항목 정보로 변환 (알 수 없는 형식이면 None).
+
+    Returns:
+    - dict: instrument, station, channel, period, version, starttime, endtime
+    """
+    match = SEIS_PATTERN.match(file_name)
+    if match:
+        year, doy = int(match['year']), int(match['doy'])
+        start = datetime(year, 1, 1) + timedelta(days=doy - 1)
+        return {
+            'instrument': 'seis',
+            'station': match['station'].lower(),
+            'channel': match['channel'].lower(),
+            'period': f'{year}.{doy:03d}',
+            'version': int(match['version']),
+            'starttime': start.isoformat(),
+            'endtime': (start + timedelta(days=1)).isoformat(),
+        }
+    for instrument, pattern in SOL_PATTERNS.items():
+        match = pattern.match(file_name)
+        if match:
+            sol = int(match['sol'])
+            return {
+                'instrument': instrument,
+                'station': None,
+                'channel': None,
+                'period': str(sol),
+                'version': int(match['version']),
+                'starttime': sols_to_earth_date(sol).isoformat(),
+                'endtime': sols_to_earth_date(sol + 1).isoformat(),
+            }
+    return None
+
+
+class Manifest:
+    """
+    데이터 디렉토리에 있는 파일의 JSON 색인 (manifest.json).
+
+    (instrument, channel, period) 키로 파일을 바로 찾을 수 있으므로 sol마다
+    디렉토리를 다시 훑을 필요가 없습니다. period는 SEIS의 경우 'YYYY.DDD',
+    TWINS/PS의 경우 sol 번호입니다.
+    """
+    FILE_NAME = 'manifest.json'
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, data_path):
+        self.data_path = data_path
+        self.path = os.path.join(data_path, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._index = {}
+        # 마지막으로 훑었을 때의 디렉토리 mtime (바뀌지 않았으면 다시 훑지 않음)
+        self._scanned_mtime = None
+        self._load()
+
+    @classmethod
+    def for_directory(cls, data_path):
+        """
+        디렉토리별로 하나의 Manifest 객체를 공유 (동시 다운로드 시 쓰기 충돌 방지).
+        """
+        key = os.path.abspath(data_path)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(data_path)
+            return cls._instances[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        for entry in entries:
+            self._insert(entry)
+
+    def _insert(self, entry):
+        self._entries[entry['file_name']] = entry
+        key = (entry['instrument'], entry['channel'], entry['period'])
+        bucket = [e for e in self._index.get(key, []) if e['file_name'] != entry['file_name']]
+        bucket.append(entry)
+        # 최신 버전이 먼저 오도록 정렬
+        bucket.sort(key=lambda e: (-e['version'], e['file_name']))
+        self._index[key] = bucket
+
+    def save(self):
+        """
+        manifest.json을 원자적으로 다시 씀.
+
+        여러 프로세스가 같은 디렉토리의 manifest를 동시에 저장할 수 있으므로
+        임시 파일 이름은 프로세스마다 다르게 만듭니다.
+        """
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.data_path, prefix=self.FILE_NAME + '.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(sorted(self._entries.values(), key=lambda e: e['file_name']),
+                              f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    @staticmethod
+    def _make_entry(file_path):
+        file_name = os.path.basename(file_path)
+        entry = parse_file_name(file_name)
+        if entry is None:
+            return None
+        entry['file_name'] = file_name
+        entry['size'] = os.path.getsize(file_path)
+        return entry
+
+    def add(self, file_path, save=True):
+        """
+        파일 하나를 manifest에 추가 (인식할 수 없는 파일명이면 None 반환).
+        """
+        entry = self._make_entry(file_path)
+        if entry is None:
+            return None
+        with self._lock:
+            self._insert(entry)
+        if save:
+            self.save()
+        return entry
+
+    def _directory_mtime(self):
+        return os.stat(self.data_path).st_mtime_ns
+
+    def scan(self):
+        """
+        디렉토리를 한 번 훑어 manifest를 다시 만듦 (내용이 바뀐 경우에만 저장).
+        """
+        scanned_mtime = self._directory_mtime()
+        entries = []
+        for file_name in os.listdir(self.data_path):
+            try:
+                entry = self._make_entry(os.path.join(self.data_path, file_name))
+            except FileNotFoundError:
+                # 훑는 동안 다른 프로세스가 지운 파일
+                continue
+            if entry is not None:
+                entries.append(entry)
+        with self._lock:
+            changed = {e['file_name']: e for e in entries} != self._entries
+            self._entries = {}
+            self._index = {}
+            for entry in entries:
+                self._insert(entry)
+        if changed:
+            self.save()
+            scanned_mtime = self._directory_mtime()
+        self._scanned_mtime = scanned_mtime
+
+    def refresh(self):
+        """
+        마지막으로 훑은 뒤 디렉토리가 바뀌었을 때만 다시 훑음.
+
+        Returns:
+        - bool: 다시 훑었는지 여부
+        """
+        if self._scanned_mtime == self._directory_mtime():
+            return False
+        self.scan()
+        return True
+
+    def lookup(self, instrument, period, channel=None, station=None):
+        """
+        조건에 맞는 최신 버전 파일의 전체 경로를 반환 (없으면 None).
+        """
+        key = (instrument, channel.lower() if channel else None, str(period))
+        for entry in self._index.get(key, []):
+            if station is not None and entry['station'] != station.lower():
+                continue
+            file_path = os.path.join(self.data_path, entry['file_name'])
+            if os.path.exists(file_path):
+                return file_path
+        return None
+
+    def files(self, instrument, channel=None, station=None):
+        """
+        조건에 맞는 모든 period의 최신 버전 파일 경로를 period 순으로 반환.
+        """
+        channel = channel.lower() if channel else None
+        periods = sorted((period for inst, ch, period in self._index
+                          if inst == instrument and ch == channel), key=float)
+        paths = [self.lookup(instrument, period, channel, station) for period in periods]
+        return [path for path in paths if path is not None]
+
+    def resolve(self, instrument, periods, channel=None, station=None):
+        """
+        여러 period를 한 번에 찾음. 누락된 항목이 있으면 디렉토리를 다시 훑은 뒤
+        재시도합니다 (manifest 없이 복사된 파일 대비). 마지막으로 훑은 뒤 디렉토리가
+        바뀌지 않았으면 다시 훑지 않으므로, 데이터가 없는 sol을 여러 번 찾아도
+        디렉토리 전체를 매번 읽거나 manifest를 다시 쓰지 않습니다.
+
+        Returns:
+        - list: periods와 같은 순서의 경로 목록 (못 찾으면 None)
+        """
+        paths = [self.lookup(instrument, p, channel, station) for p in periods]
+        if any(path is None for path in paths) and self.refresh():
+            paths = [self.lookup(instrument, p, channel, station) for p in periods]
+        return paths
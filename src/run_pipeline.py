@@ -0,0 +1,51 @@
+import argparse
+import logging
+from core.pipeline import load_config, run_pipeline
+
+
+def main():
+    # 로깅 설정
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(
+        description='YAML 작업 명세의 모든 작업을 download → load → filter → analyse → render 순서로 처리')
+    parser.add_argument('--config', type=str, default='../configure.yml',
+                        help='작업 명세 YAML 파일 (기본값: ../configure.yml)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='작업을 병렬로 처리할 프로세스 수 (기본값: CPU 수)')
+    parser.add_argument('--download_workers', type=int, default=1,
+                        help='SEIS 동시 다운로드 작업자 수 (기본값: 1)')
+    parser.add_argument('--jobs', type=str, default=None,
+                        help='실행할 작업 이름 (쉼표로 구분, 기본값: 전체)')
+    parser.add_argument('--force', action='store_true',
+                        help='최신 여부와 관계없이 모든 단계를 다시 실행')
+
+    args = parser.parse_args()
+
+    try:
+        jobs = load_config(args.config)
+    except (OSError, ValueError) as e:
+        logging.error(f'[!] 작업 명세를 읽을 수 없습니다: {e}')
+        return
+    if args.jobs is not None:
+        names = args.jobs.split(',')
+        unknown = sorted(set(names) - {job['name'] for job in jobs})
+        if unknown:
+            logging.error(f"[!] 작업 명세에 없는 작업: {', '.join(unknown)}")
+            return
+        jobs = [job for job in jobs if job['name'] in names]
+
+    for job in jobs:
+        logging.info(f"[*] {job['name']}: sol {job['start_sol']}부터 {job['sol_range']}개, "
+                     f"{job['channel']} {job['minfreq']:g}-{job['maxfreq']:g} Hz → {job['output_dir']}")
+    run_pipeline(jobs, args.workers, args.force, args.download_workers)
+
+
+if __name__ == '__main__':
+    main()
+
+    # 사용 예시:
+    # python run_pipeline.py
+    # python run_pipeline.py --config ../configure.yml --workers 8
+    # python run_pipeline.py --jobs sol_0238_0240_bhu_0.1-10hz --force
@@ -1,7 +1,15 @@
 from datetime import datetime
 # sols to earth date
 
+import math
+from functools import lru_cache
 from datetime import datetime, timedelta
+from conversions import MARS_SOL_IN_EARTH_DAYS
+
+
+@lru_cache(maxsize=None)
+def _parse_landing_date(landing_date_str):
+    return datetime.strptime(landing_date_str, "%Y-%m-%d")
 
 
 def sols_to_earth_date(sol, landing_date_str="2018-11-26"):
@@ -15,16 +23,34 @@ def sols_to_earth_date(sol, landing_date_str="2018-11-26"):
     Returns:
     - datetime: 변환된 지구 날짜
     """
-    # 화성의 1 sol은 약 24시간 39분 35.244초로, 지구 일수로는 약 1.02749125일입니다.
-    mars_sol_in_earth_days = 1.02749125
-
-    # 착륙 날짜를 datetime 객체로 변환
-    landing_date = datetime.strptime(landing_date_str, "%Y-%m-%d")
+    # 착륙 날짜를 datetime 객체로 변환 (같은 문자열은 한 번만 파싱)
+    landing_date = _parse_landing_date(landing_date_str)
 
-    # 총 지구 일수 계산
-    total_earth_days = sol * mars_sol_in_earth_days
+    # 총 지구 일수 계산 (1 sol = 1.02749125 지구 일)
+    total_earth_days = sol * MARS_SOL_IN_EARTH_DAYS
 
     # 착륙 날짜에 총 지구 일수를 더함
     earth_date = landing_date + timedelta(days=total_earth_days)
 
     return earth_date
+
+
+def earth_date_to_sol(date, landing_date_str="2018-11-26"):
+    """
+    지구 날짜를 그 날짜가 속한 sol 번호로 변환 (sols_to_earth_date의 역변환).
+
+    Parameters:
+    - date (datetime): 지구 날짜
+    - landing_date_str (str): 착륙 날짜 (YYYY-MM-DD 형식)
+
+    Returns:
+    - int: sols_to_earth_date(sol) <= date 를 만족하는 가장 큰 sol
+    """
+    elapsed_days = (date - _parse_landing_date(landing_date_str)) / timedelta(days=1)
+    sol = math.floor(elapsed_days / MARS_SOL_IN_EARTH_DAYS)
+    # 부동소수점 오차로 경계에서 한 sol 어긋나는 경우 보정
+    if sols_to_earth_date(sol + 1, landing_date_str) <= date:
+        sol += 1
+    elif sols_to_earth_date(sol, landing_date_str) > date:
+        sol -= 1
+    return sol
@@ -1,7 +1,12 @@
 import argparse
+import logging
 from datetime import datetime, timedelta
 from core.data_model import SEISData, TWINSData, PSData
-from utils import sols_to_earth_date
+from core.result_cache import ResultCache
+from core.batch_render import atlas_jobs, render_batch
+from core.psd_store import PSDStore
+from conversions import sol_to_utc
+from utils import sols_to_earth_date, earth_date_to_sol
 
 
 def main():
@@ -15,7 +20,9 @@ def main():
         'seis': '../data/downloads/seis',
         'twins': '../data/downloads/twins',
         'ps': '../data/downloads/ps',
-        'results': '../data/results'
+        'results': '../data/results',
+        'cache': '../data/cache/results',
+        'psd': '../data/cache/psd'
     }
 
     # 명령줄 인수 파싱
@@ -37,12 +44,18 @@ def main():
                         help=f'최소 주파수 (기본값: {DEFAULT_MIN_FREQ} Hz)')
     parser.add_argument('--maxfreq', type=float, default=DEFAULT_MAX_FREQ,
                         help=f'최대 주파수 (기본값: {DEFAULT_MAX_FREQ} Hz)')
+    parser.add_argument('--atlas', action='store_true',
+                        help='sol마다 그림을 따로 만들어 results/sol_XXXX 폴더에 저장 (병렬 처리)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='--atlas 사용 시 그림 작업 프로세스 수, 그 외에는 파일 읽기 작업자 수 (기본값: CPU 수)')
+    parser.add_argument('--backend', choices=['obspy', 'memmap'], default='obspy',
+                        help='SEIS 읽기 방식 (memmap: 처음 한 번 디코딩한 샘플 파일을 memory-map으로 읽음)')
+    parser.add_argument('--psd', action='store_true',
+                        help='새로 받은 SEIS 파일의 시간별 PSD를 저장소에 추가하고 기간 스펙트로그램을 그림')
 
     args = parser.parse_args()
 
     # 시작점 처리
-    landing_date = datetime(2018, 11, 26)  # InSight 착륙일
-
     if args.start_sol is not None:
         start_sol = args.start_sol
         start_date = sols_to_earth_date(start_sol)
@@ -53,7 +66,7 @@ def main():
         except ValueError:
             print('[!] 시작 날짜의 형식이 올바르지 않습니다. (예: 2020-01-31)')
             return
-        start_sol = (start_date - landing_date).days
+        start_sol = earth_date_to_sol(start_date)
     elif args.start_doy is not None:
         if args.year is not None:
             year = args.year
@@ -64,7 +77,7 @@ def main():
         except ValueError:
             print('[!] DOY의 범위는 1에서 366 사이여야 합니다.')
             return
-        start_sol = (start_date - landing_date).days
+        start_sol = earth_date_to_sol(start_date)
 
     # range 처리
     sol_range = args.range
@@ -79,18 +92,41 @@ def main():
     # 데이터 경로 설정
     data_paths = DEFAULT_DATA_PATHS
 
+    if args.atlas:
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s - %(levelname)s - %(message)s')
+        jobs = atlas_jobs(start_sol, start_sol + sol_range - 1, data_paths, channel, minfreq, maxfreq)
+        render_batch(jobs, args.workers)
+        return
+
+    if args.psd:
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s - %(levelname)s - %(message)s')
+        # 이미 처리한 파일은 건너뛰므로 전체 기간도 새 sol만큼만 계산
+        store = PSDStore(data_paths['psd'])
+        channels = channel.split(',')
+        store.update(data_paths['seis'], channels)
+        t0, t1 = sol_to_utc([start_sol, start_sol + sol_range])
+        for ch in channels:
+            store.plot_spectrogram(ch, f"{data_paths['results']}/seis_psd_{ch.lower()}.png", t0, t1)
+        return
+
     # SEIS 데이터 처리
-    seis_data = SEISData(start_sol, sol_range, channel, data_paths['seis'])
+    # 필터링/스펙트로그램 결과는 캐시에 있으면 재사용하고 그림만 다시 그림
+    result_cache = ResultCache(data_paths['cache'])
+    seis_data = SEISData(start_sol, sol_range, channel, data_paths['seis'], cache=result_cache,
+                         backend=args.backend, max_workers=args.workers)
     seis_data.filter_data(minfreq, maxfreq)
     seis_data.plot_waveform(data_paths['results'] + '/seis_waveform.png')
     seis_data.plot_spectrogram(minfreq, maxfreq, data_paths['results'] + '/seis_spectrogram.png')
 
     # TWINS 데이터 처리
-    twins_data = TWINSData(start_sol, sol_range, data_paths['twins'])
+    twins_data = TWINSData(start_sol, sol_range, data_paths['twins'], max_workers=args.workers)
     twins_data.plot_wind_speed(data_paths['results'] + '/twins_wind_speed.png')
     twins_data.plot_temperature(data_paths['results'] + '/twins_temperature.png')
     
-    ps_data = PSData(start_sol, sol_range, data_paths['ps'])
+    ps_data = PSData(start_sol, sol_range, data_paths['ps'], columns=['PRESSURE'], dtype='float32',
+                     max_workers=args.workers)
     ps_data.plot_pressure(data_paths['results'] + '/ps_pressure.png')
     
 
@@ -102,3 +138,5 @@ if __name__ == '__main__':
     # python main.py --start_sol 237 --range 3 --channel BHU
     # python main.py --start_date 2020-01-31 --range 3 --channel BHU
     # python main.py --start_doy 31 --year 2020 --range 3 --channel BHU
+    # python visualization.py --start_sol 200 --range 300 --atlas --workers 8
+    # python visualization.py --start_sol 1 --range 1400 --psd --channel BHU,BHV,BHW
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# src/ 안의 모듈은 `from utils import ...`, `from core.x import ...` 형태로 서로를 import
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,54 @@
+import os
+import numpy as np
+import obspy
+import pandas as pd
+from conversions import sol_to_utc, sol_to_year_doy, utc_to_lmst
+
+RATE = 2.0
+START_SOL = 238
+
+
+def write_sol_files(directory, sols, channels=('BHU',), gap_doy_index=None, rate=RATE):
+    """
+    sol마다 하루 miniSEED 파일을 만듦 (gap_doy_index번째 파일은 가운데 1시간이 빔).
+    """
+    years, doys = sol_to_year_doy(list(sols))
+    paths = []
+    for i, (year, doy) in enumerate(zip(years, doys)):
+        day_start = obspy.UTCDateTime(year=int(year), julday=int(doy))
+        for channel in channels:
+            rng = np.random.default_rng(i * 10 + len(channel) + ord(channel[-1]))
+            data = rng.integers(-2000, 2000, int(86400 * rate)).astype(np.int32)
+            header = {'network': 'XB', 'station': 'ELYSE', 'location': '02', 'channel': channel,
+                      'sampling_rate': rate, 'starttime': day_start}
+            trace = obspy.Trace(data, header=header)
+            if gap_doy_index == i:
+                stream = obspy.Stream([trace.slice(day_start, day_start + 11 * 3600),
+                                       trace.slice(day_start + 12 * 3600, day_start + 86400)])
+            else:
+                stream = obspy.Stream([trace])
+            path = os.path.join(directory, f'xb.elyse.02.{channel.lower()}.{year}.{doy:03d}.2.mseed')
+            stream.write(path, format='MSEED')
+            paths.append(path)
+    return paths
+
+
+def write_sol_csv(directory, prefix, sol, column, n=2800, step_seconds=30, values=None):
+    """
+    TWINS/PS 형식의 sol 파일 하나를 만듦 (예: prefix='ps_calib' → ps_calib_0238_01.csv).
+
+    values가 없으면 column에 700 근처의 난수를 채웁니다.
+    """
+    utc = sol_to_utc(sol) + np.arange(n) * np.timedelta64(int(step_seconds * 1e6), 'us')
+    lmst_sol, seconds = utc_to_lmst(utc)
+    lmst = [f'{s:05d}M{int(x // 3600):02d}:{int(x % 3600 // 60):02d}:{x % 60:06.3f}'
+            for s, x in zip(lmst_sol, seconds)]
+    text = pd.to_datetime(utc).strftime('%Y-%jT%H:%M:%S.%f')
+    if values is None:
+        values = 700 + np.random.default_rng(sol).normal(size=n)
+    # LTST는 형식만 맞춤 (집계에는 쓰지 않음)
+    ltst = [value.replace('M', ' ') for value in lmst]
+    path = os.path.join(directory, f'{prefix}_{sol:04d}_01.csv')
+    pd.DataFrame({'UTC': [t[:-3] + 'Z' for t in text], 'LMST': lmst, 'LTST': ltst, column: values}) \
+        .to_csv(path, index=False)
+    return path
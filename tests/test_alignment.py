@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+from conversions import sol_to_utc
+from core import alignment
+from core.alignment import align_instruments, asof, bin_mean
+from core.data_model import SEISData
+from seis_files import START_SOL, write_sol_files
+
+STEP_SECONDS = 10
+
+
+class _Frames:
+    """
+    TWINSData/PSData처럼 data_frame 또는 iter_frames()로 sol 파일 단위 데이터를 주는 객체.
+    """
+
+    def __init__(self, frames, lazy):
+        self.frames = frames
+        self.data_frame = None if lazy else pd.concat(frames, ignore_index=True)
+
+    def iter_frames(self, columns=None):
+        return iter(self.frames)
+
+
+def _irregular_frames(column, seed):
+    """
+    START_SOL 앞 10분부터 두 sol에 걸친 불규칙 간격 데이터 (중간에 30분 공백), sol 파일 두 개로 나눔.
+    """
+    rng = np.random.default_rng(seed)
+    t0, t1, t2 = sol_to_utc([START_SOL, START_SOL + 1, START_SOL + 2])
+    seconds = np.cumsum(rng.uniform(0.5, 7.0, 30000))
+    utc = t0 - np.timedelta64(600, 's') + (seconds * 1e6).astype('timedelta64[us]')
+    utc = utc[utc < t2]
+    utc = utc[(utc < t0 + np.timedelta64(3600, 's')) | (utc >= t0 + np.timedelta64(5400, 's'))]
+    df = pd.DataFrame({'UTC': utc, column: rng.normal(size=len(utc))})
+    return [df[df['UTC'] < t1], df[df['UTC'] >= t1]]
+
+
+def _grid(sol):
+    t0, t1 = sol_to_utc([sol, sol + 1])
+    n_bins = int(np.ceil((t1 - t0) / np.timedelta64(STEP_SECONDS, 's')))
+    return t0 + np.arange(n_bins) * np.timedelta64(STEP_SECONDS, 's'), t1
+
+
+def _brute_mean(df, column):
+    expected = []
+    for sol in (START_SOL, START_SOL + 1):
+        grid, t1 = _grid(sol)
+        in_sol = df[(df['UTC'] >= grid[0]) & (df['UTC'] < t1)]
+        bins = (in_sol['UTC'] - grid[0]) // pd.Timedelta(seconds=STEP_SECONDS)
+        expected.append(in_sol.groupby(bins)[column].mean().reindex(range(len(grid))).to_numpy())
+    return np.concatenate(expected)
+
+
+def _brute_asof(df, column, tolerance_seconds):
+    grid = np.concatenate([_grid(sol)[0] for sol in (START_SOL, START_SOL + 1)])
+    merged = pd.merge_asof(pd.DataFrame({'UTC': grid.astype('datetime64[us]')}),
+                           df.astype({'UTC': 'datetime64[us]'}), on='UTC', direction='backward',
+                           tolerance=pd.Timedelta(seconds=tolerance_seconds))
+    return merged[column].to_numpy()
+
+
+def test_bin_mean_matches_groupby():
+    rng = np.random.default_rng(0)
+    times = np.sort(rng.integers(-50, 1050, 2000))
+    values = rng.normal(size=2000)
+    values[::37] = np.nan
+    result = bin_mean(times, values, 0, 10, 100)
+
+    df = pd.DataFrame({'bin': times // 10, 'value': values})
+    expected = df[(df['bin'] >= 0) & (df['bin'] < 100)].groupby('bin')['value'].mean()
+    np.testing.assert_allclose(result, expected.reindex(range(100)).to_numpy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize('tolerance', [0, 5, 30])
+def test_asof_matches_merge_asof(tolerance):
+    rng = np.random.default_rng(1)
+    times = np.unique(rng.integers(0, 1000, 150))
+    values = rng.normal(size=len(times))
+    grid = np.arange(-20, 1020, 7)
+    result = asof(times, values, grid, tolerance)
+
+    expected = pd.merge_asof(pd.DataFrame({'t': grid}), pd.DataFrame({'t': times, 'v': values}),
+                             on='t', direction='backward', tolerance=tolerance)['v'].to_numpy()
+    np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_align_mean_and_asof_match_pandas(lazy):
+    wind = _irregular_frames('HORIZONTAL_WIND_SPEED', 2)
+    pressure = _irregular_frames('PRESSURE', 3)
+    twins, ps = _Frames(wind, lazy), _Frames(pressure, lazy)
+    wind_df, pressure_df = pd.concat(wind), pd.concat(pressure)
+
+    aligned = align_instruments(START_SOL, 2, twins=twins, ps=ps, step_seconds=STEP_SECONDS)
+    np.testing.assert_allclose(aligned['HORIZONTAL_WIND_SPEED'], _brute_mean(wind_df, 'HORIZONTAL_WIND_SPEED'),
+                               rtol=1e-12)
+    np.testing.assert_allclose(aligned['PRESSURE'], _brute_mean(pressure_df, 'PRESSURE'), rtol=1e-12)
+    # 30분 공백 동안은 NaN
+    assert aligned['PRESSURE'].isna().sum() >= 1800 // STEP_SECONDS
+
+    for tolerance in (None, 3, 60):
+        twins, ps = _Frames(wind, lazy), _Frames(pressure, lazy)
+        aligned = align_instruments(START_SOL, 2, twins=twins, ps=ps, step_seconds=STEP_SECONDS,
+                                    how='asof', tolerance_seconds=tolerance)
+        tolerance_seconds = STEP_SECONDS if tolerance is None else tolerance
+        np.testing.assert_array_equal(aligned['PRESSURE'], _brute_asof(pressure_df, 'PRESSURE', tolerance_seconds))
+        np.testing.assert_array_equal(aligned['HORIZONTAL_WIND_SPEED'],
+                                      _brute_asof(wind_df, 'HORIZONTAL_WIND_SPEED', tolerance_seconds))
+
+
+def _brute_rms(seis, band):
+    # 파일 시작부터 연속으로 필터링한 파형의 격자 구간 RMS
+    tr = seis.stream[0].copy()
+    tr.filter('bandpass', freqmin=band[0], freqmax=band[1])
+    start = np.datetime64(tr.stats.starttime.datetime, 'us')
+    times = start + (np.arange(tr.stats.npts) * tr.stats.delta * 1e6).round().astype('timedelta64[us]')
+    grid, t1 = _grid(START_SOL)
+    in_sol = (times >= grid[0]) & (times < t1)
+    bins = (times[in_sol] - grid[0]) // np.timedelta64(STEP_SECONDS, 's')
+    energy = pd.Series(tr.data[in_sol].astype(np.float64) ** 2).groupby(bins).mean()
+    return np.sqrt(energy.reindex(range(len(grid))).to_numpy())
+
+
+def test_seis_rms_filter_pad(tmp_path, monkeypatch):
+    write_sol_files(str(tmp_path), range(START_SOL, START_SOL + 2))
+    seis = SEISData(START_SOL, 2, 'BHU', str(tmp_path))
+    band = (0.2, 0.8)
+    expected = _brute_rms(seis, band)
+
+    aligned = align_instruments(START_SOL, 1, seis=seis, step_seconds=STEP_SECONDS, band=band)
+    # 앞쪽에 FILTER_PAD_SECONDS만큼 더 읽어 필터 과도 응답이 sol 시작 전에 사라짐
+    np.testing.assert_allclose(aligned['SEIS_BHU_RMS'], expected, rtol=1e-3)
+
+    monkeypatch.setattr(alignment, 'FILTER_PAD_SECONDS', 0)
+    unpadded = align_instruments(START_SOL, 1, seis=seis, step_seconds=STEP_SECONDS, band=band)
+    error = np.abs(unpadded['SEIS_BHU_RMS'] - expected) / expected
+    assert error[0] > 1e-2
+    np.testing.assert_allclose(unpadded['SEIS_BHU_RMS'][12:], expected[12:], rtol=1e-3)
@@ -0,0 +1,26 @@
+import os
+from core.batch_render import atlas_jobs, render_batch
+from seis_files import START_SOL, write_sol_csv, write_sol_files
+
+
+def test_render_atlas_through_process_pool(tmp_path):
+    data_paths = {name: str(tmp_path / name) for name in ('seis', 'twins', 'ps', 'results')}
+    for path in data_paths.values():
+        os.makedirs(path)
+    sols = range(START_SOL, START_SOL + 2)
+    write_sol_files(data_paths['seis'], sols)
+    for sol in sols:
+        write_sol_csv(data_paths['twins'], 'twins_model', sol, 'HORIZONTAL_WIND_SPEED')
+        write_sol_csv(data_paths['ps'], 'ps_calib', sol, 'PRESSURE')
+
+    jobs = atlas_jobs(START_SOL, START_SOL + 1, data_paths, minfreq=0.05, maxfreq=0.5)
+    # 데이터가 없는 sol의 작업은 실패해도 나머지 작업은 계속 진행
+    jobs += atlas_jobs(START_SOL + 5, START_SOL + 5, data_paths, kinds=('ps',))
+    timings = render_batch(jobs, max_workers=2)
+
+    names = ['seis_waveform.png', 'seis_spectrogram.png', 'twins_wind_speed.png', 'ps_pressure.png']
+    expected = {os.path.join(data_paths['results'], f'sol_{sol:04d}', name) for sol in sols for name in names}
+    assert {path for path, _ in timings} == expected
+    for path in expected:
+        assert os.path.getsize(path) > 0
+    assert not os.path.exists(os.path.join(data_paths['results'], f'sol_{START_SOL + 5:04d}', 'ps_pressure.png'))
@@ -0,0 +1,102 @@
+import numpy as np
+import obspy
+import pandas as pd
+from scipy import signal
+from conversions import sol_to_utc
+from core.coherence import (analyze_sols, coherence, pressure_seismic_coherence, windowed_correlation,
+                            wind_seismic_correlation)
+from seis_files import START_SOL, write_sol_csv, write_sol_files
+
+
+def test_coherence_matches_scipy():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(3, 4000))
+    y = 0.5 * x + rng.normal(size=(3, 4000))
+    f, coh = coherence(x, y, 20.0, 256)
+    for i in range(3):
+        expected_f, expected = signal.coherence(x[i], y[i], 20.0, nperseg=256)
+        np.testing.assert_allclose(f, expected_f)
+        np.testing.assert_allclose(coh[i], expected, rtol=1e-10, atol=1e-12)
+
+
+def test_windowed_correlation_matches_brute_force():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(4, 500))
+    y = np.roll(x, 7, axis=1) + 0.1 * rng.normal(size=(4, 500))
+    x[0, 10:20] = np.nan
+    n_valid, corr, peak, lag = windowed_correlation(x, y, max_lag=20)
+
+    assert list(n_valid) == [490, 500, 500, 500]
+    for i in range(4):
+        valid = np.isfinite(x[i])
+        np.testing.assert_allclose(corr[i], np.corrcoef(x[i][valid], y[i][valid])[0, 1], rtol=1e-10)
+    # y가 x보다 7 샘플 늦으므로 지연 +7에서 최대
+    assert list(lag) == [7, 7, 7, 7]
+    assert (peak > 0.9).all()
+
+
+def test_wind_correlation_per_channel():
+    rng = np.random.default_rng(2)
+    n = 1800
+    wind = rng.random(n) * 10
+    aligned = pd.DataFrame({
+        'UTC': pd.date_range('2019-07-26', periods=n, freq='s'),
+        'HORIZONTAL_WIND_SPEED': wind,
+        'SEIS_BHU_RMS': np.sqrt(wind + 0.1 * rng.random(n)),
+        'SEIS_BHV_RMS': rng.random(n),
+    })
+    result = wind_seismic_correlation(aligned, 'BHU,bhv', window_seconds=600)
+
+    assert list(result['CHANNEL']) == ['BHU'] * 3 + ['BHV'] * 3
+    bhu = result[result['CHANNEL'] == 'BHU']
+    for i, value in enumerate(bhu['CORR']):
+        window = slice(i * 600, (i + 1) * 600)
+        expected = np.corrcoef(wind[window], aligned['SEIS_BHU_RMS'][window] ** 2)[0, 1]
+        assert abs(value - expected) < 1e-10
+    assert (result[result['CHANNEL'] == 'BHV']['CORR'].abs() < 0.2).all()
+    assert len(wind_seismic_correlation(aligned, 'BHW')) == 0
+
+
+class _WindowedSeis:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def window(self, t0, t1):
+        return self.stream.slice(t0, t1)
+
+
+def test_pressure_coherence_per_channel():
+    rng = np.random.default_rng(3)
+    rate, n = 2.0, 7200
+    t0 = obspy.UTCDateTime(2019, 7, 26)
+    pressure = np.cumsum(rng.normal(size=n))
+    header = {'network': 'XB', 'station': 'ELYSE', 'location': '02', 'sampling_rate': rate, 'starttime': t0}
+    stream = obspy.Stream([
+        obspy.Trace(pressure + 0.1 * rng.normal(size=n), header={**header, 'channel': 'BHU'}),
+        obspy.Trace(rng.normal(size=n), header={**header, 'channel': 'BHV'}),
+    ])
+    ps = pd.DataFrame({'UTC': pd.date_range(t0.datetime, periods=n, freq='500ms'), 'PRESSURE': pressure})
+    result = pressure_seismic_coherence(_WindowedSeis(stream), [ps], np.datetime64(t0.datetime),
+                                        np.datetime64((t0 + n / rate).datetime), bands=((0.01, 0.1),))
+
+    assert list(result.columns) == ['CHANNEL', 'UTC', 'COH_0.01_0.1', 'PEAK_FREQ', 'PEAK_COH']
+    assert list(result['CHANNEL']) == ['BHU'] * 6 + ['BHV'] * 6
+    assert (result[result['CHANNEL'] == 'BHU']['COH_0.01_0.1'] > 0.9).all()
+    assert (result[result['CHANNEL'] == 'BHV']['COH_0.01_0.1'] < 0.5).all()
+
+
+def test_analyze_sols_reports_every_channel(tmp_path):
+    paths = {name: tmp_path / name for name in ('seis', 'twins', 'ps')}
+    for path in paths.values():
+        path.mkdir()
+    write_sol_files(str(paths['seis']), range(START_SOL, START_SOL + 2), channels=('BHU', 'BHV'))
+    n = int((sol_to_utc(1) - sol_to_utc(0)) / np.timedelta64(1, 's'))
+    for sol in (START_SOL - 1, START_SOL):
+        write_sol_csv(str(paths['twins']), 'twins_model', sol, 'HORIZONTAL_WIND_SPEED', n=n, step_seconds=1)
+        write_sol_csv(str(paths['ps']), 'ps_calib', sol, 'PRESSURE', n=n, step_seconds=1)
+
+    correlation, coh = analyze_sols(START_SOL, 1, {k: str(v) for k, v in paths.items()}, 'BHU,BHV',
+                                    band=(0.05, 0.5), max_workers=1, output_dir=str(tmp_path / 'out'))
+    assert set(correlation['CHANNEL']) == set(coh['CHANNEL']) == {'BHU', 'BHV'}
+    assert correlation['CORR'].notna().any()
+    assert (tmp_path / 'out' / 'pressure_seis_coherence.csv').exists()
@@ -0,0 +1,47 @@
+from datetime import datetime
+import numpy as np
+from conversions import (lmst_to_utc, parse_lmst, sol_to_utc, sol_to_year_doy, utc_to_lmst, utc_to_sol,
+                         utc_to_year_doy, year_doy_to_sol, year_doy_to_utc)
+from utils import earth_date_to_sol, sols_to_earth_date
+
+SOLS = np.arange(0, 1500)
+
+
+def test_sol_utc_round_trip():
+    fractional = SOLS + np.random.default_rng(0).random(len(SOLS))
+    np.testing.assert_allclose(utc_to_sol(sol_to_utc(fractional)), fractional, rtol=0, atol=1e-11)
+    np.testing.assert_array_equal(np.floor(utc_to_sol(sol_to_utc(SOLS))), SOLS)
+    times = sol_to_utc(fractional)
+    np.testing.assert_array_equal(sol_to_utc(utc_to_sol(times)), times)
+
+
+def test_sol_to_utc_matches_utils():
+    expected = np.array([sols_to_earth_date(int(sol)) for sol in SOLS], dtype='datetime64[us]')
+    assert np.abs((sol_to_utc(SOLS) - expected).astype(np.int64)).max() <= 1
+    for sol in SOLS[::37]:
+        date = sol_to_utc(sol).astype(datetime)
+        assert earth_date_to_sol(date) == int(np.floor(utc_to_sol(sol_to_utc(sol))))
+
+
+def test_year_doy_round_trip():
+    years, doys = sol_to_year_doy(SOLS)
+    midnight = year_doy_to_utc(years, doys)
+    np.testing.assert_array_equal(utc_to_year_doy(midnight), (years, doys))
+    # 그날 자정은 그 sol 시작 시각 이전, 다음 날 자정은 이후
+    assert (midnight <= sol_to_utc(SOLS)).all()
+    assert (midnight + np.timedelta64(1, 'D') > sol_to_utc(SOLS)).all()
+    np.testing.assert_allclose(year_doy_to_sol(years, doys), utc_to_sol(midnight), rtol=0, atol=0)
+
+
+def test_lmst_round_trip():
+    times = sol_to_utc(SOLS + 0.37)
+    sol, seconds = utc_to_lmst(times)
+    assert ((seconds >= 0) & (seconds < 86400)).all()
+    np.testing.assert_array_equal(lmst_to_utc(sol, seconds), times)
+
+
+def test_lmst_matches_ps_reference():
+    # PS 데이터: LMST 00004M06:44:09.786 = UTC 2018-334T14:44:27.755
+    sol, seconds = parse_lmst(np.array(['00004M06:44:09.786']))
+    utc = lmst_to_utc(sol, seconds)[0]
+    assert abs((utc - np.datetime64('2018-11-30T14:44:27.755', 'us')).astype(np.int64)) < 1000
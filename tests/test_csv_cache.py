@@ -0,0 +1,30 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from core.csv_cache import read_csv_cached, cache_path, CACHE_DIR_NAME
+
+
+def _write_csv(path, n=2000):
+    utc = pd.date_range('2018-11-30T14:44:27.755', periods=n, freq='s').strftime('%Y-%jT%H:%M:%S.%f')
+    pd.DataFrame({'UTC': [t[:-3] + 'Z' for t in utc], 'PRESSURE': range(n)}).to_csv(path, index=False)
+
+
+def _read(path):
+    return read_csv_cached(path)['PRESSURE'].sum()
+
+
+def test_cached_read_matches_csv(tmp_path):
+    path = str(tmp_path / 'ps_calib_0004_01.csv')
+    _write_csv(path)
+    first = read_csv_cached(path)
+    assert os.path.exists(cache_path(path))
+    pd.testing.assert_frame_equal(read_csv_cached(path), first)
+
+
+def test_concurrent_cache_writers(tmp_path):
+    path = str(tmp_path / 'ps_calib_0004_01.csv')
+    _write_csv(path)
+    with ProcessPoolExecutor(max_workers=8) as executor:
+        sums = list(executor.map(_read, [path] * 16))
+    assert sums == [sum(range(2000))] * 16
+    assert os.listdir(tmp_path / CACHE_DIR_NAME) == [os.path.basename(cache_path(path))]
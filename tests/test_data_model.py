@@ -0,0 +1,85 @@
+import os
+import numpy as np
+import obspy
+import pytest
+from core.data_model import SEISData
+from seis_files import START_SOL, write_sol_files
+
+
+def test_plot_waveform_on_lazy_instance(tmp_path):
+    write_sol_files(str(tmp_path), range(START_SOL, START_SOL + 2))
+    seis = SEISData(START_SOL, 2, 'BHU', str(tmp_path), lazy=True)
+    output_path = str(tmp_path / 'waveform.png')
+    seis.plot_waveform(output_path)
+    assert os.path.getsize(output_path) > 0
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_gapped_load_matches_obspy_merge_and_split(tmp_path, lazy):
+    paths = write_sol_files(str(tmp_path), range(START_SOL, START_SOL + 3), gap_doy_index=1)
+    seis = SEISData(START_SOL, 3, 'BHU', str(tmp_path), lazy=lazy)
+    expected = obspy.Stream()
+    for path in paths:
+        expected += obspy.read(path)
+    expected.merge(method=1)
+
+    if not lazy:
+        tr = seis.stream[0]
+        assert not np.ma.isMaskedArray(tr.data)
+        np.testing.assert_array_equal(seis.gap_masks[tr.id], np.ma.getmaskarray(expected[0].data))
+
+    window = seis.window(seis.starttime, seis.endtime)
+    split = expected.copy().split()
+    assert len(window) == len(split) == 2
+    for tr, exp in zip(window, split):
+        assert tr.stats.starttime == exp.stats.starttime
+        np.testing.assert_array_equal(tr.data, exp.data)
+
+    filtered = seis.filter_data(0.05, 0.5)
+    split.filter('bandpass', freqmin=0.05, freqmax=0.5)
+    for tr, exp in zip(filtered, split):
+        assert tr.stats.starttime == exp.stats.starttime
+        np.testing.assert_allclose(tr.data, exp.data, rtol=1e-10, atol=1e-9)
+
+
+def _capture_panels(seis, monkeypatch):
+    panels = []
+    monkeypatch.setattr(seis, '_render_spectrogram', lambda p, *args: panels.extend(p))
+    return panels
+
+
+def test_spectrogram_plots_cover_every_channel_and_segment(tmp_path, monkeypatch):
+    from scipy import signal
+    write_sol_files(str(tmp_path), range(START_SOL, START_SOL + 2), channels=('BHU', 'BHV'), gap_doy_index=1)
+    seis = SEISData(START_SOL, 2, 'BHU,BHV', str(tmp_path))
+    filtered = seis.filter_data(0.05, 0.5)
+
+    f, t, sxx = seis.compute_spectrogram('BHV')
+    segments = [tr for tr in filtered if tr.stats.channel == 'BHV']
+    assert len(segments) == 2
+    expected = [signal.spectrogram(tr.data, tr.stats.sampling_rate) for tr in segments]
+    np.testing.assert_array_equal(sxx, np.hstack([e[2] for e in expected]))
+    assert np.all(np.diff(t) > 0)
+    assert t[-1] > 86400
+
+    panels = _capture_panels(seis, monkeypatch)
+    seis.plot_spectrogram(0.05, 0.5, str(tmp_path / 'spectrogram.png'))
+    streamed = _capture_panels(seis, monkeypatch)
+    seis.plot_spectrogram_streaming(0.05, 0.5, str(tmp_path / 'streaming.png'), chunk_size=10000)
+
+    assert [p[0] for p in panels] == [p[0] for p in streamed] == ['XB.ELYSE.02.BHU', 'XB.ELYSE.02.BHV']
+    for (_, f, t, sxx), (_, f2, t2, sxx2) in zip(panels, streamed):
+        assert np.all(np.diff(t) > 0)
+        np.testing.assert_allclose(t, t2)
+        np.testing.assert_allclose(sxx, sxx2, rtol=1e-9)
+
+
+def test_plots_render_multi_channel(tmp_path):
+    write_sol_files(str(tmp_path), range(START_SOL, START_SOL + 2), channels=('BHU', 'BHV'), gap_doy_index=1)
+    seis = SEISData(START_SOL, 2, 'BHU,BHV', str(tmp_path))
+    seis.filter_data(0.05, 0.5)
+    for name, plot in [('waveform.png', lambda p: seis.plot_waveform(p)),
+                       ('spectrogram.png', lambda p: seis.plot_spectrogram(0.05, 0.5, p)),
+                       ('streaming.png', lambda p: seis.plot_spectrogram_streaming(0.05, 0.5, p))]:
+        plot(str(tmp_path / name))
+        assert os.path.getsize(tmp_path / name) > 0
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from matplotlib.axes import Axes
+
+from core.data_model import PSData
+from core.decimation import minmax_decimate, minmax_indices
+from seis_files import START_SOL, write_sol_csv
+
+
+def test_minmax_keeps_envelope_in_time_order():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=10000)
+    index = minmax_indices(y, 100)
+
+    assert len(index) == 200
+    assert np.all(np.diff(index) >= 0)
+    buckets = y.reshape(100, 100)
+    kept = y[index].reshape(100, 2)
+    np.testing.assert_array_equal(kept.min(axis=1), buckets.min(axis=1))
+    np.testing.assert_array_equal(kept.max(axis=1), buckets.max(axis=1))
+
+
+def test_minmax_emits_nan_for_partly_nan_bucket():
+    y = np.arange(1000, dtype=np.float64)
+    # 구간 크기 10: 구간 3은 일부만 NaN, 구간 7은 전부 NaN
+    y[35:38] = np.nan
+    y[70:80] = np.nan
+    x, values = minmax_decimate(np.arange(1000), y, 100)
+
+    assert np.all(np.diff(x) >= 0)
+    bucket = x // 10
+    # 일부만 NaN인 구간은 최솟값, NaN, 최댓값 순으로 남아 선이 끊김
+    np.testing.assert_array_equal(values[bucket == 3], [30.0, np.nan, 39.0])
+    assert np.isnan(values[bucket == 7]).all() and (bucket == 7).sum() == 1
+    # NaN이 없는 구간에는 NaN이 없음
+    clean = (bucket != 3) & (bucket != 7)
+    assert not np.isnan(values[clean]).any()
+
+
+def test_minmax_masked_values_become_gaps():
+    y = np.ma.masked_array(np.arange(1000, dtype=np.int32), mask=np.zeros(1000, dtype=bool))
+    y[500:505] = np.ma.masked
+    _, values = minmax_decimate(np.arange(1000), y, 100)
+
+    assert np.isnan(values).sum() == 1
+
+
+def test_minmax_buckets_follow_x():
+    rng = np.random.default_rng(1)
+    # 1초 간격 뒤 긴 공백, 이후 0.1초 간격: 구간은 샘플 수가 아닌 x 폭으로 나뉨
+    x = np.concatenate([np.arange(0, 2000, 1.0), np.arange(5000, 6000, 0.1)])
+    y = rng.normal(size=len(x))
+    index = minmax_indices(y, 60, x)
+
+    assert np.all(np.diff(index) > 0)
+    edges = np.linspace(x[0], x[-1], 61)
+    bucket = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, 59)
+    for b in range(60):
+        members = bucket == b
+        kept = bucket[index] == b
+        if not members.any():
+            assert not kept.any()
+            continue
+        assert y[index][kept].min() == y[members].min()
+        assert y[index][kept].max() == y[members].max()
+        assert kept.sum() == (2 if members.sum() > 1 else 1)
+    # 공백 구간(2000~5000초)에는 점이 없음
+    assert not ((x[index] > 2000) & (x[index] < 5000)).any()
+
+
+def test_minmax_decimate_datetime_x():
+    utc = np.datetime64('2019-07-26T00:00:00', 'ns') + np.arange(10000) * np.timedelta64(1, 's')
+    utc = np.concatenate([utc[:5000], utc[8000:]])
+    y = np.sin(np.arange(len(utc)) / 50.0)
+    x, values = minmax_decimate(utc, y, 100)
+
+    assert x.dtype == utc.dtype and np.all(np.diff(x) > np.timedelta64(0))
+    # 공백 폭(3000초)에 해당하는 약 30개 구간은 비어 있음
+    assert 120 <= len(x) <= 150
+    assert values.min() == y.min() and values.max() == y.max()
+
+
+@pytest.mark.parametrize('plot_type', ['line', 'scatter'])
+def test_pressure_plot_decimates_only_lines(tmp_path, monkeypatch, plot_type):
+    write_sol_csv(str(tmp_path), 'ps_calib', START_SOL, 'PRESSURE', n=20000, step_seconds=2)
+    ps = PSData(START_SOL, 1, str(tmp_path))
+    drawn = []
+    monkeypatch.setattr(Axes, {'line': 'plot', 'scatter': 'scatter'}[plot_type],
+                        lambda self, x, y, *args, **kwargs: drawn.append(len(x)))
+    ps.plot_pressure(str(tmp_path / 'pressure.png'), plot_type)
+
+    if plot_type == 'scatter':
+        # 산점도는 모든 점을 그림
+        assert drawn == [len(ps.data_frame)]
+    else:
+        assert 0 < drawn[0] < len(ps.data_frame) // 5
@@ -0,0 +1,40 @@
+import numpy as np
+from core.diurnal import DiurnalAggregator
+
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+def _aggregate(chunks, **kwargs):
+    aggregator = DiurnalAggregator(bin_minutes=24 * 60, quantiles=QUANTILES, **kwargs)
+    for values in chunks:
+        aggregator.update(np.zeros(len(values)), values)
+    return aggregator.result().iloc[0]
+
+
+def test_quantiles_follow_drift_beyond_first_file_range():
+    rng = np.random.default_rng(1)
+    # 첫 sol 이후 기압이 90 Pa 오른 경우 (첫 파일 범위 밖)
+    chunks = [rng.normal(650, 2, 20000)] + [rng.normal(740, 2, 2000) for _ in range(2)]
+    row = _aggregate(chunks)
+    values = np.concatenate(chunks)
+    expected = np.quantile(values, QUANTILES)
+    actual = [row[f'q{q * 100:g}'] for q in QUANTILES]
+    np.testing.assert_allclose(actual, expected, atol=0.5)
+    assert row['min'] == values.min() and row['max'] == values.max()
+
+
+def test_values_outside_explicit_range_are_not_clipped():
+    values = np.arange(0, 1000, dtype=float)
+    row = _aggregate([values], value_range=(400, 600))
+    np.testing.assert_allclose([row['q5'], row['q50'], row['q95']],
+                               np.quantile(values, QUANTILES), atol=2)
+
+
+def test_growth_keeps_histogram_counts():
+    rng = np.random.default_rng(2)
+    aggregator = DiurnalAggregator(bin_minutes=60)
+    for shift in (0, -50, 300):
+        lmst = rng.uniform(0, 86400, 5000)
+        aggregator.update(lmst, rng.normal(shift, 1, 5000))
+    assert aggregator.histogram.sum() == aggregator.count.sum() == 15000
+    np.testing.assert_array_equal(aggregator.histogram.sum(axis=1), aggregator.count)
@@ -0,0 +1,179 @@
+import requests
+from downloader import stream_download
+
+URL = 'https://example.org/data/xb.elyse.02.bhu.2019.238.2.mseed'
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code}', response=self)
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+
+class FakeSession:
+    """
+    remote 바이트를 제공하는 서버 흉내 (Range/If-Range 요청과 416 응답 포함).
+    """
+
+    def __init__(self, remote, head_status=200, etag='"v1"', encoding=None):
+        self.remote = remote
+        self.head_status = head_status
+        self.etag = etag
+        self.encoding = encoding
+        self.requests = []
+
+    def head(self, url, allow_redirects=True):
+        self.requests.append(('HEAD', None))
+        return FakeResponse(self.head_status, headers={'Content-Length': str(len(self.remote))})
+
+    def get(self, url, headers=None, stream=True):
+        headers = headers or {}
+        range_header = headers.get('Range')
+        self.requests.append(('GET', range_header))
+        base = {'ETag': self.etag}
+        if range_header is None or headers.get('If-Range') != self.etag:
+            # If-Range가 맞지 않으면 Range를 무시하고 전체를 보냄
+            length = len(self.remote)
+            if self.encoding is not None:
+                # 압축 전송 흉내: Content-Length는 압축된 크기, iter_content는 풀린 바이트
+                base['Content-Encoding'] = self.encoding
+                length //= 2
+            return FakeResponse(200, self.remote, {**base, 'Content-Length': str(length)})
+        start = int(range_header[len('bytes='):-1])
+        if start >= len(self.remote):
+            return FakeResponse(416, headers={**base, 'Content-Range': f'bytes */{len(self.remote)}'})
+        body = self.remote[start:]
+        return FakeResponse(206, body, {**base, 'Content-Length': str(len(body))})
+
+
+def _write_part(tmp_path, data, validator='"v1"'):
+    (tmp_path / 'file.mseed.part').write_bytes(data)
+    if validator is not None:
+        (tmp_path / 'file.mseed.part.validator').write_text(validator)
+
+
+def test_resumes_partial_download(tmp_path):
+    path = tmp_path / 'file.mseed'
+    _write_part(tmp_path, b'abc')
+    session = FakeSession(b'abcdefgh')
+    assert stream_download(session, URL, str(path)) == 5
+    assert path.read_bytes() == b'abcdefgh'
+    assert session.requests == [('GET', 'bytes=3-')]
+    assert not (tmp_path / 'file.mseed.part.validator').exists()
+
+
+def test_changed_remote_restarts_through_if_range(tmp_path):
+    path = tmp_path / 'file.mseed'
+    _write_part(tmp_path, b'old', validator='"v0"')
+    session = FakeSession(b'abcdefgh')
+    assert stream_download(session, URL, str(path)) == 8
+    assert path.read_bytes() == b'abcdefgh'
+    assert session.requests == [('GET', 'bytes=3-')]
+
+
+def test_part_without_validator_is_not_resumed(tmp_path):
+    path = tmp_path / 'file.mseed'
+    _write_part(tmp_path, b'old', validator=None)
+    session = FakeSession(b'abcdefgh')
+    assert stream_download(session, URL, str(path)) == 8
+    assert path.read_bytes() == b'abcdefgh'
+    assert session.requests == [('GET', None)]
+
+
+def test_interrupted_download_records_validator(tmp_path):
+    class Interrupted(FakeResponse):
+        def iter_content(self, chunk_size):
+            yield self.body[:3]
+            raise requests.ConnectionError('reset')
+
+    session = FakeSession(b'abcdefgh')
+    session.get = lambda url, headers=None, stream=True: Interrupted(200, b'abcdefgh', {'ETag': '"v1"'})
+    path = tmp_path / 'file.mseed'
+    try:
+        stream_download(session, URL, str(path))
+    except requests.ConnectionError:
+        pass
+    assert (tmp_path / 'file.mseed.part').read_bytes() == b'abc'
+    assert (tmp_path / 'file.mseed.part.validator').read_text() == '"v1"'
+
+    assert stream_download(FakeSession(b'abcdefgh'), URL, str(path)) == 5
+    assert path.read_bytes() == b'abcdefgh'
+
+
+def test_encoded_response_skips_length_check(tmp_path):
+    path = tmp_path / 'file.mseed'
+    assert stream_download(FakeSession(b'abcdefgh', encoding='gzip'), URL, str(path)) == 8
+    assert path.read_bytes() == b'abcdefgh'
+
+
+def test_complete_part_is_installed_on_416(tmp_path):
+    path = tmp_path / 'file.mseed'
+    _write_part(tmp_path, b'abcdefgh')
+    assert stream_download(FakeSession(b'abcdefgh'), URL, str(path)) == 8
+    assert path.read_bytes() == b'abcdefgh'
+    assert not (tmp_path / 'file.mseed.part').exists()
+    assert not (tmp_path / 'file.mseed.part.validator').exists()
+
+
+def test_stale_part_larger_than_remote_is_discarded(tmp_path):
+    path = tmp_path / 'file.mseed'
+    _write_part(tmp_path, b'old-and-longer-content')
+    session = FakeSession(b'new')
+    assert stream_download(session, URL, str(path)) == 3
+    assert path.read_bytes() == b'new'
+    assert session.requests == [('GET', 'bytes=22-'), ('GET', None)]
+
+
+def test_head_failure_falls_through_to_get(tmp_path):
+    path = tmp_path / 'file.mseed'
+    path.write_bytes(b'abcdefgh')
+    session = FakeSession(b'abcdefgh', head_status=503)
+    assert stream_download(session, URL, str(path)) == 8
+    assert path.read_bytes() == b'abcdefgh'
+    assert session.requests == [('HEAD', None), ('GET', None)]
+
+class FakeListing:
+    def __init__(self, links):
+        self.links = links
+
+    def get_links(self, session, url):
+        return self.links.get(url, [])
+
+
+def test_batch_download_saves_manifest_once(tmp_path, monkeypatch):
+    from datetime import datetime
+    from downloader import SEISDownloader
+    from manifest import Manifest
+
+    day_url = 'https://example.org/insight/urn-nasa-pds-insight_seis/data/xb/continuous_waveform/elyse/2019/238/'
+    hrefs = [f'/files/xb.elyse.02.{ch}.2019.238.2.mseed' for ch in ('bhu', 'bhv', 'bhw')]
+    downloader = SEISDownloader(base_url='https://example.org', max_workers=3,
+                                listing_cache=FakeListing({day_url: hrefs}))
+    downloader.session = FakeSession(b'abcdefgh')
+    saves = []
+    original_save = Manifest.save
+    monkeypatch.setattr(Manifest, 'save', lambda self: (saves.append(self.path), original_save(self)))
+
+    results = downloader.crawl_and_download(datetime(2019, 8, 26), datetime(2019, 8, 26), str(tmp_path))
+    assert [size for _, size, _ in results] == [8, 8, 8]
+    assert saves == [str(tmp_path / 'manifest.json')]
+    manifest = Manifest(str(tmp_path))
+    assert len(manifest) == 3
@@ -0,0 +1,84 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from core.data_model import PSData, SEISData
+from seis_files import START_SOL, write_sol_csv, write_sol_files
+
+BAND = (0.05, 0.5)
+STFT = {'nperseg': 256}
+
+
+def _derived(seis):
+    seis.filter_data(*BAND)
+    seis.compute_spectrogram(**STFT)
+
+
+def _assert_same(seis, expected):
+    assert seis.file_names == expected.file_names
+    for tr, exp in zip(seis.stream, expected.stream):
+        assert tr.stats.starttime == exp.stats.starttime
+        np.testing.assert_array_equal(tr.data, exp.data)
+        np.testing.assert_array_equal(seis.gap_masks[tr.id], expected.gap_masks[exp.id])
+    assert len(seis.filtered_stream) == len(expected.filtered_stream)
+    for tr, exp in zip(seis.filtered_stream, expected.filtered_stream):
+        assert tr.stats.starttime == exp.stats.starttime
+        np.testing.assert_array_equal(tr.data, exp.data)
+    for value, exp in zip(seis.compute_spectrogram(**STFT), expected.compute_spectrogram(**STFT)):
+        np.testing.assert_array_equal(value, exp)
+
+
+@pytest.mark.parametrize('gap_doy_index', [None, 1, 2])
+def test_seis_extend_matches_full_reload(tmp_path, gap_doy_index):
+    write_sol_files(str(tmp_path), range(START_SOL, START_SOL + 3), gap_doy_index=gap_doy_index)
+    seis = SEISData(START_SOL, 2, 'BHU', str(tmp_path))
+    _derived(seis)
+    state = seis._spectrograms[seis.filtered_stream[0].id]
+
+    assert seis.extend(1) == [seis.file_names[-1]]
+    expected = SEISData(START_SOL, 3, 'BHU', str(tmp_path))
+    _derived(expected)
+    _assert_same(seis, expected)
+    # 필터링과 스펙트로그램은 다시 계산하지 않고 이어 붙임
+    assert seis._spectrograms[seis.filtered_stream[0].id] is state
+
+
+def test_seis_refresh_picks_up_late_earlier_file(tmp_path):
+    paths = write_sol_files(str(tmp_path), range(START_SOL, START_SOL + 3))
+    os.rename(paths[1], str(tmp_path / 'late.tmp'))
+    seis = SEISData(START_SOL, 3, 'BHU', str(tmp_path))
+    _derived(seis)
+
+    os.rename(str(tmp_path / 'late.tmp'), paths[1])
+    assert seis.refresh() == [paths[1]]
+    expected = SEISData(START_SOL, 3, 'BHU', str(tmp_path))
+    _derived(expected)
+    assert seis.file_names == expected.file_names
+    _assert_same(seis, expected)
+
+
+def test_ps_extend_matches_full_reload(tmp_path):
+    for sol in range(START_SOL, START_SOL + 3):
+        write_sol_csv(str(tmp_path), 'ps_calib', sol, 'PRESSURE')
+    ps = PSData(START_SOL, 2, str(tmp_path))
+    ps.diurnal_aggregate('PRESSURE')
+    ps.extend(1)
+
+    expected = PSData(START_SOL, 3, str(tmp_path))
+    pd.testing.assert_frame_equal(ps.data_frame, expected.data_frame)
+    pd.testing.assert_frame_equal(ps.diurnal_aggregate('PRESSURE'), expected.diurnal_aggregate('PRESSURE'))
+
+
+def test_seis_extend_after_process_traces(tmp_path):
+    write_sol_files(str(tmp_path), range(START_SOL, START_SOL + 3), gap_doy_index=1)
+    seis = SEISData(START_SOL, 2, 'BHU', str(tmp_path))
+    _derived(seis)
+    old = seis.compute_spectrogram(**STFT)
+    seis.process_traces(0.1, 0.3, max_workers=2, **STFT)
+    # 이전 대역의 스펙트로그램을 돌려주지 않음
+    assert not np.array_equal(seis.compute_spectrogram(**STFT)[2], old[2])
+
+    seis.extend(1)
+    expected = SEISData(START_SOL, 3, 'BHU', str(tmp_path))
+    expected.process_traces(0.1, 0.3, max_workers=2, **STFT)
+    _assert_same(seis, expected)
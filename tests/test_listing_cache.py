@@ -0,0 +1,135 @@
+import threading
+import pytest
+import requests
+from downloader import SEISDownloader, TWINSDownloader, PSDownloader
+from listing_cache import ListingCache, extract_links
+
+URL = 'https://example.org/data/sol_0238/'
+
+
+class FakeResponse:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code}', response=self)
+
+
+class FakeSession:
+    """
+    URL마다 디렉토리 목록 HTML을 돌려주는 서버 흉내 (ETag가 맞으면 304).
+    """
+
+    def __init__(self, pages, etag='"v1"'):
+        self.pages = pages
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None):
+        headers = headers or {}
+        self.requests.append((url, headers))
+        if url not in self.pages:
+            return FakeResponse(404)
+        if headers.get('If-None-Match') == self.etag:
+            return FakeResponse(304)
+        hrefs = ''.join(f'<a href="{name}">{name}</a>' for name in self.pages[url])
+        return FakeResponse(200, f'<html><body>{hrefs}</body></html>', {'ETag': self.etag})
+
+
+def test_extract_links():
+    html = '<A HREF="a.csv">a</A> <a class="x" href=\'b/\'>b</a>'
+    assert extract_links(html) == ['a.csv', 'b/']
+
+
+def test_default_cache_is_memory_only(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for downloader in (SEISDownloader(), TWINSDownloader(), PSDownloader()):
+        assert downloader.listing_cache.cache_dir is None
+    session = FakeSession({URL: ['a.csv']})
+    cache = ListingCache()
+    assert cache.get_links(session, URL) == ['a.csv']
+    assert cache.get_links(session, URL) == ['a.csv']
+    assert len(session.requests) == 1
+    # 호출 측이 경로를 주지 않으면 디스크에 아무것도 만들지 않음
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_disk_cache_ttl_and_revalidation(tmp_path):
+    session = FakeSession({URL: ['a.csv', 'b.csv']})
+    assert ListingCache(str(tmp_path)).get_links(session, URL) == ['a.csv', 'b.csv']
+
+    # 새 실행: ttl 안이면 요청 없이 디스크 캐시 사용
+    assert ListingCache(str(tmp_path)).get_links(session, URL) == ['a.csv', 'b.csv']
+    assert len(session.requests) == 1
+
+    # ttl이 지나면 조건부 요청, 304면 캐시된 목록 재사용
+    assert ListingCache(str(tmp_path), ttl=0).get_links(session, URL) == ['a.csv', 'b.csv']
+    assert session.requests[-1][1] == {'If-None-Match': '"v1"'}
+
+    # 목록이 바뀌었으면 새 목록을 저장
+    session.pages[URL].append('c.csv')
+    session.etag = '"v2"'
+    assert ListingCache(str(tmp_path), ttl=0).get_links(session, URL) == ['a.csv', 'b.csv', 'c.csv']
+    assert ListingCache(str(tmp_path)).get_links(session, URL) == ['a.csv', 'b.csv', 'c.csv']
+
+
+def test_http_error_is_not_cached(tmp_path):
+    cache = ListingCache(str(tmp_path))
+    session = FakeSession({})
+    with pytest.raises(requests.HTTPError):
+        cache.get_links(session, URL)
+    session.pages[URL] = ['a.csv']
+    assert cache.get_links(session, URL) == ['a.csv']
+
+
+class BlockingSession(FakeSession):
+    """
+    첫 URL 요청은 다른 URL 요청이 들어올 때까지 응답을 미룸.
+    """
+
+    def __init__(self, pages):
+        super().__init__(pages)
+        self.other_started = threading.Event()
+
+    def get(self, url, headers=None):
+        if url == URL:
+            # 전역 잠금을 잡은 채 요청하면 다른 URL 요청이 시작되지 못해 시간 초과
+            assert self.other_started.wait(timeout=5)
+        else:
+            self.other_started.set()
+        return super().get(url, headers)
+
+
+def test_different_urls_fetch_concurrently(tmp_path):
+    other = 'https://example.org/data/sol_0239/'
+    session = BlockingSession({URL: ['a.csv'], other: ['b.csv']})
+    cache = ListingCache(str(tmp_path))
+    results = {}
+    errors = []
+
+    def fetch(url):
+        try:
+            results[url] = cache.get_links(session, url)
+        except AssertionError as e:
+            errors.append(e)
+
+    first = threading.Thread(target=fetch, args=(URL,))
+    first.start()
+    fetch(other)
+    first.join()
+    assert not errors
+    assert results == {URL: ['a.csv'], other: ['b.csv']}
+
+
+def test_same_url_fetched_once_across_threads(tmp_path):
+    session = FakeSession({URL: ['a.csv']})
+    cache = ListingCache(str(tmp_path))
+    threads = [threading.Thread(target=cache.get_links, args=(session, URL)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(session.requests) == 1
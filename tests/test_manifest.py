@@ -0,0 +1,52 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from manifest import Manifest
+
+
+def _touch(directory, file_name):
+    path = os.path.join(directory, file_name)
+    with open(path, 'wb') as f:
+        f.write(b'x')
+    return path
+
+
+def _resolve_missing(data_path):
+    return Manifest(data_path).resolve('seis', ['2019.240'], 'bhu')
+
+
+def test_resolve_finds_files_copied_without_manifest(tmp_path):
+    path = _touch(tmp_path, 'xb.elyse.02.bhu.2019.238.2.mseed')
+    _touch(tmp_path, 'xb.elyse.02.bhu.2019.238.1.mseed')
+    manifest = Manifest(str(tmp_path))
+    assert manifest.resolve('seis', ['2019.238', '2019.239'], 'bhu') == [path, None]
+    # 새 Manifest도 저장된 색인에서 바로 찾음
+    assert Manifest(str(tmp_path)).lookup('seis', '2019.238', 'bhu') == path
+
+
+def test_missing_period_does_not_rescan_unchanged_directory(tmp_path, monkeypatch):
+    _touch(tmp_path, 'xb.elyse.02.bhu.2019.238.2.mseed')
+    manifest = Manifest(str(tmp_path))
+    manifest.resolve('seis', ['2019.239'], 'bhu')
+    saved_mtime = os.stat(manifest.path).st_mtime_ns
+
+    listed = []
+    original_listdir = os.listdir
+    monkeypatch.setattr(os, 'listdir', lambda path: listed.append(path) or original_listdir(path))
+    for _ in range(3):
+        assert manifest.resolve('seis', ['2019.239'], 'bhu') == [None]
+    assert listed == []
+    assert os.stat(manifest.path).st_mtime_ns == saved_mtime
+
+    # 디렉토리가 바뀌면 다시 훑어 새 파일을 찾음
+    path = _touch(tmp_path, 'xb.elyse.02.bhu.2019.239.2.mseed')
+    assert manifest.resolve('seis', ['2019.239'], 'bhu') == [path]
+
+
+def test_concurrent_resolve_of_missing_period(tmp_path):
+    for doy in range(200, 230):
+        _touch(tmp_path, f'xb.elyse.02.bhu.2019.{doy}.2.mseed')
+    with ProcessPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_resolve_missing, [str(tmp_path)] * 32))
+    assert results == [[None]] * 32
+    assert len(Manifest(str(tmp_path))) == 30
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.tmp')] == []
@@ -0,0 +1,61 @@
+import numpy as np
+import obspy
+import pytest
+from core.merge import gap_segments, merge_layout, merge_streams, segment_views, slice_trace
+
+
+def _trace(start, n, seed, rate=10.0):
+    data = np.random.default_rng(seed).integers(-1000, 1000, n).astype(np.int32)
+    return obspy.Trace(data, header={'network': 'XB', 'station': 'ELYSE', 'location': '02',
+                                     'channel': 'BHU', 'sampling_rate': rate,
+                                     'starttime': obspy.UTCDateTime(2019, 7, 26) + start})
+
+
+def _merge(traces):
+    spans = [(tr.id, tr.stats.starttime, tr.stats.endtime, tr.stats.sampling_rate) for tr in traces]
+    return merge_streams(merge_layout(spans), [obspy.Stream([tr]) for tr in traces])
+
+
+@pytest.mark.parametrize('layout', [
+    [(0, 100), (10, 100)],             # 연속
+    [(0, 100), (15, 100)],             # 5초 공백
+    [(0, 100), (5, 100)],              # 겹침 (나중 트레이스 값)
+    [(0, 100), (20, 50), (12, 30)],    # 공백 + 순서가 섞인 조각
+])
+def test_merge_matches_obspy_method_1(layout):
+    traces = [_trace(start, n, seed) for seed, (start, n) in enumerate(layout)]
+    stream, gap_masks = _merge(traces)
+    expected = obspy.Stream([tr.copy() for tr in traces]).merge(method=1)[0]
+
+    tr = stream[0]
+    gap = gap_masks[tr.id]
+    assert not np.ma.isMaskedArray(tr.data)
+    assert tr.stats.starttime == expected.stats.starttime
+    assert tr.stats.npts == expected.stats.npts
+    np.testing.assert_array_equal(gap, np.ma.getmaskarray(expected.data))
+    np.testing.assert_array_equal(tr.data[~gap], np.ma.getdata(expected.data)[~gap])
+    assert (tr.data[gap] == 0).all()
+
+
+def test_segment_views_match_split_without_copies():
+    traces = [_trace(0, 100, 0), _trace(15, 100, 1), _trace(30, 40, 2)]
+    stream, gap_masks = _merge(traces)
+    tr = stream[0]
+    views = segment_views(tr, gap_masks[tr.id])
+    expected = obspy.Stream([t.copy() for t in traces]).merge(method=1).split()
+
+    assert len(views) == len(expected)
+    for view, exp in zip(views, expected):
+        assert view.stats.starttime == exp.stats.starttime
+        np.testing.assert_array_equal(view.data, exp.data)
+        assert np.shares_memory(view.data, tr.data)
+
+
+def test_slice_trace_keeps_gap_aligned():
+    stream, gap_masks = _merge([_trace(0, 100, 0), _trace(15, 100, 1)])
+    tr = stream[0]
+    t0 = tr.stats.starttime
+    sliced, gap = slice_trace(tr, gap_masks[tr.id], t0 + 8, t0 + 18)
+
+    assert len(gap) == sliced.stats.npts == 101
+    np.testing.assert_array_equal(gap_segments(gap), [[0, 20], [70, 101]])
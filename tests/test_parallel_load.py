@@ -0,0 +1,53 @@
+import os
+import time
+from functools import partial
+import pytest
+from core.parallel_load import ordered_map
+
+N_ITEMS = 20
+FAIL_AT = 3
+
+
+def _slow_square(item):
+    # 앞 항목일수록 늦게 끝나도록 해 완료 순서와 입력 순서를 다르게 함
+    time.sleep(0.01 * (N_ITEMS - item) / N_ITEMS)
+    return item * item
+
+
+def _record_and_fail(directory, item):
+    # 시작한 항목을 파일로 남겨 프로세스 작업자에서도 확인할 수 있게 함
+    open(os.path.join(directory, str(item)), 'w').close()
+    if item == FAIL_AT:
+        raise ValueError(f'bad item {item}')
+    time.sleep(0.2)
+    return item
+
+
+@pytest.mark.parametrize('kind', ['thread', 'process'])
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_preserves_input_order(kind, max_workers):
+    result = list(ordered_map(_slow_square, range(N_ITEMS), max_workers, kind, prefetch=8))
+    assert result == [i * i for i in range(N_ITEMS)]
+
+
+@pytest.mark.parametrize('kind', ['thread', 'process'])
+def test_error_propagates_and_cancels_pending(tmp_path, kind):
+    results = []
+    with pytest.raises(ValueError, match='bad item 3'):
+        for value in ordered_map(partial(_record_and_fail, str(tmp_path)), range(N_ITEMS), 2, kind, prefetch=4):
+            results.append(value)
+
+    assert results == list(range(FAIL_AT))
+    started = sorted(int(name) for name in os.listdir(tmp_path))
+    # 실패 시점에 제출돼 있던 작업(최대 prefetch개)만 시작되고 나머지는 제출·실행되지 않음
+    assert started[:FAIL_AT + 1] == list(range(FAIL_AT + 1))
+    assert len(started) <= FAIL_AT + 4
+
+
+@pytest.mark.parametrize('kind', ['thread', 'process'])
+def test_caller_stop_cancels_pending(tmp_path, kind):
+    items = ordered_map(partial(_record_and_fail, str(tmp_path)), range(N_ITEMS), 2, kind, prefetch=2)
+    assert next(items) == 0
+    items.close()
+    # 첫 결과를 받은 뒤 제출된 항목은 1, 2뿐
+    assert max(int(name) for name in os.listdir(tmp_path)) <= 2
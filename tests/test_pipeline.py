@@ -0,0 +1,140 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from conversions import sol_to_utc
+from core.pipeline import DEFAULT_JOB, is_up_to_date, load_config, run_job, write_stamp
+from seis_files import START_SOL, write_sol_csv, write_sol_files
+
+
+def _write_config(tmp_path, config):
+    path = tmp_path / 'pipeline.yaml'
+    path.write_text(yaml.safe_dump(config), encoding='utf-8')
+    return str(path)
+
+
+def test_load_config_defaults_and_band(tmp_path):
+    path = _write_config(tmp_path, {
+        'start_sol': START_SOL,
+        'data_paths': {'seis': 'seis_files'},
+        'jobs': [{}, {'band': [0.5, 2], 'channel': 'BHU,BHV', 'data_paths': {'results': '/abs/results'}}],
+    })
+    first, second = load_config(path)
+
+    for key in ('sol_range', 'channel', 'minfreq', 'maxfreq', 'backend', 'instruments', 'analyses'):
+        assert first[key] == DEFAULT_JOB[key]
+    assert first['name'] == f'sol_{START_SOL:04d}_{START_SOL:04d}_bhu_0.1-10hz'
+    # data_paths의 상대 경로는 설정 파일 디렉토리 기준
+    assert first['data_paths']['seis'] == str(tmp_path / 'seis_files')
+    assert first['data_paths']['cache'] == str(tmp_path / 'data' / 'cache' / 'results')
+    assert first['output_dir'] == os.path.join(str(tmp_path / 'data' / 'results'), first['name'])
+
+    assert (second['minfreq'], second['maxfreq']) == (0.5, 2)
+    assert 'band' not in second
+    assert second['name'] == f'sol_{START_SOL:04d}_{START_SOL:04d}_bhu_bhv_0.5-2hz'
+    assert second['data_paths']['seis'] == str(tmp_path / 'seis_files')
+    assert second['output_dir'] == os.path.join('/abs/results', second['name'])
+
+
+def test_load_config_chunk_sols(tmp_path):
+    path = _write_config(tmp_path, {'jobs': [
+        {'start_sol': 100, 'sol_range': 5, 'chunk_sols': 2},
+        {'start_sol': 100, 'sol_range': 3, 'chunk_sols': 2, 'name': 'wind'},
+    ]})
+    jobs = load_config(path)
+
+    assert [(job['start_sol'], job['sol_range']) for job in jobs] == \
+        [(100, 2), (102, 2), (104, 1), (100, 2), (102, 1)]
+    assert [job['name'] for job in jobs] == [
+        'sol_0100_0101_bhu_0.1-10hz', 'sol_0102_0103_bhu_0.1-10hz', 'sol_0104_0104_bhu_0.1-10hz',
+        'wind_sol_0100', 'wind_sol_0102']
+    assert all('chunk_sols' not in job for job in jobs)
+
+
+def test_load_config_rejects_duplicates_and_missing_start(tmp_path):
+    path = _write_config(tmp_path, {'start_sol': 100, 'jobs': [{'name': 'a'}, {'name': 'a'}, {'name': 'b'}]})
+    with pytest.raises(ValueError, match='Duplicate job names: a'):
+        load_config(path)
+
+    # 이름을 주지 않아도 설정이 같으면 자동 이름이 겹침
+    path = _write_config(tmp_path, {'start_sol': 100, 'jobs': [{}, {'analyses': ['events']}]})
+    with pytest.raises(ValueError, match='Duplicate'):
+        load_config(path)
+
+    path = _write_config(tmp_path, {'jobs': [{'name': 'a'}]})
+    with pytest.raises(ValueError, match='start_sol'):
+        load_config(path)
+
+
+def test_is_up_to_date(tmp_path):
+    job = {'output_dir': str(tmp_path / 'out')}
+    output = tmp_path / 'result.csv'
+    output.write_text('x')
+
+    assert not is_up_to_date(job, 'filter', 'abc')
+    write_stamp(job, 'filter', 'abc', [str(output)], 1.0)
+    assert is_up_to_date(job, 'filter', 'abc')
+    assert not is_up_to_date(job, 'filter', 'def')
+    assert not is_up_to_date(job, 'analyse', 'abc')
+
+    output.unlink()
+    assert not is_up_to_date(job, 'filter', 'abc')
+
+
+def _statuses(results):
+    return {stage: status for stage, status, _ in results}
+
+
+def test_run_job_skips_and_reruns(tmp_path):
+    os.makedirs(tmp_path / 'seis')
+    write_sol_files(str(tmp_path / 'seis'), [START_SOL])
+    path = _write_config(tmp_path, {
+        'start_sol': START_SOL, 'band': [0.05, 0.5], 'instruments': ['seis'], 'analyses': [],
+        'download': False, 'data_paths': {'seis': 'seis'},
+    })
+    job, = load_config(path)
+
+    assert _statuses(run_job(job, 'load')) == {'filter': 'done', 'analyse': 'done', 'render': 'done'}
+    assert os.path.exists(os.path.join(job['output_dir'], 'seis_spectrogram.png'))
+    assert _statuses(run_job(job, 'load')) == {'filter': 'skipped', 'analyse': 'skipped', 'render': 'skipped'}
+
+    # 렌더 출력만 지우면 render만 다시 실행
+    os.remove(os.path.join(job['output_dir'], 'seis_waveform.png'))
+    assert _statuses(run_job(job, 'load')) == {'filter': 'skipped', 'analyse': 'skipped', 'render': 'done'}
+
+    # 캐시 항목이 지워지면 (LRU 삭제) filter만 다시 실행: 뒤 단계 fingerprint는 그대로
+    cache_dir = job['data_paths']['cache']
+    for name in os.listdir(cache_dir):
+        os.remove(os.path.join(cache_dir, name))
+    assert _statuses(run_job(job, 'load')) == {'filter': 'done', 'analyse': 'skipped', 'render': 'skipped'}
+    assert os.listdir(cache_dir)
+
+    # 입력(load fingerprint)이나 단계 설정이 바뀌면 그 단계부터 끝까지 다시 실행
+    assert _statuses(run_job(job, 'changed')) == {'filter': 'done', 'analyse': 'done', 'render': 'done'}
+    job['analyses'] = ['diurnal']
+    assert _statuses(run_job(job, 'changed')) == {'filter': 'skipped', 'analyse': 'done', 'render': 'done'}
+    assert _statuses(run_job(job, 'changed', force=True)) == {'filter': 'done', 'analyse': 'done',
+                                                              'render': 'done'}
+
+
+def test_run_job_covers_every_channel(tmp_path):
+    for name in ('seis', 'twins', 'ps'):
+        os.makedirs(tmp_path / name)
+    write_sol_files(str(tmp_path / 'seis'), [START_SOL], channels=('BHU', 'BHV'))
+    n = int((sol_to_utc(1) - sol_to_utc(0)) / np.timedelta64(1, 's'))
+    for sol in (START_SOL - 1, START_SOL):
+        write_sol_csv(str(tmp_path / 'twins'), 'twins_model', sol, 'HORIZONTAL_WIND_SPEED', n=n, step_seconds=1)
+        write_sol_csv(str(tmp_path / 'ps'), 'ps_calib', sol, 'PRESSURE', n=n, step_seconds=1)
+    path = _write_config(tmp_path, {
+        'start_sol': START_SOL, 'channel': 'BHU,BHV', 'band': [0.05, 0.5], 'analyses': ['events', 'coherence'],
+        'download': False, 'data_paths': {'seis': 'seis', 'twins': 'twins', 'ps': 'ps'},
+    })
+    job, = load_config(path)
+    run_job(job, 'load')
+
+    for name in ('wind_seis_correlation.csv', 'pressure_seis_coherence.csv'):
+        table = pd.read_csv(os.path.join(job['output_dir'], name))
+        assert set(table['CHANNEL']) == {'BHU', 'BHV'}
+    for name in ('seis_waveform.png', 'seis_spectrogram.png'):
+        assert os.path.getsize(os.path.join(job['output_dir'], name)) > 0
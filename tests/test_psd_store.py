@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+import matplotlib
+from matplotlib.axes import Axes
+from core.psd_store import PSDStore
+from seis_files import START_SOL, write_sol_files
+
+STORE_OPTIONS = {'sampling_rate': 2.0, 'nperseg': 256, 'n_bins': 20}
+
+
+def test_update_is_incremental_and_readable(tmp_path):
+    data_path = tmp_path / 'seis'
+    data_path.mkdir()
+    write_sol_files(str(data_path), range(START_SOL, START_SOL + 2))
+    store = PSDStore(str(tmp_path / 'psd'), **STORE_OPTIONS)
+    assert store.update(str(data_path), ['BHU']) == 2
+    assert store.update(str(data_path), ['BHU']) == 0
+
+    times, frequencies, psd = PSDStore(str(tmp_path / 'psd')).read('BHU')
+    assert psd.shape == (len(times), len(frequencies))
+    assert np.isfinite(psd).all(axis=1).sum() == 48
+
+
+def test_mismatched_options_and_rates_are_rejected(tmp_path):
+    data_path = tmp_path / 'seis'
+    data_path.mkdir()
+    write_sol_files(str(data_path), [START_SOL], rate=4.0)
+    PSDStore(str(tmp_path / 'psd'), **STORE_OPTIONS)
+    with pytest.raises(ValueError, match='sampling_rate'):
+        PSDStore(str(tmp_path / 'psd'), sampling_rate=20.0)
+    store = PSDStore(str(tmp_path / 'psd'))
+    with pytest.raises(ValueError, match='sampling rate'):
+        store.update(str(data_path), ['BHU'])
+
+
+def test_read_unknown_channel(tmp_path):
+    store = PSDStore(str(tmp_path / 'psd'), **STORE_OPTIONS)
+    with pytest.raises(ValueError, match='BHZ'):
+        store.read('BHZ')
+
+
+@pytest.mark.parametrize('dpi, n_columns', [(100, 50), (40, 20)])
+def test_plot_columns_follow_figure_dpi(tmp_path, monkeypatch, dpi, n_columns):
+    data_path = tmp_path / 'seis'
+    data_path.mkdir()
+    write_sol_files(str(data_path), range(START_SOL, START_SOL + 2))
+    store = PSDStore(str(tmp_path / 'psd'), **STORE_OPTIONS)
+    store.update(str(data_path), ['BHU'])
+    shapes = []
+    pcolormesh = Axes.pcolormesh
+    monkeypatch.setattr(Axes, 'pcolormesh', lambda self, x, y, c, **kwargs:
+                        shapes.append(c.shape) or pcolormesh(self, x, y, c, **kwargs))
+
+    # 저장된 시간 수가 그림 폭보다 많으므로 열 수는 가로 픽셀 수(0.5인치 * dpi)
+    with matplotlib.rc_context({'figure.dpi': dpi}):
+        store.plot_spectrogram('BHU', str(tmp_path / 'psd.png'), figsize=(0.5, 3))
+    assert shapes[0][1] == n_columns
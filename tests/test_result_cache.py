@@ -0,0 +1,33 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from core.result_cache import ResultCache
+
+
+def _put_many(cache_dir, worker):
+    cache = ResultCache(cache_dir, max_bytes=20000)
+    for i in range(30):
+        # 모든 작업자가 같은 키를 쓰고, 작은 max_bytes 때문에 서로의 항목을 지움
+        cache.put(ResultCache.make_key(i=i % 10), {'data': np.full(500, worker, dtype=np.float64)})
+        cache.get(ResultCache.make_key(i=(i + 3) % 10))
+    return worker
+
+
+def test_roundtrip_and_lru_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10000)
+    keys = [ResultCache.make_key(i=i) for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.put(key, {'data': np.full(500, i, dtype=np.float64)})
+        os.utime(cache.entry_path(key), (i, i))
+    cache.put(ResultCache.make_key(i=99), {'data': np.zeros(500)})
+    assert cache.get(keys[0]) is None
+    np.testing.assert_array_equal(cache.get(keys[3])['data'], np.full(500, 3.0))
+
+
+def test_concurrent_put_and_evict(tmp_path):
+    with ProcessPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(_put_many, [str(tmp_path)] * 8, range(8))) == list(range(8))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp.npz')]
+    cache = ResultCache(str(tmp_path), max_bytes=20000)
+    for name in os.listdir(tmp_path):
+        assert cache.get(name[:-len('.npz')])['data'].shape == (500,)
@@ -0,0 +1,45 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import obspy
+from core.csv_cache import CACHE_DIR_NAME
+from core.sample_store import SampleFile, ensure_decoded, sample_paths
+
+
+def _write_mseed(path):
+    rng = np.random.default_rng(0)
+    start = obspy.UTCDateTime(2019, 7, 28)
+    header = {'network': 'XB', 'station': 'ELYSE', 'location': '02', 'channel': 'BHU',
+              'sampling_rate': 20.0}
+    stream = obspy.Stream([
+        obspy.Trace(rng.integers(-1000, 1000, 50000).astype(np.int32), header={**header, 'starttime': start}),
+        obspy.Trace(rng.integers(-1000, 1000, 30000).astype(np.int32),
+                    header={**header, 'starttime': start + 3000}),
+    ])
+    stream.write(path, format='MSEED')
+
+
+def test_memmap_traces_match_obspy(tmp_path):
+    path = str(tmp_path / 'xb.elyse.02.bhu.2019.209.2.mseed')
+    _write_mseed(path)
+    ensure_decoded(path)
+    sample_file = SampleFile(*sample_paths(path))
+    t0, t1 = obspy.UTCDateTime(2019, 7, 28, 0, 30), obspy.UTCDateTime(2019, 7, 28, 1, 0)
+    expected = obspy.read(path, starttime=t0, endtime=t1)
+    traces = sample_file.traces(t0, t1)
+    assert len(traces) == len(expected)
+    for tr, ref in zip(traces, expected):
+        assert tr.stats.starttime == ref.stats.starttime
+        np.testing.assert_array_equal(tr.data, ref.data)
+
+
+def test_concurrent_decoders(tmp_path):
+    path = str(tmp_path / 'xb.elyse.02.bhu.2019.209.2.mseed')
+    _write_mseed(path)
+    with ProcessPoolExecutor(max_workers=8) as executor:
+        list(executor.map(ensure_decoded, [path] * 16))
+    expected = sorted(os.path.basename(p) for p in sample_paths(path))
+    assert sorted(os.listdir(tmp_path / CACHE_DIR_NAME)) == expected
+    sample_file = SampleFile(*sample_paths(path))
+    np.testing.assert_array_equal(np.asarray(sample_file.data),
+                                  np.concatenate([tr.data for tr in obspy.read(path)]))
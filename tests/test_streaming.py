@@ -0,0 +1,42 @@
+import warnings
+import numpy as np
+import pytest
+from scipy import signal
+from core.streaming import StreamingBandpass, StreamingSpectrogram, bandpass_sos
+
+
+def _stream(x, chunk, **kwargs):
+    stft = StreamingSpectrogram(20.0, **kwargs)
+    parts = [stft.process(x[i:i + chunk]) for i in range(0, len(x), chunk)] + [stft.finish()]
+    parts = [part for part in parts if part[2].shape[1]]
+    return parts[0][0], np.concatenate([t for _, t, _ in parts]), np.hstack([sxx for _, _, sxx in parts])
+
+
+def test_bandpass_chunks_match_sosfilt():
+    x = np.random.default_rng(0).normal(size=10000)
+    bandpass = StreamingBandpass(0.1, 5, 20.0)
+    chunked = np.concatenate([bandpass.process(x[i:i + 777]) for i in range(0, len(x), 777)])
+    np.testing.assert_array_equal(chunked, signal.sosfilt(bandpass_sos(0.1, 5, 20.0), x))
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'nperseg': 128, 'noverlap': 64}])
+def test_spectrogram_chunks_match_scipy(kwargs):
+    x = np.random.default_rng(1).normal(size=5000)
+    f, t, sxx = _stream(x, 333, **kwargs)
+    expected = signal.spectrogram(x, 20.0, **kwargs)
+    np.testing.assert_array_equal(f, expected[0])
+    np.testing.assert_array_equal(t, expected[1])
+    np.testing.assert_array_equal(sxx, expected[2])
+
+
+@pytest.mark.parametrize('n', [20, 100])
+def test_short_input_matches_scipy(n):
+    x = np.random.default_rng(2).normal(size=n)
+    with pytest.warns(UserWarning):
+        f, t, sxx = _stream(x, 7)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        expected = signal.spectrogram(x, 20.0)
+    assert sxx.shape == expected[2].shape == (n // 2 + 1, 1)
+    np.testing.assert_array_equal(t, expected[1])
+    np.testing.assert_allclose(sxx, expected[2])
@@ -0,0 +1,52 @@
+import os
+import numpy as np
+import obspy
+from conversions import sol_to_year_doy
+from core.data_model import SEISData
+from core.trigger import file_spans, locate_file
+
+SOL = 238
+RATE = 5.0
+
+
+def _write_gapped_day(directory, event_seconds, gap=(12 * 3600, 13 * 3600)):
+    """
+    하루 파일 하나에 gap 구간이 비어 있고 event_seconds에 큰 진폭 이벤트가 있는 miniSEED.
+    """
+    year, doy = (int(v[0]) for v in sol_to_year_doy([SOL]))
+    day_start = obspy.UTCDateTime(year=year, julday=doy)
+    rng = np.random.default_rng(0)
+    data = rng.normal(0, 1, int(86400 * RATE)).astype(np.float32)
+    i = int(event_seconds * RATE)
+    data[i:i + int(60 * RATE)] *= 50
+    header = {'network': 'XB', 'station': 'ELYSE', 'location': '02', 'channel': 'BHU',
+              'sampling_rate': RATE}
+    g0, g1 = int(gap[0] * RATE), int(gap[1] * RATE)
+    stream = obspy.Stream([
+        obspy.Trace(data[:g0], header={**header, 'starttime': day_start}),
+        obspy.Trace(data[g1:], header={**header, 'starttime': day_start + g1 / RATE}),
+    ])
+    path = os.path.join(directory, f'xb.elyse.02.bhu.{year}.{doy:03d}.2.mseed')
+    stream.write(path, format='MSEED')
+    return path, day_start
+
+
+def test_file_spans_cover_internal_gaps():
+    t = obspy.UTCDateTime(2019, 7, 28)
+    headers = [('a', t, t + 100), ('a', t + 200, t + 300), ('b', t + 300, t + 400)]
+    spans = file_spans(headers)
+    assert spans == [('a', t, t + 300), ('b', t + 300, t + 400)]
+    # 파일 안 공백 구간의 시각도 그 파일로 찾음
+    assert locate_file(t + 150, spans) == ('a', t)
+
+
+def test_time_rel_is_measured_from_file_start_across_gap(tmp_path):
+    event_seconds = 16 * 3600 + 40 * 60
+    path, day_start = _write_gapped_day(str(tmp_path), event_seconds)
+    seis = SEISData(SOL, 1, 'BHU', str(tmp_path), lazy=True)
+    catalog = seis.detect_events(0.2, 2.0, max_workers=1)
+
+    assert len(catalog) == 1
+    event = catalog.iloc[0]
+    assert event['filename'] == os.path.splitext(os.path.basename(path))[0]
+    assert abs(event['time_rel(sec)'] - event_seconds) < 5
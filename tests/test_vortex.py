@@ -0,0 +1,62 @@
+import numpy as np
+from core.vortex import detect_pressure_drops
+
+DROPS = [(1500, 1.0), (3000, 0.6), (5000, 0.8)]
+
+
+def _pressure_series(step_seconds, gap=None, offset_after_gap=0.0):
+    """
+    완만한 추세 위에 DROPS(시각(초), 깊이(Pa))의 가우시안 강하(반치폭 약 7초)를 넣은 기압.
+
+    gap=(시작, 끝)이면 그 구간을 비우고 이후 기압을 offset_after_gap만큼 올림.
+    """
+    seconds = np.arange(0, 6000, step_seconds, dtype=np.float64)
+    pressure = 700 + 0.5 * np.sin(seconds / 4000) + 0.02 * np.random.default_rng(0).normal(size=len(seconds))
+    for center, depth in DROPS:
+        pressure -= depth * np.exp(-0.5 * ((seconds - center) / 3.0) ** 2)
+    if gap is not None:
+        keep = (seconds < gap[0]) | (seconds >= gap[1])
+        pressure[seconds >= gap[1]] += offset_after_gap
+        seconds, pressure = seconds[keep], pressure[keep]
+    utc = np.datetime64('2019-07-26T00:00:00', 'us') + (seconds * 1e6).astype('timedelta64[us]')
+    return seconds, utc, pressure
+
+
+def _event_seconds(events):
+    return list((events['time'] - np.datetime64('2019-07-26T00:00:00', 'us')) / np.timedelta64(1, 's'))
+
+
+def test_detects_injected_drops():
+    _, utc, pressure = _pressure_series(1.0)
+    events = detect_pressure_drops(utc, pressure, threshold=0.3)
+
+    np.testing.assert_allclose(_event_seconds(events), [c for c, _ in DROPS], atol=1)
+    np.testing.assert_allclose(events['drop'], [d for _, d in DROPS], atol=0.1)
+    np.testing.assert_allclose(events['duration'], 2.355 * 3.0, atol=1.5)
+
+
+def test_mixed_sampling_rate():
+    # 처음 3600초는 1초, 이후는 0.25초 간격: 창 길이와 반치폭이 샘플 수가 아닌 시간 기준
+    seconds, utc, pressure = _pressure_series(1.0)
+    fast_seconds, fast_utc, fast_pressure = _pressure_series(0.25)
+    slow, fast = seconds < 3600, fast_seconds >= 3600
+    utc = np.concatenate([utc[slow], fast_utc[fast]])
+    pressure = np.concatenate([pressure[slow], fast_pressure[fast]])
+    events = detect_pressure_drops(utc, pressure, threshold=0.3)
+
+    np.testing.assert_allclose(_event_seconds(events), [c for c, _ in DROPS], atol=1)
+    np.testing.assert_allclose(events['duration'], 2.355 * 3.0, atol=1.5)
+
+
+def test_gap_splits_baseline():
+    # 공백 뒤 기압이 5 Pa 높아져도 공백 가장자리를 강하로 잘못 찾지 않고, 공백 직후 강하도 찾음
+    _, utc, pressure = _pressure_series(1.0, gap=(3500, 4800), offset_after_gap=5.0)
+    events = detect_pressure_drops(utc, pressure, threshold=0.3)
+
+    np.testing.assert_allclose(_event_seconds(events), [c for c, _ in DROPS], atol=1)
+    np.testing.assert_allclose(events['drop'], [d for _, d in DROPS], atol=0.1)
+
+
+def test_short_input():
+    _, utc, pressure = _pressure_series(1.0)
+    assert len(detect_pressure_drops(utc[:2], pressure[:2])) == 0